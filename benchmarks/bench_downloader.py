@@ -0,0 +1,176 @@
+"""
+다운로더 처리량 벤치마크
+========================
+로컬 OMS 대역 서버(benchmarks/fake_oms.py)를 대상으로 다운로드 사이클을 측정
+
+모드:
+- http  : 목록 4페이지 → 상세 페이지를 HTTP 로 직렬/동시 수집 (동시성별 처리량, 지연 백분위)
+- cycle : 실제 AutoDownloader.download_cycle(force_mode=True) 를 대역 서버로 실행
+          (Edge 디버그 브라우저 필요 - start_edge_debug.ps1, 결과 파일은 임시 디렉토리에 저장)
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_downloader --mode http --concurrency 1 4 8 --detail-latency-ms 200
+    python -m benchmarks.bench_downloader --mode cycle --list-rows 5
+    python -m benchmarks.bench_downloader --base-url http://127.0.0.1:5090/oms   # 이미 실행 중인 대역 서버 사용
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs, quote
+from concurrent.futures import ThreadPoolExecutor
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fake_oms import FakeOmsSettings, serve_in_thread
+from benchmarks.results import write_results, percentile
+
+GUBUN_QUERY = ["%EC%82%B0%EC%97%85", "%EC%9E%84%EC%97%85"]  # 산업, 임업
+
+
+def list_urls(base_url: str) -> list:
+    return [f"{base_url}/{page}?search_action=&younglim_gubun={gubun}"
+            for page in ("ledger_list.jsp", "estimate_list.jsp") for gubun in GUBUN_QUERY]
+
+
+def fetch(url: str) -> tuple:
+    start = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=60) as res:
+        body = res.read()
+    return time.perf_counter() - start, len(body), body
+
+
+def detail_urls_from_list(base_url: str, list_url: str, html: bytes) -> list:
+    """다운로더와 동일한 규칙으로 목록 페이지에서 상세 페이지 URL 추출"""
+    younglim_gubun = quote(parse_qs(urlparse(list_url).query).get('younglim_gubun', [''])[0])
+    urls = []
+    for row in BeautifulSoup(html, 'html.parser').select("table tbody tr"):
+        cols = row.find_all("td")
+        if len(cols) < 3:
+            continue
+        button = cols[-1].find("button", class_="trans_link")
+        if button and button.get("chulhano"):
+            urls.append(f"{base_url}/trans_doc.jsp?chulhano={button['chulhano']}&younglim_gubun={younglim_gubun}")
+            continue
+        button = cols[-1].find("button", class_="estimate_link")
+        if button and button.get("ordno"):
+            urls.append(f"{base_url}/estimate_doc.jsp?ordno={button['ordno']}&younglim_gubun={younglim_gubun}")
+    return urls
+
+
+def run_http(base_url: str, concurrency: int) -> dict:
+    """목록 4페이지 + 전체 상세 페이지를 지정 동시성으로 수집"""
+    start = time.perf_counter()
+    latencies = []
+    total_bytes = 0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pages = list(zip(list_urls(base_url), pool.map(fetch, list_urls(base_url))))
+        detail_urls = []
+        for url, (latency, size, body) in pages:
+            latencies.append(latency)
+            total_bytes += size
+            detail_urls.extend(detail_urls_from_list(base_url, url, body))
+
+        list_elapsed = time.perf_counter() - start
+        detail_latencies = []
+        for latency, size, _ in pool.map(fetch, detail_urls):
+            detail_latencies.append(latency)
+            total_bytes += size
+
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": "http",
+        "concurrency": concurrency,
+        "documents": len(detail_urls),
+        "elapsed_sec": round(elapsed, 3),
+        "list_phase_sec": round(list_elapsed, 3),
+        "documents_per_sec": round(len(detail_urls) / elapsed, 2) if elapsed else 0,
+        "bytes": total_bytes,
+        "detail_latency_ms": {
+            "p50": round(percentile(detail_latencies, 50) * 1000, 1),
+            "p95": round(percentile(detail_latencies, 95) * 1000, 1),
+            "p99": round(percentile(detail_latencies, 99) * 1000, 1),
+        }
+    }
+
+
+def run_cycle(base_url: str) -> dict:
+    """실제 다운로드 사이클 1회 측정 (Force Mode - 분산 락/히스토리 검사 생략)"""
+    os.environ["YOUNGRIM_BASE_URL"] = base_url
+    os.environ["YOUNGRIM_URL"] = f"{base_url}/main.jsp"
+
+    import v10_auto_server
+    from config import config
+    from document_archive import DocumentArchive
+
+    # 벤치마크 결과물이 운영 데이터와 섞이지 않도록 임시 디렉토리 사용
+    scratch = Path(tempfile.mkdtemp(prefix="bench_downloader_"))
+    config.DOWNLOADS_DIR = scratch / "downloads"
+    config.HISTORY_FILE = scratch / "history.json"
+    config.DOWNLOAD_HISTORY_FILE = scratch / "download_history.json"
+    for doc_type in ("ledger", "estimate"):
+        (config.DOWNLOADS_DIR / doc_type).mkdir(parents=True, exist_ok=True)
+    v10_auto_server.pending_index.downloads_dir = config.DOWNLOADS_DIR
+    v10_auto_server.work_queue.db_path = scratch / "work_queue.db"
+    v10_auto_server.document_archive = DocumentArchive(scratch / "archive")
+
+    downloader = v10_auto_server.AutoDownloader()
+    start = time.perf_counter()
+    downloader.download_cycle(force_mode=True)
+    elapsed = time.perf_counter() - start
+
+    # 다운로드한 문서는 업로드 전까지 pending 으로 남으므로 다운로드 히스토리로 집계
+    documents = sum(len(keys) for keys in v10_auto_server.load_download_history().values())
+    return {
+        "mode": "cycle",
+        "documents": documents,
+        "elapsed_sec": round(elapsed, 3),
+        "documents_per_sec": round(documents / elapsed, 2) if elapsed else 0,
+        "scratch_dir": str(scratch)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Downloader throughput benchmark against a fake OMS')
+    parser.add_argument('--mode', choices=['http', 'cycle', 'both'], default='http')
+    parser.add_argument('--base-url', help='Existing OMS stand-in (default: start fake OMS in-process)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--list-rows', type=int, default=20)
+    parser.add_argument('--detail-rows', type=int, default=20)
+    parser.add_argument('--list-latency-ms', type=int, default=100)
+    parser.add_argument('--detail-latency-ms', type=int, default=200)
+    parser.add_argument('--output', type=Path)
+    args = parser.parse_args()
+
+    settings = FakeOmsSettings(args.list_rows, args.detail_rows, args.list_latency_ms, args.detail_latency_ms)
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server, base_url = serve_in_thread(settings)
+        print(f"[Fake OMS] {base_url} ({settings})")
+
+    results = []
+    try:
+        if args.mode in ('http', 'both'):
+            for concurrency in args.concurrency:
+                result = run_http(base_url, concurrency)
+                results.append(result)
+                print(f"http  concurrency={concurrency:<3} {result['documents']} docs in {result['elapsed_sec']:.2f}s "
+                      f"({result['documents_per_sec']} docs/s, p95 {result['detail_latency_ms']['p95']} ms)")
+        if args.mode in ('cycle', 'both'):
+            result = run_cycle(base_url)
+            results.append(result)
+            print(f"cycle {result['documents']} docs in {result['elapsed_sec']:.2f}s ({result['documents_per_sec']} docs/s)")
+    finally:
+        if server:
+            server.shutdown()
+
+    write_results("downloader", {"base_url": base_url, "settings": vars(settings), "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
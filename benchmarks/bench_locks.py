@@ -0,0 +1,164 @@
+"""
+분산 락 경합 벤치마크
+=====================
+여러 매장 PC 가 같은 주문을 동시에 처리하려는 상황을 다중 프로세스로 재현하여
+DistributedLockManager 의 처리량 / 중복 처리율 / 지연 꼬리(p50/p95/p99)를 측정
+
+- Google Sheets 대신 localhost 매니저 프로세스의 FakeWorksheet(benchmarks/fake_sheets.py) 사용
+- 각 워커 프로세스 = 1대의 매장 PC (machine_id 고유), 동일 주문 목록을 처리
+- acquire 성공 → 작업 시간 대기 → release(completed)
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_locks --machines 4 --orders 50
+    python -m benchmarks.bench_locks --machines 3 --latency-ms 300 --jitter-ms 200 --quota-error-rate 0.05
+"""
+
+import os
+import time
+import random
+import logging
+import argparse
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+from benchmarks.fake_sheets import FakeSheetsSettings, serve_worksheet, connect_worksheet
+from benchmarks.synthetic_pages import order_number
+from benchmarks.results import write_results, percentile
+
+
+def _latency_summary(values: list) -> dict:
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50) * 1000, 1),
+        "p95": round(percentile(values, 95) * 1000, 1),
+        "p99": round(percentile(values, 99) * 1000, 1),
+    }
+
+
+def worker(index: int, address, order_ids: list, work_ms: float, shuffle: bool,
+           start_event, results, scratch_dir: str):
+    """매장 PC 1대 역할 - 주문 목록을 순회하며 락 획득/해제"""
+    # 로그/에러 파일이 운영 디렉토리에 쌓이지 않도록 임시 디렉토리에서 import
+    os.chdir(scratch_dir)
+    from lock_manager import DistributedLockManager, _InstrumentedSheets
+    logging.disable(logging.CRITICAL)  # 결과는 큐로 집계하므로 워커 로그는 생략
+
+    manager = DistributedLockManager()
+    manager.machine_id = f"bench-machine-{index}"
+    manager.lock_worksheet = _InstrumentedSheets(connect_worksheet(address))  # 운영과 같은 속도 제한/재시도 적용
+
+    orders = list(order_ids)
+    if shuffle:
+        random.Random(index).shuffle(orders)
+
+    acquired, acquire_latency, release_latency = [], [], []
+    start_event.wait()
+    start = time.perf_counter()
+    for order_id in orders:
+        t0 = time.perf_counter()
+        ok = manager.acquire_lock(order_id, notes="benchmark")
+        acquire_latency.append(time.perf_counter() - t0)
+        if not ok:
+            continue
+        acquired.append(order_id)
+        time.sleep(work_ms / 1000)
+        t0 = time.perf_counter()
+        manager.release_lock(order_id, DistributedLockManager.STATUS_COMPLETED)
+        release_latency.append(time.perf_counter() - t0)
+
+    results.put({
+        "machine_id": manager.machine_id,
+        "elapsed_sec": time.perf_counter() - start,
+        "acquired": acquired,
+        "acquire_latency": acquire_latency,
+        "release_latency": release_latency,
+    })
+
+
+def run(machines: int, orders: int, settings: FakeSheetsSettings, work_ms: float, shuffle: bool) -> dict:
+    order_ids = [order_number("ledger", i) for i in range(1, orders + 1)]
+    ctx = multiprocessing.get_context("spawn")  # Windows 와 동일한 시작 방식
+    sheets = serve_worksheet(settings)
+    scratch = tempfile.mkdtemp(prefix="bench_locks_")
+    start_event = ctx.Event()
+    results = ctx.Queue()
+
+    try:
+        processes = [
+            ctx.Process(target=worker, args=(i, sheets.address, order_ids, work_ms, shuffle,
+                                             start_event, results, scratch))
+            for i in range(machines)
+        ]
+        for p in processes:
+            p.start()
+        time.sleep(1.0)  # 워커 import 완료 대기 후 동시 출발
+        start = time.perf_counter()
+        start_event.set()
+        reports = [results.get() for _ in processes]
+        elapsed = time.perf_counter() - start
+        for p in processes:
+            p.join()
+        sheet_stats = sheets.worksheet().call_stats()
+    finally:
+        sheets.shutdown()
+
+    processed_by = {}
+    for report in reports:
+        for order_id in report["acquired"]:
+            processed_by.setdefault(order_id, []).append(report["machine_id"])
+    duplicates = sum(1 for owners in processed_by.values() if len(owners) > 1)
+    acquire_latency = [v for r in reports for v in r["acquire_latency"]]
+    release_latency = [v for r in reports for v in r["release_latency"]]
+    lock_ops = len(acquire_latency) + len(release_latency)
+
+    return {
+        "machines": machines,
+        "orders": orders,
+        "shuffle": shuffle,
+        "work_ms": work_ms,
+        "elapsed_sec": round(elapsed, 3),
+        "lock_ops_per_sec": round(lock_ops / elapsed, 2) if elapsed else 0,
+        "orders_per_sec": round(len(processed_by) / elapsed, 2) if elapsed else 0,
+        "processed_orders": len(processed_by),
+        "missed_orders": orders - len(processed_by),
+        "duplicate_orders": duplicates,
+        "duplicate_rate": round(duplicates / orders, 4) if orders else 0,
+        "acquire_latency_ms": _latency_summary(acquire_latency),
+        "release_latency_ms": _latency_summary(release_latency),
+        "per_machine": {r["machine_id"]: len(r["acquired"]) for r in reports},
+        "sheet": sheet_stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Distributed lock contention benchmark against a fake Sheets backend')
+    parser.add_argument('--machines', type=int, nargs='+', default=[3, 4])
+    parser.add_argument('--orders', type=int, default=50)
+    parser.add_argument('--latency-ms', type=float, default=150)
+    parser.add_argument('--jitter-ms', type=float, default=100)
+    parser.add_argument('--quota-error-rate', type=float, default=0.0)
+    parser.add_argument('--work-ms', type=float, default=50, help='Simulated processing time per acquired order')
+    parser.add_argument('--shuffle', action='store_true', help='Each machine visits orders in a different order')
+    parser.add_argument('--output', type=Path)
+    args = parser.parse_args()
+
+    settings = FakeSheetsSettings(args.latency_ms, args.jitter_ms, args.quota_error_rate)
+    print(f"[Fake Sheets] {settings}")
+
+    results = []
+    for machines in args.machines:
+        result = run(machines, args.orders, settings, args.work_ms, args.shuffle)
+        results.append(result)
+        print(f"machines={machines:<2} {result['lock_ops_per_sec']} lock ops/s, "
+              f"duplicates {result['duplicate_orders']}/{args.orders} ({result['duplicate_rate']:.1%}), "
+              f"missed {result['missed_orders']}, "
+              f"acquire p50/p95/p99 {result['acquire_latency_ms']['p50']}/"
+              f"{result['acquire_latency_ms']['p95']}/{result['acquire_latency_ms']['p99']} ms, "
+              f"429s {result['sheet']['quota_errors']}")
+
+    write_results("locks", {"settings": vars(settings), "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
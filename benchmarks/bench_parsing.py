@@ -0,0 +1,113 @@
+"""
+파싱/코드 생성 파이프라인 벤치마크
+==================================
+합성 원장/견적 상세 페이지(10/100/1,000행)로 다음 함수의 소요 시간을 측정하고
+결과를 JSON 으로 저장하여 릴리스 간 성능 회귀를 비교
+
+- local_file_processor.parse_html_table
+- local_file_processor.extract_html_from_mhtml
+- local_file_processor.generate_product_code (행 단위)
+- local_file_processor.process_html_content (end-to-end)
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_parsing
+    python -m benchmarks.bench_parsing --sizes 10 100 --repeat 3 --compare benchmarks/results/parsing_20260115_120000.json
+"""
+
+import io
+import sys
+import json
+import time
+import argparse
+import statistics
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import local_file_processor
+from benchmarks.results import write_results
+from benchmarks.synthetic_pages import generate_detail_page, generate_mhtml
+
+DEFAULT_SIZES = [10, 100, 1000]
+
+
+def measure(func, repeat: int) -> dict:
+    """func 를 repeat 회 실행하여 소요 시간 통계(ms) 반환 (처리 함수의 print 출력은 버림)"""
+    timings = []
+    for _ in range(repeat):
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "repeat": repeat
+    }
+
+
+def run_benchmarks(sizes, repeat: int) -> list:
+    results = []
+    for doc_type in ("ledger", "estimate"):
+        for rows in sizes:
+            html = generate_detail_page(rows, doc_type=doc_type, seed=rows)
+            mhtml = generate_mhtml(html)
+            parsed = local_file_processor.parse_html_table(html)
+            assert len(parsed) == rows, f"synthetic page parsed to {len(parsed)} rows, expected {rows}"
+
+            def generate_codes():
+                for row in parsed:
+                    local_file_processor.generate_product_code(row[2], row[3], row[4], row[8], 'Y')
+
+            cases = {
+                "parse_html_table": lambda: local_file_processor.parse_html_table(html),
+                "extract_html_from_mhtml": lambda: local_file_processor.extract_html_from_mhtml(mhtml),
+                "generate_product_code": generate_codes,
+                "process_html_content": lambda: local_file_processor.process_html_content(
+                    html, file_path_hint="benchmark.html", target_type=doc_type),
+            }
+            for name, func in cases.items():
+                stats = measure(func, repeat)
+                results.append({"benchmark": name, "doc_type": doc_type, "rows": rows,
+                                "html_bytes": len(html.encode("utf-8")), **stats})
+                print(f"{name:<26} {doc_type:<9} {rows:>5} rows  median {stats['median_ms']:>10.3f} ms")
+    return results
+
+
+def compare(results: list, baseline_path: Path, threshold: float):
+    """이전 결과 파일과 중앙값 비교 - threshold 비율 이상 느려진 항목 표시"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r["benchmark"], r["doc_type"], r["rows"]): r for r in json.load(f)["results"]}
+
+    print(f"\n[비교] 기준: {baseline_path}")
+    regressions = 0
+    for r in results:
+        base = baseline.get((r["benchmark"], r["doc_type"], r["rows"]))
+        if not base or not base["median_ms"]:
+            continue
+        ratio = r["median_ms"] / base["median_ms"]
+        mark = "REGRESSION" if ratio > 1 + threshold else ""
+        regressions += bool(mark)
+        print(f"{r['benchmark']:<26} {r['doc_type']:<9} {r['rows']:>5} rows  x{ratio:5.2f} {mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parsing pipeline benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Row counts per page')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions per case')
+    parser.add_argument('--output', type=Path, help='Result JSON path (default: benchmarks/results/parsing_<timestamp>.json)')
+    parser.add_argument('--compare', type=Path, help='Previous result JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Relative slowdown reported as regression')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.repeat)
+
+    write_results("parsing", {"results": results}, args.output)
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
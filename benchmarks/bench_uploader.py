@@ -0,0 +1,226 @@
+"""
+ERP 업로드 end-to-end 벤치마크
+==============================
+Ecount 웹자료올리기 대역 페이지(benchmarks/mock_erp/web_uploader.html)를 로컬에서 서빙하고
+ErpUploadAutomation.run() 전체 경로를 헤드리스 Chromium 으로 실행하여 단계별 소요 시간 측정
+
+- 단계별 시간: instrumentation span (erp_start_browser, erp_load_session, erp_navigate,
+  erp_open_web_uploader, erp_paste) 을 수집
+- 페이지 측 시간: 버튼 표시 / 팝업 열림 / 그리드 준비 / 붙여넣기 반영 시점 (window.__mockErp)
+- 대기 시간(sleep) 최적화 전후 비교용 - 대역 페이지의 렌더링 지연은 옵션으로 조절
+
+실행 (저장소 루트에서, playwright + chromium 필요):
+    python -m benchmarks.bench_uploader --rows 20 --repeat 3
+    python -m benchmarks.bench_uploader --render-ms 3000 --popup-ms 1500
+    python -m benchmarks.bench_uploader --serve --port 5091   # 대역 페이지만 실행 (ECOUNT_ERP_URL 로 연결)
+"""
+
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import urllib.request
+from pathlib import Path
+from dataclasses import dataclass, asdict
+
+from flask import Flask
+
+from benchmarks.results import write_results
+
+MOCK_PAGE = Path(__file__).parent / "mock_erp" / "web_uploader.html"
+ERP_PATH = "/ec5/view/erp"
+STAGES = ("erp_start_browser", "erp_load_session", "erp_navigate", "erp_open_web_uploader", "erp_paste")
+
+_stage_times = {}  # 현재 실행의 span 측정값 (name -> {sec, outcome})
+
+
+def _record_stage(name: str, duration: float, outcome: str, fields: dict):
+    if name in STAGES:
+        _stage_times[name] = {"sec": round(duration, 3), "outcome": outcome}
+
+
+@dataclass
+class MockErpSettings:
+    render_ms: int = 1500     # 해시 라우팅 후 #webUploader 버튼 표시까지
+    popup_ms: int = 800       # 버튼 클릭 후 .ui-dialog 표시까지
+    grid_ms: int = 300        # 팝업 표시 후 span.grid-input-data 그리드 준비까지
+    grid_rows: int = 5        # 빈 그리드 행 수
+    paste_ms: int = 200       # 붙여넣기 후 그리드 반영까지
+
+
+def create_app(settings: MockErpSettings = None) -> Flask:
+    settings = settings or MockErpSettings()
+    template = MOCK_PAGE.read_text(encoding="utf-8")
+    app = Flask(__name__)
+
+    @app.route(ERP_PATH)
+    def erp():
+        return template.replace("__MOCK_SETTINGS__", json.dumps(asdict(settings)))
+
+    return app
+
+
+def serve_in_thread(settings: MockErpSettings = None, host: str = "127.0.0.1", port: int = 0):
+    """백그라운드 스레드에서 대역 페이지 서빙 후 (server, erp_url) 반환"""
+    import logging
+    from werkzeug.serving import make_server
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server(host, port, create_app(settings), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}{ERP_PATH}"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def launch_chromium(port: int, executable: str = None, headless: bool = True) -> subprocess.Popen:
+    """업로더가 CDP 로 붙을 수 있도록 원격 디버깅 포트를 연 Chromium 실행"""
+    if not executable:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as p:
+            executable = p.chromium.executable_path
+
+    profile = tempfile.mkdtemp(prefix="bench_uploader_profile_")
+    args = [executable, f"--remote-debugging-port={port}", f"--user-data-dir={profile}",
+            "--no-first-run", "--no-default-browser-check", "about:blank"]
+    if headless:
+        args.insert(1, "--headless=new")
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=1).read()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"Chromium did not open the debugging port {port}")
+
+
+def synthetic_rows(count: int) -> list:
+    """ERP 웹자료올리기 형식의 합성 데이터 (일자, 순서, 거래처, 품목, 수량, 단가 ...)"""
+    rows = []
+    for i in range(1, count + 1):
+        quantity, price = i % 5 + 1, 10000 + i * 100
+        rows.append(["20260115", str(i), "00001", "영림임업", "", "100", f"YL-{i:04d}",
+                     f"ABS도어 {i}", "900*2100", str(quantity), str(price), str(quantity * price), "benchmark"])
+    return rows
+
+
+def run_once(rows: list, target_type: str) -> dict:
+    from erp_upload_automation_v2 import ErpUploadAutomation
+
+    class BenchUploadAutomation(ErpUploadAutomation):
+        """OS 클립보드 대신 헤드리스 페이지에 붙여넣기 데이터를 주입하는 벤치마크용 업로더"""
+
+        def copy_to_clipboard(self) -> bool:
+            self.clipboard_text = "\r\n".join("\t".join(row) for row in self.erp_data)
+            return True
+
+        def start_browser(self, headless=False):
+            super().start_browser(headless=headless)
+            self.page.add_init_script(f"window.__benchClipboard = {json.dumps(self.clipboard_text)};")
+
+    _stage_times.clear()
+    automation = BenchUploadAutomation()
+    start = time.perf_counter()
+    ok = automation.run(direct_data=rows, auto_close=True, target_type=target_type)
+    elapsed = time.perf_counter() - start
+
+    page_metrics = {}
+    try:
+        page_metrics = automation.page.evaluate("window.__mockErp") or {}
+    except Exception:
+        pass
+    finally:
+        # 같은 스레드에서 다음 실행이 sync_playwright 를 다시 시작할 수 있도록 정리
+        try:
+            automation.page.close()
+        except Exception:
+            pass
+        if automation.playwright:
+            automation.playwright.stop()
+        automation.log_file.close()
+
+    return {
+        "ok": bool(ok),
+        "elapsed_sec": round(elapsed, 3),
+        "stages": dict(_stage_times),
+        "rows_sent": len(rows),
+        "rows_received": page_metrics.get("rows", 0),
+        "page_events": page_metrics.get("events", []),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end ERP upload benchmark against a mock web uploader')
+    parser.add_argument('--serve', action='store_true', help='Only serve the mock ERP page')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--rows', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--target-type', choices=['ledger', 'estimate'], default='ledger')
+    parser.add_argument('--render-ms', type=int, default=1500)
+    parser.add_argument('--popup-ms', type=int, default=800)
+    parser.add_argument('--grid-ms', type=int, default=300)
+    parser.add_argument('--paste-ms', type=int, default=200)
+    parser.add_argument('--chromium', help='Chromium/Chrome executable (default: playwright bundled chromium)')
+    parser.add_argument('--headed', action='store_true')
+    parser.add_argument('--output', type=Path)
+    args = parser.parse_args()
+
+    settings = MockErpSettings(args.render_ms, args.popup_ms, args.grid_ms, paste_ms=args.paste_ms)
+
+    if args.serve:
+        port = args.port or 5091
+        print(f"[Mock ERP] http://127.0.0.1:{port}{ERP_PATH}  ({settings})")
+        print(f"[Mock ERP] 업로더 연결: ECOUNT_ERP_URL=http://127.0.0.1:{port}{ERP_PATH}")
+        create_app(settings).run(host="127.0.0.1", port=port, threaded=True)
+        return
+
+    from config import config
+    from instrumentation import add_span_listener
+
+    add_span_listener(_record_stage)
+    server, erp_url = serve_in_thread(settings, port=args.port)
+    debug_port = _free_port()
+    browser = launch_chromium(debug_port, args.chromium, headless=not args.headed)
+
+    # 업로더가 대역 페이지/로컬 Chromium 을 사용하도록 설정 교체, 로그/스크린샷은 임시 디렉토리에
+    config.ECOUNT_ERP_URL = erp_url
+    config.BROWSER_DEBUG_PORT = debug_port
+    config.UPLOADER_LOGS_DIR = Path(tempfile.mkdtemp(prefix="bench_uploader_logs_"))
+    print(f"[Mock ERP] {erp_url} ({settings}), Chromium CDP port {debug_port}")
+
+    results = []
+    try:
+        rows = synthetic_rows(args.rows)
+        for i in range(args.repeat):
+            result = run_once(rows, args.target_type)
+            results.append(result)
+            stage_text = ", ".join(f"{name.replace('erp_', '')} {info['sec']:.2f}s"
+                                   for name, info in result["stages"].items())
+            print(f"run {i + 1}: {'OK' if result['ok'] else 'FAILED'} {result['elapsed_sec']:.2f}s "
+                  f"({stage_text}) rows {result['rows_received']}/{result['rows_sent']}")
+    finally:
+        browser.terminate()
+        server.shutdown()
+
+    write_results("uploader", {
+        "settings": asdict(settings),
+        "rows": args.rows,
+        "target_type": args.target_type,
+        "logs_dir": str(config.UPLOADER_LOGS_DIR),
+        "results": results
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
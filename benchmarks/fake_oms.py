@@ -0,0 +1,113 @@
+"""
+로컬 OMS 대역 서버 (Fake OMS)
+=============================
+영림 OMS(door.yl.co.kr) 없이 다운로더를 측정/부하 테스트하기 위한 Flask 앱
+
+제공 페이지 (실서버와 동일한 경로):
+- /oms/main.jsp
+- /oms/ledger_list.jsp, /oms/estimate_list.jsp   - trans_link(chulhano) / estimate_link(ordno) 버튼이 있는 목록
+- /oms/trans_doc.jsp?chulhano=..., /oms/estimate_doc.jsp?ordno=...  - table.table-item 상세 페이지
+
+실행:
+    python -m benchmarks.fake_oms --port 5090 --list-rows 50 --detail-rows 30 --detail-latency-ms 300
+
+다운로더를 대역 서버로 향하게 하려면 .env 또는 환경변수에
+    YOUNGRIM_BASE_URL=http://127.0.0.1:5090/oms
+"""
+
+import time
+import zlib
+import argparse
+import threading
+from dataclasses import dataclass
+
+from flask import Flask, request, abort
+
+from benchmarks.synthetic_pages import generate_list_page, generate_detail_page
+
+
+@dataclass
+class FakeOmsSettings:
+    list_rows: int = 20            # 목록 페이지당 주문 수
+    detail_rows: int = 20          # 상세 페이지당 품목 행 수
+    list_latency_ms: int = 0       # 목록 페이지 응답 지연
+    detail_latency_ms: int = 0     # 상세 페이지 응답 지연
+
+
+def create_app(settings: FakeOmsSettings = None) -> Flask:
+    settings = settings or FakeOmsSettings()
+    app = Flask(__name__)
+    app.config["FAKE_OMS"] = settings
+    requests_served = {"list": 0, "detail": 0}
+    counter_lock = threading.Lock()
+
+    def count(kind):
+        with counter_lock:
+            requests_served[kind] += 1
+
+    def row_count(default: int) -> int:
+        # 쿼리스트링 rows= 로 요청별 행 수 변경 가능
+        return request.args.get("rows", default, type=int)
+
+    @app.route('/oms/main.jsp')
+    def main_page():
+        return "<html><body><h1>OMS (fake)</h1></body></html>"
+
+    @app.route('/oms/ledger_list.jsp')
+    @app.route('/oms/estimate_list.jsp')
+    def list_page():
+        doc_type = "ledger" if request.path.endswith("ledger_list.jsp") else "estimate"
+        time.sleep(settings.list_latency_ms / 1000)
+        count("list")
+        # 산업/임업 페이지가 서로 다른 주문을 갖도록 구분별로 번호 대역을 나눔
+        start = 1 if request.args.get("younglim_gubun", "") == "산업" else 5001
+        return generate_list_page(row_count(settings.list_rows), doc_type=doc_type, start=start)
+
+    @app.route('/oms/trans_doc.jsp')
+    @app.route('/oms/estimate_doc.jsp')
+    def detail_page():
+        doc_type = "ledger" if request.path.endswith("trans_doc.jsp") else "estimate"
+        doc_id = request.args.get("chulhano" if doc_type == "ledger" else "ordno", "")
+        if not doc_id:
+            abort(400)
+        time.sleep(settings.detail_latency_ms / 1000)
+        count("detail")
+        return generate_detail_page(row_count(settings.detail_rows), doc_type=doc_type, seed=zlib.crc32(doc_id.encode()))
+
+    @app.route('/oms/_stats')
+    def served_stats():
+        with counter_lock:
+            return dict(requests_served)
+
+    return app
+
+
+def serve_in_thread(settings: FakeOmsSettings = None, host: str = "127.0.0.1", port: int = 0):
+    """백그라운드 스레드에서 대역 서버 실행 후 (server, base_url) 반환 - server.shutdown() 으로 종료"""
+    import logging
+    from werkzeug.serving import make_server
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)  # 요청별 접근 로그가 측정 출력을 덮지 않도록
+    server = make_server(host, port, create_app(settings), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}/oms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake OMS server for downloader benchmarks')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5090)
+    parser.add_argument('--list-rows', type=int, default=20)
+    parser.add_argument('--detail-rows', type=int, default=20)
+    parser.add_argument('--list-latency-ms', type=int, default=0)
+    parser.add_argument('--detail-latency-ms', type=int, default=0)
+    args = parser.parse_args()
+
+    settings = FakeOmsSettings(args.list_rows, args.detail_rows, args.list_latency_ms, args.detail_latency_ms)
+    print(f"[Fake OMS] http://{args.host}:{args.port}/oms  ({settings})")
+    print(f"[Fake OMS] 다운로더 연결: YOUNGRIM_BASE_URL=http://{args.host}:{args.port}/oms")
+    create_app(settings).run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Google Sheets 락 시트 대역 (Fake Sheets Lock Backend)
+=====================================================
+DistributedLockManager 가 사용하는 gspread Worksheet API 부분집합을 메모리로 구현
+
+- find, row_values, update_cell, append_row, get_all_values, get_all_records, delete_rows, cell
+- 호출마다 설정된 지연(latency + jitter)과 할당량 오류(HTTP 429) 주입
+- 각 호출은 실제 Sheets 처럼 원자적으로 처리되지만 호출 사이에는 경합이 발생할 수 있음
+- serve_worksheet() 로 localhost 매니저 프로세스에 띄우면 여러 프로세스(=여러 매장 PC)가 같은 시트를 공유
+"""
+
+import time
+import random
+import threading
+from dataclasses import dataclass
+from multiprocessing.managers import BaseManager
+
+LOCK_SHEET_HEADER = ["order_id", "locked_by", "locked_at", "status", "machine_id", "notes"]
+
+
+@dataclass
+class FakeSheetsSettings:
+    latency_ms: float = 150.0       # 호출당 기본 지연
+    jitter_ms: float = 100.0        # 추가 지연 (0 ~ jitter 균등분포)
+    quota_error_rate: float = 0.0   # 호출이 429 로 거절될 확률 (0.0 ~ 1.0)
+
+
+class _FakeResponse:
+    status_code = 429
+    headers = {"Retry-After": "1"}
+
+
+class FakeQuotaError(Exception):
+    """gspread.exceptions.APIError 와 동일하게 response.status_code 를 갖는 할당량 초과 오류"""
+
+    def __init__(self, method: str):
+        super().__init__(f"[429] Quota exceeded for quota metric 'Read/Write requests' ({method})")
+        self.response = _FakeResponse()
+
+
+class Cell:
+    def __init__(self, row: int, col: int, value: str):
+        self.row = row
+        self.col = col
+        self.value = value
+
+    def __repr__(self):
+        return f"<Cell R{self.row}C{self.col} {self.value!r}>"
+
+
+def _parse_a1(ref: str):
+    """"B5" -> (5, 2), "A" -> (0, 1) (행 생략 시 0)"""
+    letters = "".join(ch for ch in ref if ch.isalpha())
+    digits = ref[len(letters):]
+    col = 0
+    for ch in letters.upper():
+        col = col * 26 + ord(ch) - 64
+    return int(digits) if digits else 0, col
+
+
+class FakeWorksheet:
+    """In-memory stand-in for the gspread Worksheet calls made by the lock manager."""
+
+    def __init__(self, settings: FakeSheetsSettings = None, rows=None, title: str = "processing_lock", sheet_id: int = 0):
+        self.settings = settings or FakeSheetsSettings()
+        self.title = title
+        self.id = sheet_id
+        self._rows = [list(LOCK_SHEET_HEADER)] + [list(r) for r in (rows or [])]
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._quota_errors = 0
+
+    def _request(self, method: str):
+        """네트워크 왕복 지연 및 할당량 오류 시뮬레이션"""
+        delay = self.settings.latency_ms + random.uniform(0, self.settings.jitter_ms)
+        time.sleep(delay / 1000)
+        with self._lock:
+            self._calls[method] = self._calls.get(method, 0) + 1
+            if random.random() < self.settings.quota_error_rate:
+                self._quota_errors += 1
+                raise FakeQuotaError(method)
+
+    # --- gspread Worksheet API subset ---
+
+    def find(self, query, in_row=None, in_column=None):
+        self._request("find")
+        with self._lock:
+            for r, row in enumerate(self._rows, start=1):
+                if in_row and r != in_row:
+                    continue
+                for c, value in enumerate(row, start=1):
+                    if in_column and c != in_column:
+                        continue
+                    if value == str(query):
+                        return Cell(r, c, value)
+        return None
+
+    def row_values(self, row: int):
+        self._request("row_values")
+        with self._lock:
+            values = list(self._rows[row - 1]) if 0 < row <= len(self._rows) else []
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    def cell(self, row: int, col: int):
+        self._request("cell")
+        with self._lock:
+            values = self._rows[row - 1] if 0 < row <= len(self._rows) else []
+            return Cell(row, col, values[col - 1] if col <= len(values) else "")
+
+    def update_cell(self, row: int, col: int, value):
+        self._request("update_cell")
+        with self._lock:
+            self._set(row, col, value)
+
+    def append_row(self, values, **kwargs):
+        self._request("append_row")
+        with self._lock:
+            self._rows.append([str(v) for v in values])
+
+    def append_rows(self, values, **kwargs):
+        self._request("append_rows")
+        with self._lock:
+            self._rows.extend([str(v) for v in row] for row in values)
+
+    def col_values(self, col: int):
+        self._request("col_values")
+        with self._lock:
+            values = [row[col - 1] if col <= len(row) else "" for row in self._rows]
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    def batch_get(self, ranges, **kwargs):
+        self._request("batch_get")
+        with self._lock:
+            return [self._read_range(a1) for a1 in ranges]
+
+    def batch_update(self, data, **kwargs):
+        self._request("batch_update")
+        with self._lock:
+            for entry in data:
+                row, col = _parse_a1(entry["range"].split(":")[0])
+                for r_offset, values in enumerate(entry["values"]):
+                    for c_offset, value in enumerate(values):
+                        self._set(row + r_offset, col + c_offset, value)
+
+    def _set(self, row: int, col: int, value):
+        while len(self._rows) < row:
+            self._rows.append([])
+        target = self._rows[row - 1]
+        while len(target) < col:
+            target.append("")
+        target[col - 1] = str(value)
+
+    def _read_range(self, a1: str):
+        """A1 범위("A:A", "A5:F5") 값 - gspread 처럼 뒤쪽 빈 셀/행은 잘라냄"""
+        start, _, end = a1.partition(":")
+        r1, c1 = _parse_a1(start)
+        r2, c2 = _parse_a1(end or start)
+        r1, r2 = r1 or 1, r2 or len(self._rows)
+        result = []
+        for row in self._rows[r1 - 1:r2]:
+            values = row[c1 - 1:c2]
+            while values and values[-1] == "":
+                values.pop()
+            result.append(values)
+        while result and not result[-1]:
+            result.pop()
+        return result
+
+    def get_all_values(self):
+        self._request("get_all_values")
+        with self._lock:
+            return [list(r) for r in self._rows]
+
+    def get_all_records(self, **kwargs):
+        self._request("get_all_records")
+        with self._lock:
+            header = self._rows[0]
+            return [dict(zip(header, r + [""] * (len(header) - len(r)))) for r in self._rows[1:]]
+
+    def delete_rows(self, start_index: int, end_index: int = None):
+        self._request("delete_rows")
+        with self._lock:
+            del self._rows[start_index - 1:(end_index or start_index)]
+
+    # --- benchmark helpers (not part of gspread) ---
+
+    def delete_row_range(self, start_index: int, end_index: int):
+        """deleteDimension 요청 처리 (0-based, end 미포함) - FakeSpreadsheet.batch_update 에서 호출"""
+        with self._lock:
+            del self._rows[start_index:end_index]
+
+    def call_stats(self) -> dict:
+        with self._lock:
+            return {"calls": dict(self._calls), "quota_errors": self._quota_errors, "rows": len(self._rows)}
+
+
+class FakeSpreadsheet:
+    """gspread Spreadsheet 대역 - 워크시트 조회/추가와 행 삭제 batchUpdate 만 지원"""
+
+    def __init__(self, settings: FakeSheetsSettings = None, worksheets=None):
+        self.settings = settings or FakeSheetsSettings()
+        self._worksheets = {ws.title: ws for ws in (worksheets or [FakeWorksheet(self.settings)])}
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        if title not in self._worksheets:
+            raise LookupError(f"Worksheet not found: {title}")
+        return self._worksheets[title]
+
+    def worksheets(self):
+        return list(self._worksheets.values())
+
+    def add_worksheet(self, title: str, rows: int = 1000, cols: int = 26) -> FakeWorksheet:
+        ws = FakeWorksheet(self.settings, title=title, sheet_id=len(self._worksheets))
+        ws._rows = []
+        self._worksheets[title] = ws
+        return ws
+
+    def batch_update(self, body: dict):
+        by_id = {ws.id: ws for ws in self._worksheets.values()}
+        first = next(iter(self._worksheets.values()))
+        first._request("spreadsheet_batch_update")
+        for request in body.get("requests", []):
+            rng = request["deleteDimension"]["range"]
+            by_id[rng["sheetId"]].delete_row_range(rng["startIndex"], rng["endIndex"])
+        return {"replies": [{} for _ in body.get("requests", [])]}
+
+
+# ------------------------------------------------------------
+# localhost 공유 (multiprocessing manager)
+# ------------------------------------------------------------
+_shared_worksheet = None
+
+
+def _init_shared(settings: FakeSheetsSettings):
+    global _shared_worksheet
+    _shared_worksheet = FakeWorksheet(settings)
+
+
+def _get_shared():
+    return _shared_worksheet
+
+
+class FakeSheetsManager(BaseManager):
+    pass
+
+
+FakeSheetsManager.register("worksheet", callable=_get_shared)
+
+
+def serve_worksheet(settings: FakeSheetsSettings, authkey: bytes = b"fake-sheets") -> FakeSheetsManager:
+    """공유 FakeWorksheet 를 가진 매니저 프로세스 시작 (manager.address 로 다른 프로세스에서 접속)"""
+    manager = FakeSheetsManager(address=("127.0.0.1", 0), authkey=authkey)
+    manager.start(_init_shared, (settings,))
+    return manager
+
+
+def connect_worksheet(address, authkey: bytes = b"fake-sheets"):
+    """다른 프로세스에서 공유 FakeWorksheet 프록시 획득"""
+    manager = FakeSheetsManager(address=address, authkey=authkey)
+    manager.connect()
+    return manager.worksheet()
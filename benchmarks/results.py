@@ -0,0 +1,45 @@
+"""벤치마크 결과 저장 공통 함수"""
+
+import os
+import sys
+import json
+import platform
+import datetime
+import subprocess
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def write_results(prefix: str, payload: dict, output: Path = None) -> Path:
+    """실행 환경 정보와 함께 결과를 JSON 으로 저장 (기본: results/<prefix>_<timestamp>.json)"""
+    output = output or RESULTS_DIR / f"{prefix}_{datetime.datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            "created_at": datetime.datetime.now().isoformat(),
+            "git_revision": git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            **payload
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\n[OK] 결과 저장: {output}")
+    return output
+
+
+def percentile(values, pct: float) -> float:
+    """정렬 후 nearest-rank 방식 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
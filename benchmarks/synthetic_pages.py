@@ -0,0 +1,132 @@
+"""
+합성 OMS 페이지 생성기 (Synthetic OMS Pages)
+============================================
+벤치마크용으로 영림 OMS 화면 구조를 흉내낸 HTML/MHTML 을 생성
+
+- 상세 페이지: table.table-item (td-header 헤더행 + div.div-item 셀) - trans_doc.jsp / estimate_doc.jsp
+- 목록 페이지: table tbody tr, 마지막 컬럼에 trans_link(chulhano) / estimate_link(ordno) 버튼
+- MHTML: quoted-printable 인코딩된 text/html 파트를 가진 multipart/related 문서
+
+동일한 seed 로 항상 동일한 페이지가 생성되어 릴리스 간 결과 비교가 가능
+"""
+
+import quopri
+import random
+from html import escape
+
+# 실제 문서에서 자주 보이는 품목 (색상, 품명, 규격, 비고) - 코드 생성 분기를 고루 타도록 구성
+ITEM_TEMPLATES = [
+    ("PS047", "일체형문틀(식기X)", "90*900*2100/ N", "키홈좌 상 1142"),
+    ("집성", "무메문틀(30T이하)(식기X)", "110*1050*2200/ N", "전체소재두께30MM"),
+    ("영림101 화이트", "ABS도어 YS-207", "36*900*2100/ S", ""),
+    ("영림205", "미서기 3연동 도어", "40*1200*2300/", ""),
+    ("PX120", "슬림 3연동 레일", "2400", ""),
+    ("영림303", "문선몰딩(60*9)", "2400", "60*9"),
+    ("화이트오크", "템바보드 소반달형", "2400*600", "방염"),
+    ("영림110", "천장몰딩 40MM평판", "2400", "(9T)"),
+    ("", "키홈가공", "/ ", ""),
+    ("영림412", "발포 분리형 문틀", "140*900*2100*/", ""),
+]
+
+DOC_TITLES = {"ledger": "거래명세서", "estimate": "견적서"}
+
+
+def _cell(text: str, style: str = "") -> str:
+    style_attr = f' style="{style}"' if style else ""
+    return f'<td class="td-item"><div class="div-item"{style_attr}>{escape(text)}</div></td>'
+
+
+def generate_detail_page(row_count: int, doc_type: str = "ledger", seed: int = 0) -> str:
+    """상세 페이지 HTML 생성 (row_count 개 품목 행)"""
+    rng = random.Random(seed)
+    rows = []
+    for no in range(1, row_count + 1):
+        color, item, spec, remarks = rng.choice(ITEM_TEMPLATES)
+        quantity = rng.choice([1, 2, 3, 5, 10])
+        price = rng.randrange(3_000, 150_000, 100)
+        rows.append(
+            "<tr>"
+            + _cell(str(no))
+            + _cell(color, "text-align: center;")
+            + _cell(item, "text-align: center;")
+            + _cell(spec)
+            + _cell(f"{quantity:.1f}")
+            + _cell(f"{price:,}", "justify-content: end;")
+            + _cell(f"{price * quantity:,}", "justify-content: end;")
+            + _cell(remarks, "justify-content: start;")
+            + "</tr>"
+        )
+
+    header = "".join(f'<td class="td-header">{h}</td>' for h in ["NO", "색상", "품명", "규격", "수량", "단가", "공급가액", "비고"])
+    return f"""<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{DOC_TITLES[doc_type]}</title></head>
+<body>
+<div class="doc-header">www.yl.co.kr 영림 {DOC_TITLES[doc_type]}</div>
+<table class="table table-sm table-bordered">
+<tbody><tr><td class="td-header">공급자</td><td>영림임업</td><td class="td-header">합계</td><td>-</td></tr></tbody>
+</table>
+<table class="table table-sm table-bordered table-item">
+<colgroup><col style="width:30px"/><col style="width:70px"/><col style="width:150px"/><col style="width:120px"/><col style="width:50px"/><col style="width:70px"/><col style="width:70px"/><col/></colgroup>
+<tbody>
+<tr>{header}</tr>
+{chr(10).join(rows)}
+<tr>{_cell("합계")}{_cell("")}{_cell("")}{_cell("")}{_cell("")}{_cell("")}{_cell("-")}{_cell("")}</tr>
+</tbody>
+</table>
+</body>
+</html>
+"""
+
+
+def generate_mhtml(html: str, url: str = "http://door.yl.co.kr/oms/trans_doc.jsp") -> str:
+    """HTML 을 브라우저 '웹페이지 저장(MHTML)' 형식으로 감싸기"""
+    boundary = "----MultipartBoundary--benchmark----"
+    body = quopri.encodestring(html.encode("utf-8")).decode("ascii")
+    return (
+        "From: <Saved by Blink>\r\n"
+        "Subject: benchmark\r\n"
+        "MIME-Version: 1.0\r\n"
+        f'Content-Type: multipart/related;\r\n\ttype="text/html";\r\n\tboundary="{boundary}"\r\n'
+        "\r\n"
+        f"--{boundary}\r\n"
+        "Content-Type: text/html\r\n"
+        "Content-ID: <frame-0@mhtml.blink>\r\n"
+        "Content-Transfer-Encoding: quoted-printable\r\n"
+        f"Content-Location: {url}\r\n"
+        "\r\n"
+        f"{body}\r\n"
+        f"--{boundary}--\r\n"
+    )
+
+
+def order_number(doc_type: str, index: int) -> str:
+    """목록 페이지 주문번호 (원장: 26-01-15-0001, 견적: 2026-01-15-0001 형식)"""
+    prefix = "26-01-15" if doc_type == "ledger" else "2026-01-15"
+    return f"{prefix}-{index:04d}"
+
+
+def generate_list_page(row_count: int, doc_type: str = "ledger", start: int = 1) -> str:
+    """목록 페이지 HTML 생성 (ledger_list.jsp / estimate_list.jsp)"""
+    button_class, button_attr = ("trans_link", "chulhano") if doc_type == "ledger" else ("estimate_link", "ordno")
+    rows = []
+    for i in range(start, start + row_count):
+        order_no = order_number(doc_type, i)
+        button_id = f"{260115000 + i}"
+        rows.append(
+            f"<tr><td>{order_no}</td><td>2026-01-15</td><td>거래처{i % 37}</td><td>{(i * 7919) % 900000:,}</td>"
+            f'<td><button type="button" class="btn btn-sm {button_class}" {button_attr}="{button_id}">보기</button></td></tr>'
+        )
+    return f"""<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{DOC_TITLES[doc_type]} 목록</title></head>
+<body>
+<table class="table table-sm">
+<thead><tr><th>번호</th><th>일자</th><th>거래처</th><th>금액</th><th>출력</th></tr></thead>
+<tbody>
+{chr(10).join(rows)}
+</tbody>
+</table>
+</body>
+</html>
+"""
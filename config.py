@@ -12,27 +12,63 @@ class Config:
         # Server
         self.FLASK_PORT = int(os.getenv("FLASK_PORT", 5080))
         self.FLASK_DEBUG = os.getenv("FLASK_DEBUG", "false").lower() == "true"
+        # dev: Flask dev server with the engine in-process / production: waitress + separate engine process
+        self.SERVER_MODE = os.getenv("SERVER_MODE", "dev")
+        self.WEB_THREADS = int(os.getenv("WEB_THREADS", 16))
+        self.ENGINE_IPC_PORT = int(os.getenv("ENGINE_IPC_PORT", 5081))
+        self.ENGINE_RESTART_MAX_DELAY_SEC = int(os.getenv("ENGINE_RESTART_MAX_DELAY_SEC", 60))  # 엔진 프로세스 재시작 최대 간격
+        # Browser / parser / uploader stages in supervised worker processes (restarted when hung or crashed)
+        self.WORKER_PROCESSES = os.getenv("WORKER_PROCESSES", "false").lower() == "true"
+        self.WORKER_TASK_TIMEOUT_SEC = int(os.getenv("WORKER_TASK_TIMEOUT_SEC", 600))
+        self.WORKER_HEALTH_INTERVAL_SEC = int(os.getenv("WORKER_HEALTH_INTERVAL_SEC", 30))
+        # How long a call waits for a worker busy with another task (the task itself is bounded separately)
+        self.WORKER_LOCK_TIMEOUT_SEC = int(os.getenv("WORKER_LOCK_TIMEOUT_SEC", 660))
+        # Manual trigger jobs: executor size and number of finished jobs kept for GET /jobs/<id>
+        self.JOB_WORKERS = int(os.getenv("JOB_WORKERS", 4))
+        self.JOB_HISTORY_SIZE = int(os.getenv("JOB_HISTORY_SIZE", 100))
+        self.SSE_HEARTBEAT_SEC = int(os.getenv("SSE_HEARTBEAT_SEC", 15))  # 대시보드 이벤트 스트림 heartbeat 간격
+        # Each open event stream holds a web thread: cap them and end each stream after a while
+        # (the browser reconnects by itself), leaving threads for /api/* and /metrics
+        self.SSE_MAX_STREAMS = int(os.getenv("SSE_MAX_STREAMS", 6))
+        self.SSE_STREAM_MAX_SEC = int(os.getenv("SSE_STREAM_MAX_SEC", 300))
         
         # URLs
-        self.YOUNGRIM_URL = os.getenv("YOUNGRIM_URL", "http://door.yl.co.kr/oms/main.jsp")
+        # YOUNGRIM_BASE_URL 을 바꾸면 모든 OMS 페이지가 해당 서버로 향함 (예: benchmarks/fake_oms.py)
+        self.YOUNGRIM_BASE_URL = os.getenv("YOUNGRIM_BASE_URL", "http://door.yl.co.kr/oms").rstrip("/")
+        self.YOUNGRIM_URL = os.getenv("YOUNGRIM_URL", f"{self.YOUNGRIM_BASE_URL}/main.jsp")
         self.DOWNLOAD_INTERVAL_SEC = int(os.getenv("DOWNLOAD_INTERVAL_SEC", 1800))
 
+        # Adaptive polling (polling_scheduler.py) - 영업시간/유입률에 따라 다운로드 주기 조정
+        self.POLL_MIN_INTERVAL_SEC = int(os.getenv("POLL_MIN_INTERVAL_SEC", 300))
+        self.POLL_MAX_INTERVAL_SEC = int(os.getenv("POLL_MAX_INTERVAL_SEC", 7200))
+        self.BUSINESS_HOUR_START = int(os.getenv("BUSINESS_HOUR_START", 8))
+        self.BUSINESS_HOUR_END = int(os.getenv("BUSINESS_HOUR_END", 19))
+        self.BUSINESS_DAYS = [int(d) for d in os.getenv("BUSINESS_DAYS", "0,1,2,3,4").split(",") if d.strip()]  # 0=월요일
+
+        # 목록 페이지 지문이 같으면 파싱 생략 - 다른 PC 처리 실패분을 놓치지 않도록 일정 시간 후 강제 재파싱
+        self.LIST_FINGERPRINT_TTL_SEC = int(os.getenv("LIST_FINGERPRINT_TTL_SEC", 3600))
+
         # Multiple page URLs for ledger and estimate (산업/임업 구분)
         self.YOUNGRIM_LEDGER_URLS = [
-            "http://door.yl.co.kr/oms/ledger_list.jsp?search_action=&younglim_gubun=%EC%82%B0%EC%97%85",  # 산업
-            "http://door.yl.co.kr/oms/ledger_list.jsp?search_action=&younglim_gubun=%EC%9E%84%EC%97%85"   # 임업
+            f"{self.YOUNGRIM_BASE_URL}/ledger_list.jsp?search_action=&younglim_gubun=%EC%82%B0%EC%97%85",  # 산업
+            f"{self.YOUNGRIM_BASE_URL}/ledger_list.jsp?search_action=&younglim_gubun=%EC%9E%84%EC%97%85"   # 임업
         ]
         self.YOUNGRIM_ESTIMATE_URLS = [
-            "http://door.yl.co.kr/oms/estimate_list.jsp?search_action=&younglim_gubun=%EC%82%B0%EC%97%85",  # 산업
-            "http://door.yl.co.kr/oms/estimate_list.jsp?search_action=&younglim_gubun=%EC%9E%84%EC%97%85"   # 임업
+            f"{self.YOUNGRIM_BASE_URL}/estimate_list.jsp?search_action=&younglim_gubun=%EC%82%B0%EC%97%85",  # 산업
+            f"{self.YOUNGRIM_BASE_URL}/estimate_list.jsp?search_action=&younglim_gubun=%EC%9E%84%EC%97%85"   # 임업
         ]
 
+        # Detail (document) pages
+        self.YOUNGRIM_LEDGER_DOC_URL = f"{self.YOUNGRIM_BASE_URL}/trans_doc.jsp"
+        self.YOUNGRIM_ESTIMATE_DOC_URL = f"{self.YOUNGRIM_BASE_URL}/estimate_doc.jsp"
+
         # Legacy single URL (deprecated, kept for backward compatibility)
         self.YOUNGRIM_LEDGER_URL = self.YOUNGRIM_LEDGER_URLS[0]
         self.YOUNGRIM_ESTIMATE_URL = self.YOUNGRIM_ESTIMATE_URLS[0]
         
         # Ecount (ERP) Settings
         self.ECOUNT_LOGIN_URL = os.getenv("ECOUNT_LOGIN_URL", "https://login.ecount.com/Login")
+        self.ECOUNT_ERP_URL = os.getenv("ECOUNT_ERP_URL", "https://loginab.ecount.com/ec5/view/erp")  # 벤치마크 시 로컬 대역 페이지로 교체
         self.ECOUNT_COMPANY_CODE = os.getenv("ECOUNT_COMPANY_CODE", "")
         self.ECOUNT_ID = os.getenv("ECOUNT_ID", "")
         self.ECOUNT_PASSWORD = os.getenv("ECOUNT_PASSWORD", "")
@@ -44,15 +80,18 @@ class Config:
         # Paths
         self.DATA_DIR = self.base_dir / os.getenv("DATA_DIR", "data") # Keep this line if DATA_DIR is still needed as a separate concept
         self.DOWNLOADS_DIR = self.base_dir / "data" / "downloads"
+        self.ARCHIVE_DIR = self.base_dir / os.getenv("ARCHIVE_DIR", "data/archive")  # 처리 완료 문서 압축 보관소
         self.LOGS_DIR = self.base_dir / "logs"
         self.UPLOADER_LOGS_DIR = self.LOGS_DIR / "uploader"
-        self.HISTORY_FILE = self.base_dir / os.getenv("HISTORY_FILE", "v10_history.json")  # V10: Updated history file
+        self.HISTORY_FILE = self.base_dir / os.getenv("HISTORY_FILE", "v10_history.json")  # V10: Updated history file (업로드 완료)
+        self.DOWNLOAD_HISTORY_FILE = self.base_dir / os.getenv("DOWNLOAD_HISTORY_FILE", "v10_download_history.json")  # 다운로드 완료
+        self.WORK_QUEUE_DB = self.base_dir / os.getenv("WORK_QUEUE_DB", "data/work_queue.db")  # 다운로드/업로드 재시도 큐
         self.GOOGLE_TOKEN_PATH = self.base_dir / "google_token.pickle"
         self.GOOGLE_CREDENTIALS_PATH = self.base_dir / "google_oauth_credentials.json"
         self.ECOUNT_SESSION_PATH = self.base_dir / "ecount_session.json"
         
         # Ensure directories exist
-        for d in [self.DOWNLOADS_DIR, self.LOGS_DIR, self.UPLOADER_LOGS_DIR]:
+        for d in [self.DOWNLOADS_DIR, self.ARCHIVE_DIR, self.LOGS_DIR, self.UPLOADER_LOGS_DIR]:
             d.mkdir(parents=True, exist_ok=True)
         (self.DOWNLOADS_DIR / "ledger").mkdir(parents=True, exist_ok=True)
         (self.DOWNLOADS_DIR / "estimate").mkdir(parents=True, exist_ok=True)
@@ -67,11 +106,32 @@ class Config:
         self.MAX_RETRIES = int(os.getenv("MAX_RETRIES", 3))
         self.RETRY_DELAY_SEC = int(os.getenv("RETRY_DELAY_SEC", 2))
 
+        # Critical error log (logs/critical_errors.jsonl): size-based rotation
+        self.ERROR_LOG_MAX_BYTES = int(os.getenv("ERROR_LOG_MAX_BYTES", 5 * 1024 * 1024))
+        self.ERROR_LOG_BACKUPS = int(os.getenv("ERROR_LOG_BACKUPS", 3))
+        # Error storms: same error repeated within the window is counted, not re-logged
+        self.ERROR_STORM_WINDOW_SEC = int(os.getenv("ERROR_STORM_WINDOW_SEC", 60))
+        self.ERROR_AGGREGATE_LIMIT = int(os.getenv("ERROR_AGGREGATE_LIMIT", 200))
+
         # V10: Distributed Lock Settings
         self.LOCK_TIMEOUT_SEC = int(os.getenv("LOCK_TIMEOUT_SEC", 1800))  # 30 minutes default
         self.LOCK_SHEET_NAME = os.getenv("LOCK_SHEET_NAME", "processing_lock")
         self.ENABLE_DISTRIBUTED_LOCK = os.getenv("ENABLE_DISTRIBUTED_LOCK", "true").lower() == "true"
 
+        # Google Sheets client: lock requests arriving within the window are sent as one batch call
+        self.SHEETS_BATCH_WINDOW_MS = int(os.getenv("SHEETS_BATCH_WINDOW_MS", 50))
+        # The Sheets read/write quota is shared by every store PC using the same Google account/project:
+        # each machine's limiter gets SHEETS_QUOTA_PER_MIN / SHEETS_MACHINES unless set explicitly
+        self.SHEETS_QUOTA_PER_MIN = int(os.getenv("SHEETS_QUOTA_PER_MIN", 60))  # whole fleet
+        self.SHEETS_MACHINES = max(1, int(os.getenv("SHEETS_MACHINES", 4)))    # store PCs sharing the quota
+        self.SHEETS_REQUESTS_PER_MIN = int(os.getenv(
+            "SHEETS_REQUESTS_PER_MIN", max(1, self.SHEETS_QUOTA_PER_MIN // self.SHEETS_MACHINES)))  # per machine
+        self.SHEETS_BURST = int(os.getenv("SHEETS_BURST", 2))
+
+        # Lock sheet archival: completed/failed rows older than N days move to monthly archive sheets
+        self.LOCK_ARCHIVE_AFTER_DAYS = int(os.getenv("LOCK_ARCHIVE_AFTER_DAYS", 3))
+        self.LOCK_ARCHIVE_INTERVAL_SEC = int(os.getenv("LOCK_ARCHIVE_INTERVAL_SEC", 21600))  # 6 hours
+
     def __repr__(self):
         return f"<Config V10 Ports={self.FLASK_PORT} Interval={self.DOWNLOAD_INTERVAL_SEC} DistLock={self.ENABLE_DISTRIBUTED_LOCK}>"
 
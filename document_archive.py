@@ -0,0 +1,180 @@
+"""
+문서 아카이브 (Document Archive)
+================================
+처리 완료된 다운로드 문서를 압축 보관하는 content-addressed 저장소
+
+주요 기능:
+- 문서 내용의 SHA-256 해시를 파일명으로 하는 gzip blob 저장 (동일 내용은 1회만 저장)
+- `{order_no}_{button_id}` 키 → blob 매핑 인덱스 (append-only JSONL)
+- 처리 완료 문서를 pending 디렉토리에서 아카이브로 이동하여 디렉토리 스캔 비용을 O(pending)으로 유지
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import datetime
+import threading
+from pathlib import Path
+from typing import Optional, Dict, List
+
+# Import centralized config
+from config import config
+from logging_config import logger
+
+DOCUMENT_SUFFIXES = (".html", ".mhtml")
+
+
+class DocumentArchive:
+    """Content-addressed gzip archive for downloaded documents."""
+
+    INDEX_FILE_NAME = "index.jsonl"
+    BLOB_SUFFIX = ".gz"
+
+    def __init__(self, archive_dir: Optional[Path] = None):
+        self.archive_dir = Path(archive_dir or config.ARCHIVE_DIR)
+        self.blobs_dir = self.archive_dir / "blobs"
+        self.index_path = self.archive_dir / self.INDEX_FILE_NAME
+        self._lock = threading.Lock()
+        self._index = None  # {doc_type: {key: entry}} - loaded lazily
+
+    def _load_index(self) -> Dict[str, Dict[str, dict]]:
+        if self._index is not None:
+            return self._index
+
+        index = {}
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # 중단된 쓰기로 인한 불완전한 줄은 무시
+                    index.setdefault(entry["doc_type"], {})[entry["key"]] = entry
+        self._index = index
+        return index
+
+    def blob_path(self, digest: str) -> Path:
+        """해시값에 해당하는 blob 경로 (앞 2자리로 디렉토리 분산)"""
+        return self.blobs_dir / digest[:2] / f"{digest}{self.BLOB_SUFFIX}"
+
+    def put(self, doc_type: str, key: str, content: bytes, suffix: str = ".html",
+            downloaded_at: Optional[str] = None) -> str:
+        """문서 내용을 아카이브에 저장하고 해시값 반환"""
+        digest = hashlib.sha256(content).hexdigest()
+        blob = self.blob_path(digest)
+
+        with self._lock:
+            index = self._load_index()
+
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = blob.with_suffix(".tmp")
+                with open(tmp_path, 'wb') as f:
+                    f.write(gzip.compress(content, compresslevel=9, mtime=0))
+                os.replace(tmp_path, blob)
+
+            entry = {
+                "doc_type": doc_type,
+                "key": key,
+                "sha256": digest,
+                "suffix": suffix,
+                "size": len(content),
+                "stored_size": blob.stat().st_size,
+                "downloaded_at": downloaded_at,
+                "archived_at": datetime.datetime.now().isoformat()
+            }
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            index.setdefault(doc_type, {})[key] = entry
+
+        return digest
+
+    def archive_file(self, doc_type: str, file_path: Path) -> str:
+        """pending 파일을 아카이브로 이동 (저장 후 원본 삭제)"""
+        file_path = Path(file_path)
+        with open(file_path, 'rb') as f:
+            content = f.read()
+
+        downloaded_at = datetime.datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
+        digest = self.put(doc_type, file_path.stem, content, suffix=file_path.suffix,
+                          downloaded_at=downloaded_at)
+        file_path.unlink()
+
+        logger.info(f"[Archive] {doc_type}/{file_path.name} archived as {digest[:12]}")
+        return digest
+
+    def get_entry(self, doc_type: str, key: str) -> Optional[dict]:
+        """키에 해당하는 인덱스 항목 조회"""
+        with self._lock:
+            return self._load_index().get(doc_type, {}).get(key)
+
+    def contains(self, doc_type: str, key: str) -> bool:
+        return self.get_entry(doc_type, key) is not None
+
+    def get(self, doc_type: str, key: str) -> Optional[bytes]:
+        """아카이브된 문서 원문 반환 (없으면 None)"""
+        entry = self.get_entry(doc_type, key)
+        if not entry:
+            return None
+        with open(self.blob_path(entry["sha256"]), 'rb') as f:
+            return gzip.decompress(f.read())
+
+    def downloaded_timestamps(self) -> List[datetime.datetime]:
+        """아카이브된 문서들의 다운로드 시각 목록 (폴링 주기 학습용)"""
+        with self._lock:
+            index = self._load_index()
+            entries = [e for by_key in index.values() for e in by_key.values()]
+        timestamps = []
+        for entry in entries:
+            try:
+                timestamps.append(datetime.datetime.fromisoformat(entry["downloaded_at"]))
+            except (TypeError, ValueError):
+                continue
+        return timestamps
+
+    def stats(self) -> Dict[str, int]:
+        """아카이브 통계 (문서 수, 원본 크기, 저장 크기)"""
+        with self._lock:
+            index = self._load_index()
+            entries = [e for by_key in index.values() for e in by_key.values()]
+            blobs = {e["sha256"]: e["stored_size"] for e in entries}
+            return {
+                "documents": len(entries),
+                "blobs": len(blobs),
+                "original_bytes": sum(e["size"] for e in entries),
+                "stored_bytes": sum(blobs.values())
+            }
+
+
+# Global archive
+document_archive = DocumentArchive()
+
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description='V10 Document Archive Utility')
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+
+    subparsers.add_parser('stats', help='Show archive statistics')
+
+    parser_extract = subparsers.add_parser('extract', help='Print an archived document')
+    parser_extract.add_argument('doc_type', choices=['ledger', 'estimate'])
+    parser_extract.add_argument('key', help='Document key ({order_no}_{button_id})')
+
+    args = parser.parse_args()
+
+    if args.command == 'stats':
+        for name, value in document_archive.stats().items():
+            print(f"{name:<16}: {value}")
+    elif args.command == 'extract':
+        content = document_archive.get(args.doc_type, args.key)
+        if content is None:
+            print(f"[실패] 아카이브에서 {args.doc_type}/{args.key} 를 찾을 수 없습니다.")
+            sys.exit(1)
+        sys.stdout.write(content.decode('utf-8', errors='replace'))
+    else:
+        parser.print_help()
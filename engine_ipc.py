@@ -0,0 +1,181 @@
+"""
+엔진 IPC (Engine IPC)
+=====================
+웹 프로세스(대시보드/API)와 자동화 엔진 프로세스(다운로더/업로더) 사이의 로컬 RPC
+
+- multiprocessing.connection 기반 (localhost TCP + authkey, 외부 의존성 없음)
+- EngineServer: 엔진 프로세스에서 등록된 작업(name -> 함수)을 연결별 스레드로 실행
+- EngineClient: 웹 프로세스에서 호출, 스레드마다 연결을 빌려 쓰는 연결 풀
+- LocalEngine: 개발 모드(단일 프로세스)에서 같은 작업을 직접 호출하는 동일 인터페이스
+- EngineProcess: 엔진 프로세스가 종료되면 백오프 후 다시 시작 (EngineClient 는 자동 재연결)
+"""
+
+import time
+import queue
+import threading
+import multiprocessing
+from multiprocessing.connection import Listener, Client
+from typing import Callable, Dict
+
+from logging_config import logger
+
+
+class EngineUnavailable(Exception):
+    """엔진 프로세스에 연결할 수 없음 (시작 중이거나 종료됨)"""
+
+
+class EngineCallError(Exception):
+    """엔진에서 작업 실행 중 예외 발생"""
+
+
+class LocalEngine:
+    """Calls engine operations in-process (development mode)."""
+
+    def __init__(self, operations: Dict[str, Callable]):
+        self.operations = operations
+
+    def call(self, method: str, **kwargs):
+        return self.operations[method](**kwargs)
+
+
+class EngineServer:
+    """Serves engine operations to the web process over a local authenticated socket."""
+
+    def __init__(self, operations: Dict[str, Callable], address, authkey: bytes):
+        self.operations = operations
+        self.address = address
+        self.authkey = authkey
+
+    def serve_forever(self):
+        with Listener(self.address, authkey=self.authkey) as listener:
+            logger.info(f"[EngineIPC] Listening on {self.address[0]}:{self.address[1]}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    # 인증 실패 등은 해당 연결만 버림
+                    logger.warning(f"[EngineIPC] Rejected connection: {e}")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn,),
+                                 name="engine-ipc", daemon=True).start()
+
+    def _serve_connection(self, conn):
+        with conn:
+            while True:
+                try:
+                    method, kwargs = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    if method not in self.operations:
+                        raise KeyError(f"Unknown engine operation: {method}")
+                    reply = ("ok", self.operations[method](**kwargs))
+                except Exception as e:
+                    logger.error(f"[EngineIPC] {method} failed: {e}")
+                    reply = ("error", f"{type(e).__name__}: {e}")
+                try:
+                    conn.send(reply)
+                except (EOFError, OSError):
+                    return
+
+
+class EngineProcess:
+    """Runs the engine process and starts it again when it exits unexpectedly."""
+
+    def __init__(self, target: Callable, args: tuple = (), max_delay: float = 60.0, check_interval: float = 2.0):
+        self.target = target
+        self.args = args
+        self.max_delay = max_delay
+        self.check_interval = check_interval
+        self.process = None
+        self.restarts = 0
+        self._stopping = threading.Event()
+
+    @property
+    def pid(self):
+        return self.process.pid if self.process else None
+
+    def start(self):
+        self._spawn()
+        threading.Thread(target=self._monitor, name="engine-monitor", daemon=True).start()
+
+    def _spawn(self):
+        self.process = multiprocessing.Process(target=self.target, args=self.args, name="engine")
+        self.process.start()
+        self._started_at = time.monotonic()
+
+    def _monitor(self):
+        failures = 0
+        while not self._stopping.wait(self.check_interval):
+            if self.process.is_alive():
+                continue
+            # 오래 정상 동작했으면 백오프 초기화
+            if time.monotonic() - self._started_at > 300:
+                failures = 0
+            delay = min(self.max_delay, 2 ** failures)
+            failures += 1
+            logger.error(f"[EngineIPC] Engine process {self.process.pid} exited (code {self.process.exitcode}) "
+                         f"- restarting in {delay:.0f}s")
+            if self._stopping.wait(delay):
+                return
+            self.restarts += 1
+            self._spawn()
+            logger.info(f"[EngineIPC] Engine process restarted (PID {self.process.pid}, restart #{self.restarts})")
+
+    def stop(self, timeout: float = 10.0):
+        self._stopping.set()
+        if self.process and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+
+
+class EngineClient:
+    """Thread-safe client with a pool of connections (one per concurrent caller)."""
+
+    def __init__(self, address, authkey: bytes, timeout: float = 120.0):
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+
+    def _connect(self):
+        try:
+            return Client(self.address, authkey=self.authkey)
+        except OSError as e:
+            raise EngineUnavailable(f"Automation engine is not reachable at {self.address[0]}:{self.address[1]}") from e
+
+    def call(self, method: str, **kwargs):
+        """
+        엔진 작업 호출
+
+        Raises:
+            EngineUnavailable: 연결 실패 또는 응답 전에 연결이 끊김
+            EngineCallError: 엔진에서 작업이 예외로 끝남
+        """
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        try:
+            try:
+                conn.send((method, kwargs))
+            except OSError:
+                # 풀의 연결이 엔진 재시작으로 끊긴 경우 - 보내지 못했으므로 새 연결로 한 번 재시도
+                conn.close()
+                conn = self._connect()
+                conn.send((method, kwargs))
+            if not conn.poll(self.timeout):
+                raise EngineUnavailable(f"Automation engine did not answer {method} within {self.timeout:.0f}s")
+            status, result = conn.recv()
+        except (EOFError, OSError) as e:
+            conn.close()
+            raise EngineUnavailable(f"Connection to the automation engine was lost during {method}") from e
+        except EngineUnavailable:
+            conn.close()
+            raise
+
+        self._idle.put(conn)
+        if status == "error":
+            raise EngineCallError(result)
+        return result
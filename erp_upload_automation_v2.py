@@ -12,6 +12,7 @@ import pyperclip
 from pathlib import Path
 # Import centralized config
 from config import config
+from instrumentation import span
 
 # ============================================================
 # 설정 (V8.1: 중앙 설정 관리 도입)
@@ -235,8 +236,8 @@ class ErpUploadAutomation:
             current_url = self.page.url
             
             # 이미 ERP 페이지에 있는지 확인
-            if "loginab.ecount.com/ec5" in current_url or "login" not in current_url.lower():
-                self.page.goto("https://loginab.ecount.com/ec5/view/erp", timeout=10000)
+            if config.ECOUNT_ERP_URL in current_url or "login" not in current_url.lower():
+                self.page.goto(config.ECOUNT_ERP_URL, timeout=10000)
                 time.sleep(2)
             
             # 로그인 페이지로 리다이렉트되었는지 확인
@@ -273,7 +274,7 @@ class ErpUploadAutomation:
             
             # 세션 유효성 검증
             # ERP 메인 대시보드나 메뉴로의 접근 성공 여부 확인
-            self.page.goto("https://loginab.ecount.com/ec5/view/erp", timeout=20000, wait_until="networkidle")
+            self.page.goto(config.ECOUNT_ERP_URL, timeout=20000, wait_until="networkidle")
             time.sleep(3)
             
             # URL에 login이 포함되어 있다면 세션 만료로 판단
@@ -351,7 +352,7 @@ class ErpUploadAutomation:
             target_type: 'ledger' for 구매입력, 'estimate' for 견적서입력
         """
         try:
-            base_url = "https://loginab.ecount.com/ec5/view/erp?w_flag=1"
+            base_url = f"{config.ECOUNT_ERP_URL}?w_flag=1"
             if target_type == 'estimate':
                 self.log(f" 견적서입력 페이지로 이동 시도...")
                 target_hash = "menuType=MENUTREE_000004&menuSeq=MENUTREE_000486&groupSeq=MENUTREE_000030&prgId=E040201&depth=4"
@@ -360,7 +361,7 @@ class ErpUploadAutomation:
                 target_hash = "menuType=MENUTREE_000004&menuSeq=MENUTREE_000510&groupSeq=MENUTREE_000031&prgId=E040303&depth=4"
             
             # 1. 우선 메인 ERP 페이지로 이동 (세션 확인 루틴)
-            if not self.page.url.startswith("https://loginab.ecount.com/ec5/view/erp"):
+            if not self.page.url.startswith(config.ECOUNT_ERP_URL):
                 self.log(f"   메인 ERP 페이지 접속: {base_url}")
                 self.page.goto(base_url, timeout=30000, wait_until="networkidle")
                 time.sleep(2)
@@ -668,33 +669,43 @@ class ErpUploadAutomation:
                 return
             
             # 3. 브라우저 시작
-            self.start_browser(headless=False)
+            with span("erp_start_browser", target_type=target_type):
+                self.start_browser(headless=False)
             
             # 4. 세션 로드 또는 로그인
             self.log("\n[단계 1] 로그인")
-            if not self.load_session():
-                if not self.login():
-                    self.log("[ERROR] 로그인 실패 - 종료")
-                    return
+            with span("erp_load_session", target_type=target_type) as timing:
+                if not self.load_session():
+                    timing["outcome"] = "login"
+                    if not self.login():
+                        timing["outcome"] = "failed"
+                        self.log("[ERROR] 로그인 실패 - 종료")
+                        return
             
             # 5. 대상 페이지로 이동
             page_name = "견적서입력" if target_type == 'estimate' else "구매입력"
             self.log(f"\n[단계 2] 대상 페이지 이동 ({page_name})")
-            if not self.navigate_to_target_page(target_type=target_type):
-                self.log("[ERROR] 페이지 이동 실패 - 종료")
-                return
+            with span("erp_navigate", target_type=target_type) as timing:
+                if not self.navigate_to_target_page(target_type=target_type):
+                    timing["outcome"] = "failed"
+                    self.log("[ERROR] 페이지 이동 실패 - 종료")
+                    return
             
             # 6. 웹자료올리기 팝업 열기
             self.log("\n[단계 3] 웹자료올리기 팝업 열기")
-            if not self.open_web_uploader():
-                self.log("[ERROR] 팝업 열기 실패 - 종료")
-                return
+            with span("erp_open_web_uploader", target_type=target_type) as timing:
+                if not self.open_web_uploader():
+                    timing["outcome"] = "failed"
+                    self.log("[ERROR] 팝업 열기 실패 - 종료")
+                    return
             
             # 7. 붙여넣기
             self.log("\n[단계 4] 데이터 붙여넣기")
-            if not self.paste_data_in_popup():
-                self.log("[ERROR] 붙여넣기 실패 - 종료")
-                return
+            with span("erp_paste", target_type=target_type, rows=len(self.erp_data)) as timing:
+                if not self.paste_data_in_popup():
+                    timing["outcome"] = "failed"
+                    self.log("[ERROR] 붙여넣기 실패 - 종료")
+                    return
             
             # 8. 완료
             self.log("\n" + "=" * 60)
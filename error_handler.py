@@ -1,6 +1,12 @@
+import os
+import re
+import time
+import atexit
 import logging
 import json
+import threading
 import traceback
+from collections import OrderedDict
 from datetime import datetime
 from enum import Enum
 from config import config
@@ -11,16 +17,85 @@ class ErrorSeverity(Enum):
     HIGH = "ERROR"
     CRITICAL = "CRITICAL"
 
+# Variable parts of an error message (quoted values, hex/uuid ids, numbers) -> placeholders
+_TEMPLATE_PATTERNS = [
+    (re.compile(r"'[^']*'|\"[^\"]*\""), "'<*>'"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b|\b(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{8,}\b"), "<hex>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+]
+
+
+def message_template(message: str) -> str:
+    """에러 메시지에서 주문번호/행 번호 등 가변 값을 제거한 템플릿"""
+    for pattern, placeholder in _TEMPLATE_PATTERNS:
+        message = pattern.sub(placeholder, message)
+    return message[:300]
+
+
+class _ErrorAggregate:
+    """Repeats of one error fingerprint within the storm window."""
+
+    def __init__(self, error_type, template, context_keys, severity, now):
+        self.type = error_type
+        self.template = template
+        self.context_keys = context_keys
+        self.severity = severity
+        self.count = 1
+        self.suppressed = 0           # repeats since the last written line
+        self.first_seen = now
+        self.last_seen = now
+        self.last_summary = now
+
+    def to_dict(self, window):
+        return {
+            "type": self.type,
+            "template": self.template,
+            "context_keys": list(self.context_keys),
+            "severity": self.severity.name,
+            "count": self.count,
+            "first_seen": datetime.fromtimestamp(self.first_seen).isoformat(timespec="seconds"),
+            "last_seen": datetime.fromtimestamp(self.last_seen).isoformat(timespec="seconds"),
+            "active": time.time() - self.last_seen <= window
+        }
+
 class ErrorHandler:
     """Centralized error handling and structured reporting."""
     
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, on_change=None):
         self.logger = logger or logging.getLogger(__name__)
-        self.error_log_path = config.LOGS_DIR / "critical_errors.json"
+        # Append-only JSON Lines: one record per line, rotated by size
+        self.error_log_path = config.LOGS_DIR / "critical_errors.jsonl"
+        self.max_bytes = config.ERROR_LOG_MAX_BYTES
+        self.backup_count = config.ERROR_LOG_BACKUPS
+        self.on_change = on_change
+        self._write_lock = threading.Lock()
+        self._recent_cache = None  # ((size, mtime_ns), limit, records)
+        # Error storm suppression: fingerprint -> aggregate (most recently seen last)
+        self.storm_window = config.ERROR_STORM_WINDOW_SEC
+        self.max_aggregates = config.ERROR_AGGREGATE_LIMIT
+        self._aggregates: "OrderedDict[tuple, _ErrorAggregate]" = OrderedDict()
+        self._aggregate_lock = threading.Lock()
+        self._flusher_pid = None  # process running the summary flush thread (threads do not survive fork)
 
     def handle(self, error, context=None, severity=ErrorSeverity.MEDIUM):
-        """Log error with context and severity."""
+        """
+        Log error with context and severity.
+
+        Repeats of the same error (type + message template + context keys) within
+        ERROR_STORM_WINDOW_SEC are only counted; the first occurrence is written in full
+        and a summary line is written at most once per window while the storm lasts.
+        """
         error_type = type(error).__name__
+        first, summaries = self._aggregate(error_type, str(error), context, severity)
+        for summary in summaries:
+            self._write_summary(summary)
+        if not first:
+            # Suppressed repeats: make sure their summary is written even if no further error arrives
+            self._ensure_flusher()
+            if summaries:
+                self._notify()
+            return
+
         msg = f"[{error_type}] {str(error)}"
 
         # Determine logging level
@@ -30,6 +105,111 @@ class ErrorHandler:
         # For High/Critical, store in a separate structured error log
         if severity in [ErrorSeverity.HIGH, ErrorSeverity.CRITICAL]:
             self._save_to_error_log(error, context, severity)
+        # New error fingerprint (any severity) or a new critical record: push to dashboards
+        self._notify()
+
+    def _notify(self):
+        if self.on_change:
+            self.on_change()
+
+    def _aggregate(self, error_type, message, context, severity):
+        """
+        Count this occurrence.
+
+        Returns:
+            (first, summaries) - first: 새 폭주의 첫 발생이라 전체 기록 필요,
+            summaries: 지금 요약을 기록할 집계 (이 지문의 주기 요약 + 끝난 폭주의 마지막 요약)
+        """
+        now = time.time()
+        key = (error_type, message_template(message), tuple(sorted(context or {})))
+        summaries = []
+        with self._aggregate_lock:
+            agg = self._aggregates.get(key)
+            if agg and now - agg.last_seen <= self.storm_window:
+                agg.count += 1
+                agg.suppressed += 1
+                agg.last_seen = now
+                self._aggregates.move_to_end(key)
+                if now - agg.last_summary >= self.storm_window:
+                    summaries.append(self._take_summary(agg, now))
+                first = False
+            else:
+                if agg and agg.suppressed:
+                    summaries.append(self._take_summary(agg, now))
+                self._aggregates[key] = _ErrorAggregate(error_type, key[1], key[2], severity, now)
+                self._aggregates.move_to_end(key)
+                first = True
+
+            # 다른 지문의 밀린 요약 + 집계 개수 제한 (오래 안 보인 것부터 제거)
+            summaries.extend(self._due_summaries(now))
+            while len(self._aggregates) > self.max_aggregates:
+                self._aggregates.popitem(last=False)
+        return first, summaries
+
+    def _due_summaries(self, now, force=False):
+        """반복 횟수가 남은 집계 중 폭주가 끝났거나 요약 주기가 지난 것의 요약 (_aggregate_lock 안에서 호출)"""
+        return [self._take_summary(agg, now) for agg in list(self._aggregates.values())
+                if agg.suppressed and (force or now - agg.last_seen > self.storm_window
+                                       or now - agg.last_summary >= self.storm_window)]
+
+    def flush_summaries(self, force=False):
+        """
+        Write storm summaries whose window has elapsed without waiting for the next handle().
+
+        Called periodically by the flush thread and at interpreter exit (force=True writes every pending count).
+        """
+        with self._aggregate_lock:
+            summaries = self._due_summaries(time.time(), force=force)
+        for summary in summaries:
+            self._write_summary(summary)
+        if summaries:
+            self._notify()
+
+    def _ensure_flusher(self):
+        if self._flusher_pid == os.getpid():
+            return
+        self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_loop, name="error-storm-flush", daemon=True).start()
+
+    def _flush_loop(self):
+        interval = max(1.0, self.storm_window / 4)
+        while True:
+            time.sleep(interval)
+            try:
+                self.flush_summaries()
+            except Exception as e:
+                self.logger.warning(f"[ErrorStorm] Summary flush failed: {e}")
+
+    @staticmethod
+    def _take_summary(agg, now):
+        summary = dict(agg.to_dict(0), repeated=agg.suppressed)
+        agg.suppressed = 0
+        agg.last_summary = now
+        return summary, agg.severity
+
+    def _write_summary(self, item):
+        summary, severity = item
+        self.logger.log(getattr(logging, severity.value),
+                        f"[ErrorStorm] [{summary['type']}] {summary['template']} - repeated {summary['repeated']}x "
+                        f"(total {summary['count']} since {summary['first_seen']})")
+        if severity in [ErrorSeverity.HIGH, ErrorSeverity.CRITICAL]:
+            self._append_record({
+                "timestamp": datetime.now().isoformat(),
+                "severity": severity.name,
+                "type": summary["type"],
+                "message": summary["template"],
+                "repeated": summary["repeated"],
+                "count": summary["count"],
+                "first_seen": summary["first_seen"],
+                "last_seen": summary["last_seen"],
+                "context": {"keys": summary["context_keys"]}
+            })
+
+    def error_aggregates(self, limit=20):
+        """최근 에러 지문별 집계 (최근 발생 순) - /api/stats 용"""
+        with self._aggregate_lock:
+            aggregates = list(self._aggregates.values())[-limit:]
+            return [agg.to_dict(self.storm_window) for agg in reversed(aggregates)]
 
     def log_error(self, message, severity=ErrorSeverity.MEDIUM, context=None):
         """Alias for handle() for backward compatibility with lock_manager."""
@@ -49,24 +229,90 @@ class ErrorHandler:
             "traceback": traceback.format_exc(),
             "context": context or {}
         }
-        
+        self._append_record(record)
+
+    def _append_record(self, record):
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
         try:
-            records = []
-            if self.error_log_path.exists():
-                with open(self.error_log_path, 'r', encoding='utf-8') as f:
-                    try:
-                        records = json.load(f)
-                    except:
-                        pass
-            
-            records.append(record)
-            # Keep last 500 records
-            records = records[-500:]
-            
-            with open(self.error_log_path, 'w', encoding='utf-8') as f:
-                json.dump(records, f, ensure_ascii=False, indent=2)
+            with self._write_lock:
+                self._rotate_if_needed(len(line.encode('utf-8')))
+                with open(self.error_log_path, 'a', encoding='utf-8') as f:
+                    f.write(line)
         except Exception as e:
             self.logger.error(f"Failed to save error record: {e}")
 
+    def _rotate_if_needed(self, incoming: int):
+        """critical_errors.jsonl -> .1 -> .2 ... (backup_count 개 보관) when the next line would exceed max_bytes"""
+        try:
+            size = self.error_log_path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size + incoming <= self.max_bytes:
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            src = self.error_log_path.with_name(f"{self.error_log_path.name}.{i}")
+            if src.exists():
+                os.replace(src, self.error_log_path.with_name(f"{self.error_log_path.name}.{i + 1}"))
+        if self.backup_count > 0:
+            os.replace(self.error_log_path, self.error_log_path.with_name(f"{self.error_log_path.name}.1"))
+        else:
+            self.error_log_path.unlink()
+
+    def recent_errors(self, limit=20):
+        """
+        Last `limit` critical error records, newest first.
+
+        Only the tail of the file is read (plus the previous rotation if the current file is short);
+        the result is cached until the file changes.
+        """
+        try:
+            stat = self.error_log_path.stat()
+            key = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            key = None
+        cached = self._recent_cache
+        if cached and cached[0] == key and cached[1] == limit:
+            return cached[2]
+
+        lines = []
+        paths = [self.error_log_path, self.error_log_path.with_name(f"{self.error_log_path.name}.1")]
+        for path in paths:
+            if len(lines) >= limit:
+                break
+            lines = _tail_lines(path, limit - len(lines)) + lines
+
+        records = []
+        for line in reversed(lines):
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # partially written line
+        self._recent_cache = (key, limit, records)
+        return records
+
+
+def _tail_lines(path, count, block_size=8192):
+    """Last `count` non-empty lines of a file, reading backwards in blocks"""
+    if count <= 0:
+        return []
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return []
+    with f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= count:
+            read = min(block_size, position)
+            position -= read
+            f.seek(position)
+            data = f.read(read) + data
+    lines = [l for l in data.decode('utf-8', errors='replace').splitlines() if l.strip()]
+    return lines[-count:]
+
 # Global handler
 error_handler = ErrorHandler()
+# Pending repeat counts are written on shutdown
+atexit.register(error_handler.flush_summaries, force=True)
@@ -0,0 +1,78 @@
+"""
+구간 시간 측정 (Span Instrumentation)
+=====================================
+다운로드/업로드 사이클의 단계별 소요 시간을 구조화된 JSON 로그로 기록
+
+사용 예:
+    with span("detail_fetch", order_id=order_no, doc_type="ledger"):
+        ...
+
+- 각 span 은 `timing` 로거로 1건의 레코드를 남기며, JsonFormatter 가
+  `span` 필드(name, duration_ms, outcome, 추가 필드)와 `order_id` 를 출력
+- 중첩된 span 은 바깥 span 의 order_id 를 자동으로 이어받음
+- add_span_listener() 로 등록한 콜백에 측정값 전달 (메트릭 집계용)
+- 워커 프로세스에서 측정한 span 은 record_span() 으로 엔진 프로세스에 다시 기록
+"""
+
+import time
+import logging
+import contextvars
+from contextlib import contextmanager
+from typing import Callable, List
+
+timing_logger = logging.getLogger("timing")
+
+# 현재 처리 중인 주문 ID (중첩 span 상관관계용)
+current_order_id = contextvars.ContextVar("current_order_id", default=None)
+
+_listeners: List[Callable[[str, float, str, dict], None]] = []
+
+
+def add_span_listener(listener: Callable[[str, float, str, dict], None]):
+    """span 종료 시 (name, duration_sec, outcome, fields) 로 호출될 콜백 등록"""
+    _listeners.append(listener)
+
+
+@contextmanager
+def span(name: str, **fields):
+    """
+    코드 구간의 소요 시간 측정
+
+    Yields:
+        fields dict - 구간 내부에서 outcome 이나 추가 필드(rows 등)를 기록할 수 있음
+        (예외 발생 시 outcome 은 "error")
+    """
+    order_id = fields.pop("order_id", None) or current_order_id.get()
+    token = current_order_id.set(order_id)
+    fields.setdefault("outcome", "ok")
+    start = time.perf_counter()
+    try:
+        yield fields
+    except BaseException:
+        fields["outcome"] = "error"
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        current_order_id.reset(token)
+        outcome = fields.pop("outcome")
+        _emit(name, duration, outcome, fields, order_id)
+
+
+def record_span(name: str, duration: float, outcome: str, fields: dict, order_id: str = None):
+    """이미 측정된 span 기록 (워커 프로세스가 보낸 측정값) - 로그와 리스너는 span() 과 동일"""
+    _emit(name, duration, outcome, dict(fields), order_id or current_order_id.get())
+
+
+def _emit(name: str, duration: float, outcome: str, fields: dict, order_id):
+    timing_logger.info(
+        f"[Timing] {name} {duration * 1000:.1f}ms ({outcome})",
+        extra={
+            "span": {"name": name, "duration_ms": round(duration * 1000, 1), "outcome": outcome, **fields},
+            "order_id": order_id
+        }
+    )
+    for listener in _listeners:
+        try:
+            listener(name, duration, outcome, fields)
+        except Exception:
+            timing_logger.exception(f"Span listener failed for {name}")
@@ -0,0 +1,181 @@
+"""
+작업 레지스트리 (Job Registry)
+==============================
+수동 트리거(업로드/다운로드)를 작업 ID 로 추적하는 제한된 실행기
+
+- submit() 은 작업 ID 를 즉시 반환하고 ThreadPoolExecutor(JOB_WORKERS)에서 실행
+- 동시 실행 제한은 작업 키 단위 (예: "upload:ledger" 는 한 번에 1개, 실행 중이면 기존 작업 반환)
+- 상태: queued → running → succeeded / failed, 시작/종료 시각, 소요 시간, 오류
+- 주문별 진행 상황: 작업 함수 안쪽 어디서든 report_progress(order_id, state) 호출
+  (현재 작업은 contextvar 로 전달되므로 인자로 넘길 필요 없음)
+- 끝난 작업은 최근 JOB_HISTORY_SIZE 개만 보관 (LRU)
+- 제출한 쪽이 끝날 때까지 기다려야 하면 job.wait() (예: 스케줄 다운로드 주기)
+"""
+
+import uuid
+import time
+import datetime
+import threading
+import contextvars
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from config import config
+from logging_config import logger
+
+# 현재 스레드에서 실행 중인 작업 (report_progress 용)
+current_job = contextvars.ContextVar("current_job", default=None)
+
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+
+class Job:
+    """State of one submitted job (thread-safe updates)."""
+
+    def __init__(self, kind: str, key: str, params: dict):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.key = key
+        self.params = params
+        self.state = "queued"
+        self.created_at = _now()
+        self.started_at = None
+        self.finished_at = None
+        self.duration_sec = None
+        self.result = None
+        self.error = None
+        self.total = None
+        self.orders: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._start = None
+        self._finished = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.state in ("succeeded", "failed")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """작업이 끝날 때까지 대기 - 시간 내에 끝나면 True"""
+        return self._finished.wait(timeout)
+
+    def set_total(self, total: int):
+        self.total = total
+
+    def report(self, order_id: str, state: str, error: Optional[str] = None):
+        with self._lock:
+            entry = {"state": state, "at": _now()}
+            if error:
+                entry["error"] = error
+            self.orders[order_id] = entry
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            orders = dict(self.orders)
+        counts = {}
+        for entry in orders.values():
+            counts[entry["state"]] = counts.get(entry["state"], 0) + 1
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "state": self.state,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_sec": self.duration_sec,
+            "result": self.result,
+            "error": self.error,
+            "progress": {"total": self.total, "counts": counts, "orders": orders}
+        }
+
+
+def report_progress(order_id: str, state: str, error: Optional[str] = None):
+    """현재 작업에 주문별 진행 상황 기록 (작업 밖에서 호출되면 무시)"""
+    job = current_job.get()
+    if job:
+        job.report(order_id, state, error)
+
+
+def set_progress_total(total: int):
+    """현재 작업의 전체 주문 수 기록 (작업 밖에서 호출되면 무시)"""
+    job = current_job.get()
+    if job:
+        job.set_total(total)
+
+
+class JobRegistry:
+    """Bounded executor for manual jobs with one active job per key and an LRU of finished jobs."""
+
+    def __init__(self, max_workers: int = None, history_size: int = None):
+        self.history_size = history_size or config.JOB_HISTORY_SIZE
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or config.JOB_WORKERS,
+                                            thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._active: Dict[str, Job] = {}            # key -> queued/running job
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()  # id -> job (finished jobs evicted LRU)
+
+    def submit(self, kind: str, fn: Callable, key: str = None, **params) -> Tuple[Job, bool]:
+        """
+        작업 제출
+
+        Returns:
+            (job, created) - 같은 키의 작업이 이미 대기/실행 중이면 (기존 작업, False)
+        """
+        key = key or kind
+        with self._lock:
+            active = self._active.get(key)
+            if active:
+                return active, False
+            job = Job(kind, key, params)
+            self._active[key] = job
+            self._jobs[job.id] = job
+            self._evict()
+        self._executor.submit(self._run, job, fn, params)
+        logger.info(f"[Jobs] {kind} job {job.id} queued")
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                self._jobs.move_to_end(job_id)
+            return job
+
+    def active(self) -> Dict[str, str]:
+        """작업 키 -> 대기/실행 중인 작업 ID"""
+        with self._lock:
+            return {key: job.id for key, job in self._active.items()}
+
+    def _run(self, job: Job, fn: Callable, params: dict):
+        token = current_job.set(job)
+        job.state = "running"
+        job.started_at = _now()
+        job._start = time.perf_counter()
+        try:
+            job.result = fn(**params)
+            job.state = "succeeded"
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.state = "failed"
+            logger.error(f"[Jobs] {job.kind} job {job.id} failed: {e}")
+        finally:
+            current_job.reset(token)
+            job.finished_at = _now()
+            job.duration_sec = round(time.perf_counter() - job._start, 3)
+            with self._lock:
+                if self._active.get(job.key) is job:
+                    del self._active[job.key]
+                self._evict()
+            job._finished.set()
+            logger.info(f"[Jobs] {job.kind} job {job.id} {job.state} in {job.duration_sec}s")
+
+    def _evict(self):
+        """보관 한도를 넘으면 오래 조회되지 않은 끝난 작업부터 제거 (대기/실행 중인 작업은 유지)"""
+        excess = len(self._jobs) - self.history_size
+        if excess <= 0:
+            return
+        for job_id in [i for i, j in self._jobs.items() if j.done][:excess]:
+            del self._jobs[job_id]
@@ -6,22 +6,232 @@ Google Sheets 기반 분산 락 시스템
 
 V10 주요 기능:
 - Google Sheets를 중앙 락 저장소로 사용
-- 원자적(atomic) 락 획득/해제
+- 원자적(atomic) 락 획득/해제 (새 행 추가 후 A열 재확인 - 같은 주문의 첫 행만 유효)
 - 타임아웃 기반 데드락 방지 (기본 30분)
 - PC 식별 (hostname + IP)
+- 오래된 완료/실패 레코드는 월별 아카이브 시트로 이동 (락 시트 크기 유지)
 """
 
 import time
+import queue
 import socket
+import threading
 import platform
 import datetime
 from typing import Optional, Dict, List
 from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # Import centralized config
 from config import config
 from logging_config import logger
 from error_handler import error_handler, ErrorSeverity
+from instrumentation import span
+from metrics import SHEETS_API_CALLS, SHEETS_QUOTA_ERRORS
+from rate_limiter import sheets_limiter, call_with_quota, is_quota_error
+
+
+def _sheets_call(method: str, fn, *args, limiter=sheets_limiter, **kwargs):
+    """
+    Sheets API 호출 1회 - 공유 토큰 버킷(sheets_limiter)으로 속도 제한, 429 는 Retry-After 후 재시도
+    시도마다 API 호출 수와 할당량(429) 오류를 메트릭으로 집계
+    """
+    def counted(*call_args, **call_kwargs):
+        SHEETS_API_CALLS.inc(method=method)
+        try:
+            return fn(*call_args, **call_kwargs)
+        except Exception as e:
+            if is_quota_error(e):
+                SHEETS_QUOTA_ERRORS.inc(method=method)
+            raise
+
+    return call_with_quota(limiter, method, counted, *args, **kwargs)
+
+
+class _InstrumentedSheets:
+    """
+    gspread Worksheet / Spreadsheet 래퍼 - 모든 메서드 호출을 _sheets_call 로 실행
+    (속성 조회(id, title 등)는 API 호출이 아니므로 그대로 전달)
+    """
+
+    def __init__(self, target, limiter=sheets_limiter, prefix: str = ""):
+        self._target = target
+        self._limiter = limiter
+        self._prefix = prefix  # 메트릭 method 라벨 접두사 (예: "spreadsheet.")
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            return _sheets_call(self._prefix + name, attr, *args, limiter=self._limiter, **kwargs)
+
+        return call
+
+
+class _RowMoved(Exception):
+    """조회한 행 번호의 A열이 더 이상 해당 order_id 가 아님 (다른 PC 의 아카이브로 행이 밀림)"""
+
+
+def _column_letter(col: int) -> str:
+    """1 -> A, 27 -> AA"""
+    letters = ""
+    while col:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _same_row(current: List[str], original: List[str]) -> bool:
+    """두 번의 조회 사이에 행 내용이 그대로인지 (끝의 빈 칸은 무시)"""
+    def trim(row):
+        row = list(row)
+        while row and row[-1] == "":
+            row.pop()
+        return row
+    return trim(current) == trim(original)
+
+
+class _SheetsBatchClient:
+    """
+    락 시트 전용 Sheets 클라이언트 (전용 스레드)
+
+    여러 스레드가 짧은 시간 창(SHEETS_BATCH_WINDOW_MS) 안에 보낸 요청을 합쳐서 실행
+    - find / read / owners → values:batchGet 1회 (A:C열 + 요청된 행 범위)
+    - update       → values:batchUpdate 1회 (order_id 를 지정하면 직전에 대상 행 A열을 확인하는
+                     values:batchGet 1회 추가 - 행이 밀렸으면 쓰지 않고 _RowMoved)
+    - append       → values:append 1회 (여러 행)
+    호출자는 Future 를 받으므로 락 기록과 다른 작업(상세 페이지 수집)을 겹쳐 실행할 수 있음
+    """
+
+    def __init__(self, worksheet, window_sec: Optional[float] = None):
+        self.worksheet = worksheet
+        self.window_sec = config.SHEETS_BATCH_WINDOW_MS / 1000 if window_sec is None else window_sec
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def find_row(self, order_id: str) -> Future:
+        """A열에서 order_id 가 처음 나오는 행 번호 (없으면 None)"""
+        return self._submit("find", str(order_id))
+
+    def find_owners(self, order_id: str) -> Future:
+        """order_id 가 있는 모든 행 [(행 번호, locked_by, locked_at)] (위쪽 행부터)"""
+        return self._submit("owners", str(order_id))
+
+    def read_row(self, row: int) -> Future:
+        """행 값 목록 (A~F)"""
+        return self._submit("read", row)
+
+    def update_cells(self, row: int, values: Dict[int, str], order_id: Optional[str] = None) -> Future:
+        """{열 번호: 값} 셀 갱신 (order_id 지정 시 A열이 그 값일 때만)"""
+        return self._submit("update", row, values, order_id)
+
+    def append_row(self, values: List[str]) -> Future:
+        return self._submit("append", values)
+
+    def _submit(self, kind: str, *args) -> Future:
+        future = Future()
+        self._queue.put((kind, args, future))
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sheets-batch", daemon=True)
+                self._thread.start()
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window_sec
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._execute([r for r in batch if r[2].set_running_or_notify_cancel()])
+
+    def _call(self, requests, fn):
+        try:
+            fn()
+        except Exception as e:
+            for _, _, future in requests:
+                future.set_exception(e)
+        else:
+            for _, _, future in requests:
+                future.set_result(None)
+
+    def _verify_rows(self, updates):
+        """
+        order_id 가 지정된 갱신은 쓰기 직전에 대상 행의 A열을 한 번에 읽어 확인
+        (조회 이후 다른 PC 가 행을 삭제해 번호가 밀렸다면 다른 주문의 행을 덮어쓰지 않도록)
+
+        Returns:
+            실제로 쓸 갱신 목록 (A열이 다른 갱신은 _RowMoved 로 실패 처리)
+        """
+        guarded = [r for r in updates if r[1][2] is not None]
+        if not guarded:
+            return updates
+        try:
+            cells = self.worksheet.batch_get([f"A{row}" for _, (row, _, _), _ in guarded])
+        except Exception as e:
+            for _, _, future in guarded:
+                future.set_exception(e)
+            return [r for r in updates if r[1][2] is None]
+
+        verified = [r for r in updates if r[1][2] is None]
+        for request, value_range in zip(guarded, cells):
+            _, (row, _, order_id), future = request
+            current = value_range[0][0] if value_range and value_range[0] else ""
+            if current == order_id:
+                verified.append(request)
+            else:
+                future.set_exception(_RowMoved(f"Lock row {row} now holds {current!r} instead of {order_id!r}"))
+        return verified
+
+    def _execute(self, batch):
+        # 쓰기를 먼저 실행해 같은 창의 읽기가 최신 값을 보도록 함
+        updates = self._verify_rows([r for r in batch if r[0] == "update"])
+        if updates:
+            data = [{"range": f"{_column_letter(col)}{row}", "values": [[value]]}
+                    for _, (row, values, _), _ in updates for col, value in values.items()]
+            self._call(updates, lambda: self.worksheet.batch_update(data, value_input_option="RAW"))
+
+        appends = [r for r in batch if r[0] == "append"]
+        if appends:
+            rows = [args[0] for _, args, _ in appends]
+            self._call(appends, lambda: self.worksheet.append_rows(rows, value_input_option="RAW"))
+
+        reads = [r for r in batch if r[0] in ("find", "owners", "read")]
+        if not reads:
+            return
+
+        has_find = any(kind != "read" for kind, _, _ in reads)
+        row_numbers = sorted({args[0] for kind, args, _ in reads if kind == "read"})
+        ranges = (["A:C"] if has_find else []) + [f"A{row}:F{row}" for row in row_numbers]
+        try:
+            results = self.worksheet.batch_get(ranges)
+        except Exception as e:
+            for _, _, future in reads:
+                future.set_exception(e)
+            return
+
+        columns_ac = results[0] if has_find else []
+        by_row = dict(zip(row_numbers, results[1:] if has_find else results))
+        for kind, args, future in reads:
+            if kind == "find":
+                row = next((i for i, cells in enumerate(columns_ac, start=1) if cells and cells[0] == args[0]), None)
+                future.set_result(row)
+            elif kind == "owners":
+                padded = [list(cells) + ["", ""] for cells in columns_ac]
+                future.set_result([(i, cells[1], cells[2])
+                                   for i, cells in enumerate(padded, start=1) if cells[0] == args[0]])
+            else:
+                value_range = by_row.get(args[0])
+                future.set_result(list(value_range[0]) if value_range else [])
 
 
 class DistributedLockManager:
@@ -33,16 +243,36 @@ class DistributedLockManager:
     # 락 타임아웃 (초) - 30분
     LOCK_TIMEOUT_SEC = 1800
 
+    # 행 번호가 밀렸을 때 다시 조회하는 최대 횟수
+    ROW_LOOKUP_ATTEMPTS = 3
+
+    # 락 시트 헤더
+    HEADER = ["order_id", "locked_by", "locked_at", "status", "machine_id", "notes"]
+
     # 상태 코드
     STATUS_PROCESSING = "processing"
     STATUS_COMPLETED = "completed"
     STATUS_FAILED = "failed"
+    STATUS_DUPLICATE = "duplicate"  # 동시 추가 경합에서 진 행 (A열은 "{order_id} (duplicate)")
+
+    # 아카이브/정리 대상 (처리가 끝난 레코드)
+    FINISHED_STATUSES = (STATUS_COMPLETED, STATUS_FAILED, STATUS_DUPLICATE)
+
+    # 아카이브 실행 PC 선출용 락 키 접두사 ({접두사}{구간 번호}) - 끝난 선출 행은 아카이브 없이 삭제
+    ARCHIVE_ELECTION_PREFIX = "__lock_archive_"
 
     def __init__(self):
         """초기화"""
         self.machine_id = self._get_machine_id()
         self.spreadsheet = None
         self.lock_worksheet = None
+        self._client = None
+        self._archive_worksheets = {}  # title -> worksheet
+        self._release_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="lock-release")
+        self._pending_releases = set()
+        self._pending_lock = threading.Lock()
+        self._clock_lock = threading.Lock()
+        self._last_locked_at = ""
         logger.info(f"DistributedLockManager initialized for machine: {self.machine_id}")
 
     def _get_machine_id(self) -> str:
@@ -115,29 +345,23 @@ class DistributedLockManager:
 
             import gspread
             gc = gspread.authorize(creds)
-            self.spreadsheet = gc.open_by_key(config.GS_SPREADSHEET_ID)
+            self.spreadsheet = _InstrumentedSheets(_sheets_call("open_by_key", gc.open_by_key, config.GS_SPREADSHEET_ID),
+                                                   prefix="spreadsheet.")
 
             # 락 시트 생성 또는 가져오기
             try:
-                self.lock_worksheet = self.spreadsheet.worksheet(self.LOCK_SHEET_NAME)
+                self.lock_worksheet = _InstrumentedSheets(self.spreadsheet.worksheet(self.LOCK_SHEET_NAME))
                 logger.info(f"Lock sheet '{self.LOCK_SHEET_NAME}' found")
             except gspread.exceptions.WorksheetNotFound:
                 logger.info(f"Creating new lock sheet: {self.LOCK_SHEET_NAME}")
-                self.lock_worksheet = self.spreadsheet.add_worksheet(
+                self.lock_worksheet = _InstrumentedSheets(self.spreadsheet.add_worksheet(
                     title=self.LOCK_SHEET_NAME,
                     rows=1000,
                     cols=6
-                )
+                ))
 
                 # 헤더 추가
-                self.lock_worksheet.append_row([
-                    "order_id",
-                    "locked_by",
-                    "locked_at",
-                    "status",
-                    "machine_id",
-                    "notes"
-                ])
+                self.lock_worksheet.append_row(self.HEADER)
                 logger.info("Lock sheet created with headers")
 
             logger.info("Successfully connected to Google Sheets lock system")
@@ -151,17 +375,31 @@ class DistributedLockManager:
             )
             return False
 
+    def _sheets(self) -> _SheetsBatchClient:
+        """현재 락 시트에 대한 배치 클라이언트 (lock_worksheet 가 바뀌면 새로 생성)"""
+        if self._client is None or self._client.worksheet is not self.lock_worksheet:
+            self._client = _SheetsBatchClient(self.lock_worksheet)
+        return self._client
+
     def _find_order_row(self, order_id: str) -> Optional[int]:
-        """특정 order_id의 행 번호 찾기 (없으면 None 반환)"""
-        try:
-            # 첫 번째 컬럼(order_id)에서 찾기
-            cell = self.lock_worksheet.find(order_id, in_column=1)
-            if cell:
-                return cell.row
-            return None
-        except Exception as e:
-            logger.warning(f"Error finding order row: {e}")
-            return None
+        """
+        특정 order_id의 행 번호 찾기 (없으면 None 반환)
+
+        조회 오류는 그대로 전달 - "행 없음"으로 취급하면 이미 있는 주문에 새 행을 추가하게 됨
+        (429 는 _sheets_call 에서 이미 재시도됨)
+        """
+        # 첫 번째 컬럼(order_id)에서 찾기
+        return self._sheets().find_row(order_id).result()
+
+    def _locked_at_now(self) -> str:
+        """locked_at 값 - 이 PC 안에서도 겹치지 않도록 보장 (경합 시 자기 행을 구분하는 데 사용)"""
+        with self._clock_lock:
+            now = datetime.datetime.now()
+            last = self._last_locked_at
+            if last and now.isoformat(timespec="microseconds") <= last:
+                now = datetime.datetime.fromisoformat(last) + datetime.timedelta(microseconds=1)
+            self._last_locked_at = now.isoformat(timespec="microseconds")
+            return self._last_locked_at
 
     def acquire_lock(self, order_id: str, notes: str = "") -> bool:
         """
@@ -171,87 +409,33 @@ class DistributedLockManager:
             True: 락 획득 성공 (이 PC가 처리 진행)
             False: 락 획득 실패 (다른 PC가 처리 중이거나 이미 완료됨)
         """
-        try:
-            if not self.lock_worksheet:
-                logger.error("Lock worksheet not initialized. Call connect() first.")
-                return False
-
-            logger.info(f"Attempting to acquire lock for order: {order_id}")
-
-            # 1. 기존 레코드 확인
-            existing_row = self._find_order_row(order_id)
-
-            if existing_row:
-                # 기존 레코드가 있음
-                row_data = self.lock_worksheet.row_values(existing_row)
-
-                if len(row_data) < 4:
-                    logger.warning(f"Invalid row data for {order_id}")
+        with span("lock_acquire", order_id=order_id) as timing:
+            try:
+                if not self.lock_worksheet:
+                    logger.error("Lock worksheet not initialized. Call connect() first.")
+                    timing["outcome"] = "error"
                     return False
 
-                existing_status = row_data[3] if len(row_data) > 3 else ""
-                existing_locked_at = row_data[2] if len(row_data) > 2 else ""
-                existing_machine = row_data[4] if len(row_data) > 4 else ""
+                logger.info(f"Attempting to acquire lock for order: {order_id}")
 
-                # 완료 상태면 처리하지 않음
-                if existing_status == self.STATUS_COMPLETED:
-                    logger.info(f"Order {order_id} already completed by {existing_machine}")
-                    return False
-
-                # 처리 중 상태 확인
-                if existing_status == self.STATUS_PROCESSING:
-                    # 타임아웃 체크
+                # 아카이브 등으로 행 번호가 바뀌면 다시 조회해서 재시도
+                for attempt in range(1, self.ROW_LOOKUP_ATTEMPTS + 1):
                     try:
-                        locked_time = datetime.datetime.fromisoformat(existing_locked_at)
-                        elapsed = (datetime.datetime.now() - locked_time).total_seconds()
-
-                        if elapsed < self.LOCK_TIMEOUT_SEC:
-                            # 아직 타임아웃 안됨 - 다른 PC가 처리 중
-                            logger.info(f"Order {order_id} is being processed by {existing_machine} (elapsed: {elapsed:.0f}s)")
-                            return False
-                        else:
-                            # 타임아웃 - 재처리 허용
-                            logger.warning(f"Order {order_id} timed out (elapsed: {elapsed:.0f}s), re-acquiring lock")
-                            # 아래에서 업데이트
-                    except Exception as e:
-                        logger.warning(f"Failed to parse locked_at time: {e}")
-                        # 시간 파싱 실패 - 재처리 허용
-
-                # 기존 행 업데이트 (재처리)
-                current_time = datetime.datetime.now().isoformat()
-                self.lock_worksheet.update_cell(existing_row, 2, self.machine_id)  # locked_by
-                self.lock_worksheet.update_cell(existing_row, 3, current_time)      # locked_at
-                self.lock_worksheet.update_cell(existing_row, 4, self.STATUS_PROCESSING)  # status
-                self.lock_worksheet.update_cell(existing_row, 5, self.machine_id)  # machine_id
-                if notes:
-                    self.lock_worksheet.update_cell(existing_row, 6, notes)  # notes
-
-                logger.info(f"Lock re-acquired for order {order_id}")
-                return True
-
-            else:
-                # 새 레코드 추가
-                current_time = datetime.datetime.now().isoformat()
-                new_row = [
-                    order_id,
-                    self.machine_id,
-                    current_time,
-                    self.STATUS_PROCESSING,
-                    self.machine_id,
-                    notes
-                ]
-
-                self.lock_worksheet.append_row(new_row)
-                logger.info(f"Lock acquired for new order {order_id}")
-                return True
+                        return self._acquire_once(order_id, notes, timing)
+                    except _RowMoved as e:
+                        logger.info(f"{e} - looking up order {order_id} again ({attempt}/{self.ROW_LOOKUP_ATTEMPTS})")
+                logger.warning(f"Lock row for {order_id} kept moving - giving up")
+                timing["outcome"] = "error"
+                return False
 
-        except Exception as e:
-            error_handler.log_error(
-                f"Failed to acquire lock for {order_id}",
-                ErrorSeverity.HIGH,
-                {"order_id": order_id, "error": str(e)}
-            )
-            return False
+            except Exception as e:
+                error_handler.log_error(
+                    f"Failed to acquire lock for {order_id}",
+                    ErrorSeverity.HIGH,
+                    {"order_id": order_id, "error": str(e)}
+                )
+                timing["outcome"] = "error"
+                return False
 
     def release_lock(self, order_id: str, status: str = STATUS_COMPLETED, notes: str = "") -> bool:
         """
@@ -262,62 +446,245 @@ class DistributedLockManager:
             status: 최종 상태 (completed/failed)
             notes: 추가 메모
         """
-        try:
-            if not self.lock_worksheet:
-                logger.error("Lock worksheet not initialized")
+        with span("lock_release", order_id=order_id, status=status) as timing:
+            try:
+                if not self.lock_worksheet:
+                    logger.error("Lock worksheet not initialized")
+                    timing["outcome"] = "error"
+                    return False
+
+                logger.info(f"Releasing lock for order {order_id} with status: {status}")
+
+                for attempt in range(1, self.ROW_LOOKUP_ATTEMPTS + 1):
+                    try:
+                        return self._release_once(order_id, status, notes, timing)
+                    except _RowMoved as e:
+                        logger.info(f"{e} - looking up order {order_id} again ({attempt}/{self.ROW_LOOKUP_ATTEMPTS})")
+                logger.warning(f"Lock row for {order_id} kept moving - release not written")
+                timing["outcome"] = "error"
+                return False
+
+            except Exception as e:
+                error_handler.log_error(
+                    f"Failed to release lock for {order_id}",
+                    ErrorSeverity.MEDIUM,
+                    {"order_id": order_id, "status": status, "error": str(e)}
+                )
+                timing["outcome"] = "error"
+                return False
+
+    def _acquire_once(self, order_id: str, notes: str, timing: dict) -> bool:
+        """acquire_lock 1회 시도 (조회한 행이 그 사이 밀렸으면 _RowMoved)"""
+        # 1. 기존 레코드 확인
+        existing_row = self._find_order_row(order_id)
+
+        if existing_row:
+            # 기존 레코드가 있음
+            row_data = self._sheets().read_row(existing_row).result()
+            if row_data and row_data[0] != order_id:
+                raise _RowMoved(f"Lock row {existing_row} now holds {row_data[0]!r}")
+
+            if len(row_data) < 4:
+                logger.warning(f"Invalid row data for {order_id}")
+                timing["outcome"] = "denied"
                 return False
 
-            logger.info(f"Releasing lock for order {order_id} with status: {status}")
+            existing_status = row_data[3] if len(row_data) > 3 else ""
+            existing_locked_at = row_data[2] if len(row_data) > 2 else ""
+            existing_machine = row_data[4] if len(row_data) > 4 else ""
 
-            row_num = self._find_order_row(order_id)
-            if not row_num:
-                logger.warning(f"Order {order_id} not found in lock sheet")
+            # 완료 상태면 처리하지 않음
+            if existing_status == self.STATUS_COMPLETED:
+                logger.info(f"Order {order_id} already completed by {existing_machine}")
+                timing["outcome"] = "completed"
                 return False
 
-            # 상태 업데이트
-            self.lock_worksheet.update_cell(row_num, 4, status)  # status
+            # 처리 중 상태 확인
+            if existing_status == self.STATUS_PROCESSING:
+                # 타임아웃 체크
+                try:
+                    locked_time = datetime.datetime.fromisoformat(existing_locked_at)
+                    elapsed = (datetime.datetime.now() - locked_time).total_seconds()
+
+                    if elapsed < self.LOCK_TIMEOUT_SEC:
+                        # 아직 타임아웃 안됨 - 다른 PC가 처리 중
+                        logger.info(f"Order {order_id} is being processed by {existing_machine} (elapsed: {elapsed:.0f}s)")
+                        timing["outcome"] = "busy"
+                        return False
+                    else:
+                        # 타임아웃 - 재처리 허용
+                        logger.warning(f"Order {order_id} timed out (elapsed: {elapsed:.0f}s), re-acquiring lock")
+                        # 아래에서 업데이트
+                except Exception as e:
+                    logger.warning(f"Failed to parse locked_at time: {e}")
+                    # 시간 파싱 실패 - 재처리 허용
+
+            # 기존 행 업데이트 (재처리)
+            current_time = datetime.datetime.now().isoformat()
+            updates = {
+                2: self.machine_id,          # locked_by
+                3: current_time,             # locked_at
+                4: self.STATUS_PROCESSING,   # status
+                5: self.machine_id           # machine_id
+            }
             if notes:
-                existing_notes = self.lock_worksheet.cell(row_num, 6).value or ""
-                updated_notes = f"{existing_notes} | {notes}" if existing_notes else notes
-                self.lock_worksheet.update_cell(row_num, 6, updated_notes)
+                updates[6] = notes           # notes
+            self._sheets().update_cells(existing_row, updates, order_id).result()
 
-            logger.info(f"Lock released for order {order_id}")
+            logger.info(f"Lock re-acquired for order {order_id}")
+            timing["outcome"] = "reacquired"
             return True
 
-        except Exception as e:
-            error_handler.log_error(
-                f"Failed to release lock for {order_id}",
-                ErrorSeverity.MEDIUM,
-                {"order_id": order_id, "status": status, "error": str(e)}
-            )
+        else:
+            # 새 레코드 추가
+            current_time = self._locked_at_now()
+            new_row = [
+                order_id,
+                self.machine_id,
+                current_time,
+                self.STATUS_PROCESSING,
+                self.machine_id,
+                notes
+            ]
+
+            # 조회와 추가 사이에 다른 PC(또는 이 PC 의 다른 스레드)도 같은 주문을 추가했을 수 있으므로
+            # 추가 직후 A열을 다시 읽어 가장 위쪽 행을 추가한 호출만 락을 가짐
+            # (같은 배치 창에 넣어 추가 → 조회 순서로 실행, 자기 행은 locked_by + locked_at 으로 구분)
+            appended = self._sheets().append_row(new_row)
+            owners = self._sheets().find_owners(order_id)
+            appended.result()
+            owners = owners.result()
+
+            mine = [row for row, locked_by, locked_at in owners
+                    if (locked_by, locked_at) == (self.machine_id, current_time)]
+            if owners and (not mine or owners[0][0] != mine[0]):
+                # 경합에서 짐 - 내가 추가한 행을 duplicate 로 표시하고 포기
+                # (행 삭제는 행 번호를 밀어내고, 빈 행은 이후 append 위치를 바꾸므로 하지 않음)
+                marked = [self._sheets().update_cells(row, {
+                              1: f"{order_id} (duplicate)",
+                              4: self.STATUS_DUPLICATE,
+                              6: f"Lost lock race to {owners[0][1]}"}, order_id)
+                          for row in mine]
+                for future in marked:
+                    future.result()
+                logger.info(f"Order {order_id} was claimed by {owners[0][1]} at the same time - backing off")
+                timing["outcome"] = "lost_race"
+                return False
+
+            logger.info(f"Lock acquired for new order {order_id}")
+            timing["outcome"] = "acquired"
+            return True
+
+    def _release_once(self, order_id: str, status: str, notes: str, timing: dict) -> bool:
+        """release_lock 1회 시도 (조회한 행이 그 사이 밀렸으면 _RowMoved)"""
+        row_num = self._find_order_row(order_id)
+        if not row_num:
+            logger.warning(f"Order {order_id} not found in lock sheet")
+            timing["outcome"] = "not_found"
             return False
 
+        # 상태 업데이트
+        updates = {4: status}  # status
+        if notes:
+            row_data = self._sheets().read_row(row_num).result()
+            if row_data and row_data[0] != order_id:
+                raise _RowMoved(f"Lock row {row_num} now holds {row_data[0]!r}")
+            existing_notes = row_data[5] if len(row_data) > 5 else ""
+            updates[6] = f"{existing_notes} | {notes}" if existing_notes else notes
+        self._sheets().update_cells(row_num, updates, order_id).result()
+
+        logger.info(f"Lock released for order {order_id}")
+        return True
+
+    def release_lock_async(self, order_id: str, status: str = STATUS_COMPLETED, notes: str = "") -> Future:
+        """
+        release_lock 을 백그라운드에서 실행 (호출자는 기다리지 않고 다음 작업 진행)
+
+        동시에 진행되는 해제 요청들은 배치 클라이언트에서 하나의 Sheets 요청으로 합쳐짐
+        """
+        future = self._release_executor.submit(self.release_lock, order_id, status, notes)
+        with self._pending_lock:
+            self._pending_releases.add(future)
+        future.add_done_callback(self._forget_release)
+        return future
+
+    def _forget_release(self, future: Future):
+        with self._pending_lock:
+            self._pending_releases.discard(future)
+
+    def wait_for_releases(self, timeout: Optional[float] = None) -> bool:
+        """진행 중인 비동기 해제가 모두 끝날 때까지 대기 (timeout 내 완료되면 True)"""
+        with self._pending_lock:
+            pending = list(self._pending_releases)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for future in pending:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                future.result(timeout=remaining)
+            except Exception:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+        return True
+
     def get_lock_status(self, order_id: str) -> Optional[Dict]:
         """특정 주문의 락 상태 조회"""
-        try:
-            if not self.lock_worksheet:
-                return None
+        with span("lock_status", order_id=order_id) as timing:
+            try:
+                if not self.lock_worksheet:
+                    return None
 
-            row_num = self._find_order_row(order_id)
-            if not row_num:
-                return None
+                row_num = self._find_order_row(order_id)
+                if not row_num:
+                    timing["outcome"] = "not_found"
+                    return None
 
-            row_data = self.lock_worksheet.row_values(row_num)
-            if len(row_data) < 5:
-                return None
+                row_data = self._sheets().read_row(row_num).result()
+                return self._row_to_status(row_data)
 
-            return {
-                "order_id": row_data[0],
-                "locked_by": row_data[1] if len(row_data) > 1 else "",
-                "locked_at": row_data[2] if len(row_data) > 2 else "",
-                "status": row_data[3] if len(row_data) > 3 else "",
-                "machine_id": row_data[4] if len(row_data) > 4 else "",
-                "notes": row_data[5] if len(row_data) > 5 else ""
-            }
+            except Exception as e:
+                logger.warning(f"Failed to get lock status for {order_id}: {e}")
+                timing["outcome"] = "error"
+                return None
 
-        except Exception as e:
-            logger.warning(f"Failed to get lock status for {order_id}: {e}")
+    @staticmethod
+    def _row_to_status(row_data: List[str]) -> Optional[Dict]:
+        """시트 행 → 락 상태 dict (필수 컬럼이 없으면 None)"""
+        if len(row_data) < 5:
             return None
+        return {
+            "order_id": row_data[0],
+            "locked_by": row_data[1],
+            "locked_at": row_data[2],
+            "status": row_data[3],
+            "machine_id": row_data[4],
+            "notes": row_data[5] if len(row_data) > 5 else ""
+        }
+
+    def snapshot_locks(self) -> Dict[str, Dict]:
+        """
+        락 시트 전체를 한 번에 읽어 {order_id: 락 상태} 로 반환
+
+        같은 order_id 가 여러 행이면 아래쪽(최근) 행 기준, 실패 시 빈 dict
+        """
+        with span("lock_snapshot") as timing:
+            try:
+                if not self.lock_worksheet:
+                    return {}
+                locks = {}
+                for row_data in self.lock_worksheet.get_all_values()[1:]:  # Skip header
+                    status = self._row_to_status(row_data)
+                    if status:
+                        locks[status["order_id"]] = status
+                timing["rows"] = len(locks)
+                return locks
+            except Exception as e:
+                logger.warning(f"Failed to snapshot lock sheet: {e}")
+                timing["outcome"] = "error"
+                return {}
+
+    def status_snapshot(self) -> "LockStatusSnapshot":
+        """업로드 배치용 락 상태 스냅샷 (첫 조회 시 1회만 시트를 읽음)"""
+        return LockStatusSnapshot(self)
 
     def get_all_locks(self) -> List[Dict]:
         """모든 락 레코드 조회"""
@@ -332,6 +699,109 @@ class DistributedLockManager:
             logger.warning(f"Failed to get all locks: {e}")
             return []
 
+    def delete_rows(self, row_numbers: List[int]) -> int:
+        """
+        여러 행을 한 번의 batchUpdate 로 삭제
+
+        연속된 행 번호는 하나의 deleteDimension 범위로 묶고, 아래쪽 범위부터 삭제해
+        앞선 삭제로 인한 행 번호 변화가 없도록 함 (행 수와 무관하게 API 호출 1회)
+
+        Returns:
+            삭제한 행 수
+        """
+        ranges = []  # [(start_row, end_row)] 1-based, 끝 포함
+        for row_num in sorted(set(row_numbers)):
+            if ranges and row_num == ranges[-1][1] + 1:
+                ranges[-1] = (ranges[-1][0], row_num)
+            else:
+                ranges.append((row_num, row_num))
+        if not ranges:
+            return 0
+
+        sheet_id = self.lock_worksheet.id
+        requests = [{
+            "deleteDimension": {
+                "range": {"sheetId": sheet_id, "dimension": "ROWS", "startIndex": start - 1, "endIndex": end}
+            }
+        } for start, end in reversed(ranges)]
+
+        self.spreadsheet.batch_update({"requests": requests})
+        logger.info(f"Deleted {len(set(row_numbers))} lock rows in {len(ranges)} ranges")
+        return len(set(row_numbers))
+
+    def archive_old_locks(self, max_age_days: int = None) -> int:
+        """
+        오래된 완료/실패 레코드를 월별 아카이브 시트로 옮기고 락 시트에서 삭제
+
+        - 아카이브 시트: {LOCK_SHEET_NAME}_archive_YYYY_MM (locked_at 기준 월, 없으면 생성)
+        - 시트 전체 조회 1회 + 월별 append_rows 1회 + 행 삭제 batchUpdate 1회
+        - 복사를 먼저 하므로 중간에 실패해도 레코드가 사라지지 않음 (최악의 경우 아카이브에 중복)
+        - 삭제 직전 시트를 다시 읽어 처음 읽은 내용(order_id, 상태, 시각)과 그대로인 행만 삭제
+          (그 사이 다른 PC 가 다시 잡은 실패 건이나 행 번호가 밀린 경우는 건너뜀)
+        - 끝난 아카이브 선출 행(__lock_archive_*)은 기간과 관계없이 아카이브 없이 삭제
+
+        Returns:
+            아카이브한 레코드 수
+        """
+        max_age_days = config.LOCK_ARCHIVE_AFTER_DAYS if max_age_days is None else max_age_days
+        if not self.lock_worksheet:
+            return 0
+
+        with span("lock_archive") as timing:
+            cutoff_time = datetime.datetime.now() - datetime.timedelta(days=max_age_days)
+            all_values = self.lock_worksheet.get_all_values()
+
+            by_month = {}  # title -> [(row_num, row)]
+            elections = []  # [(row_num, row)] finished archive election rows
+            for idx, row in enumerate(all_values[1:], start=2):  # Skip header
+                if len(row) < 4 or row[3] not in self.FINISHED_STATUSES:
+                    continue
+                if row[0].startswith(self.ARCHIVE_ELECTION_PREFIX):
+                    elections.append((idx, row))
+                    continue
+                try:
+                    locked_time = datetime.datetime.fromisoformat(row[2])
+                except ValueError:
+                    continue
+                if locked_time < cutoff_time:
+                    title = f"{self.LOCK_SHEET_NAME}_archive_{locked_time:%Y_%m}"
+                    by_month.setdefault(title, []).append((idx, row))
+
+            if not by_month and not elections:
+                timing["archived"] = 0
+                return 0
+
+            for title, entries in by_month.items():
+                self._archive_worksheet(title).append_rows([row for _, row in entries], value_input_option="RAW")
+
+            # 조회 이후 바뀐 행(다시 잡힌 락, 밀린 행 번호)은 삭제하지 않음
+            candidates = [entry for entries in by_month.values() for entry in entries] + elections
+            current = self.lock_worksheet.get_all_values()
+            rows_to_delete = [idx for idx, row in candidates
+                              if idx <= len(current) and _same_row(current[idx - 1], row)]
+            skipped = len(candidates) - len(rows_to_delete)
+            self.delete_rows(rows_to_delete)
+            archived = len(set(rows_to_delete) - {idx for idx, _ in elections})
+
+            timing["archived"] = archived
+            logger.info(f"[LockArchive] Moved {archived} lock records older than {max_age_days} days "
+                        f"to {', '.join(sorted(by_month)) or '-'}, removed {len(rows_to_delete) - archived} "
+                        f"election rows, skipped {skipped} changed rows")
+            return archived
+
+    def _archive_worksheet(self, title: str):
+        """월별 아카이브 시트 조회 (없으면 헤더와 함께 생성)"""
+        if title not in self._archive_worksheets:
+            existing = {ws.title: ws for ws in self.spreadsheet.worksheets()}
+            if title in existing:
+                worksheet = _InstrumentedSheets(existing[title])
+            else:
+                logger.info(f"[LockArchive] Creating archive sheet: {title}")
+                worksheet = _InstrumentedSheets(self.spreadsheet.add_worksheet(title=title, rows=1000, cols=6))
+                worksheet.append_row(self.HEADER)
+            self._archive_worksheets[title] = worksheet
+        return self._archive_worksheets[title]
+
     def cleanup_old_locks(self, max_age_days: int = 7) -> int:
         """오래된 완료/실패 레코드 정리"""
         try:
@@ -351,8 +821,8 @@ class DistributedLockManager:
                 status = row[3]
                 locked_at = row[2]
 
-                # 완료/실패 상태만 정리
-                if status in [self.STATUS_COMPLETED, self.STATUS_FAILED]:
+                # 완료/실패(중복 포함) 상태만 정리
+                if status in self.FINISHED_STATUSES:
                     try:
                         locked_time = datetime.datetime.fromisoformat(locked_at)
                         if locked_time < cutoff_time:
@@ -360,18 +830,33 @@ class DistributedLockManager:
                     except:
                         continue
 
-            # 역순으로 삭제 (인덱스 변화 방지)
-            for row_num in sorted(rows_to_delete, reverse=True):
-                self.lock_worksheet.delete_rows(row_num)
-
-            logger.info(f"Cleaned up {len(rows_to_delete)} old lock records")
-            return len(rows_to_delete)
+            deleted = self.delete_rows(rows_to_delete)
+            logger.info(f"Cleaned up {deleted} old lock records")
+            return deleted
 
         except Exception as e:
             logger.warning(f"Failed to cleanup old locks: {e}")
             return 0
 
 
+class LockStatusSnapshot:
+    """
+    업로드 배치 1회분 락 상태 (read-through)
+
+    첫 get() 에서 snapshot_locks() 로 시트 전체를 1회 읽고, 이후 조회는 메모리에서 처리
+    → 대기 파일 N개를 확인해도 Sheets 호출은 1회
+    """
+
+    def __init__(self, manager: DistributedLockManager):
+        self._manager = manager
+        self._locks = None
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        if self._locks is None:
+            self._locks = self._manager.snapshot_locks()
+        return self._locks.get(order_id)
+
+
 # ============================================================
 # 테스트 코드
 # ============================================================
@@ -1,15 +1,34 @@
+import os
+import re
+import copy
+import atexit
 import logging
 import json
-import os
+import queue
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+import multiprocessing
+from multiprocessing import util
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from config import config
 
 class JsonFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging."""
+    def __init__(self):
+        super().__init__()
+        # ISO timestamp of the current second, rebuilt at most once per second
+        self._cached_second = None
+        self._cached_iso = ""
+
+    def _timestamp(self, created):
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_iso = datetime.fromtimestamp(second).isoformat()
+            self._cached_second = second
+        return f"{self._cached_iso}.{int((created - second) * 1_000_000):06d}"
+
     def format(self, record):
         log_record = {
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "name": record.name,
             "message": record.getMessage(),
@@ -17,26 +36,110 @@ class JsonFormatter(logging.Formatter):
             "func": record.funcName,
             "line": record.lineno
         }
+        # Structured timing fields (see instrumentation.span)
+        for field in ("span", "order_id"):
+            value = getattr(record, field, None)
+            if value is not None:
+                log_record[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_record["exception"] = record.exc_text
+        return json.dumps(log_record, ensure_ascii=False, default=str)
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread (the caller only merges args)."""
+    def prepare(self, record):
+        # Other handlers on the logger still see the original record (traceback included)
+        record = copy.copy(record)
+        # Arguments may be mutated after the call returns, so resolve the message now
+        record.msg = record.getMessage()
+        record.args = None
         if record.exc_info:
-            log_record["exception"] = self.formatException(record.exc_info)
-        return json.dumps(log_record, ensure_ascii=False)
+            # Tracebacks reference live frames - render them before handing the record over
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
-def setup_logging():
-    """Setup structured logging with JSON formatting and rotation."""
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO if not config.FLASK_DEBUG else logging.DEBUG)
-    
+# PID of the process that configured logging first; inherited by spawned and forked children
+_MAIN_PID_ENV = "APP_LOG_MAIN_PID"
+_queue_handler = None
+_listener = None
+
+def _log_file(child: bool):
+    # RotatingFileHandler cannot rotate a file another process keeps open, so child processes write
+    # to their own file, named by role (engine, worker-parser, ...) so restarts reuse and rotate it
+    suffix = ""
+    if child:
+        role = multiprocessing.current_process().name
+        role = f"pid{os.getpid()}" if role == "MainProcess" else re.sub(r"[^\w.-]", "_", role)
+        suffix = f"_{role}"
+    return config.LOGS_DIR / f"app_{datetime.now():%Y%m%d}{suffix}.json"
+
+class _ProcessFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler whose file is chosen on the first record: a forked multiprocessing child
+    only gets its process name after the fork hooks have run
+    """
+    def __init__(self, child: bool, **kwargs):
+        self.child = child
+        super().__init__(_log_file(child), delay=True, **kwargs)
+        self._named = not child
+
+    def emit(self, record):
+        if not self._named:
+            self.baseFilename = os.path.abspath(_log_file(self.child))
+            self._named = True
+        super().emit(record)
+
+def _start_listener(logger, child: bool):
+    global _queue_handler, _listener
     # Console Handler (Human-friendly)
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s'))
-    logger.addHandler(console_handler)
-    
+
     # JSON File Handler (Rotation: 5MB per file, kept 5 backups)
-    log_file = config.LOGS_DIR / f"app_{datetime.now():%Y%m%d}.json"
-    file_handler = RotatingFileHandler(log_file, maxBytes=5*1024*1024, backupCount=5, encoding='utf-8')
+    file_handler = _ProcessFileHandler(child, maxBytes=5*1024*1024, backupCount=5, encoding='utf-8')
     file_handler.setFormatter(JsonFormatter())
-    logger.addHandler(file_handler)
-    
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = _DeferredQueueHandler(log_queue)
+    logger.addHandler(_queue_handler)
+    _listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    _listener.start()
+
+def _stop_listener():
+    if _listener and _listener._thread:
+        _listener.stop()
+
+def _flush_at_child_exit(_):
+    # multiprocessing children leave through os._exit (no atexit) and drop inherited finalizers first
+    util.Finalize(None, _stop_listener, exitpriority=0)
+
+def _restart_in_child():
+    """Forked child: the listener thread was not copied, so records would pile up unwritten in the queue"""
+    logger = logging.getLogger()
+    logger.removeHandler(_queue_handler)
+    _start_listener(logger, child=True)
+
+def setup_logging():
+    """
+    Setup structured logging with JSON formatting and rotation.
+
+    Log calls only enqueue the record; a QueueListener thread does the formatting,
+    json.dumps and file/console I/O so hot paths never wait on log output.
+    Forked children start their own listener, and every child process logs to app_YYYYMMDD_<process name>.json.
+    """
+    logger = logging.getLogger()
+    logger.setLevel(logging.INFO if not config.FLASK_DEBUG else logging.DEBUG)
+
+    child = os.environ.setdefault(_MAIN_PID_ENV, str(os.getpid())) != str(os.getpid())
+    _start_listener(logger, child)
+    # Flush queued records on interpreter exit
+    atexit.register(_stop_listener)
+    os.register_at_fork(after_in_child=_restart_in_child)
+    util.register_after_fork(_stop_listener, _flush_at_child_exit)
+
     return logger
 
 # Initialize logging when imported
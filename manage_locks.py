@@ -111,10 +111,8 @@ def clear_date(target_date):
             
         print(f"총 {len(rows_to_delete)}개의 기록을 찾았습니다. 삭제를 시작합니다...")
         
-        # 역순 삭제
-        for row_num in sorted(rows_to_delete, reverse=True):
-            manager.lock_worksheet.delete_rows(row_num)
-            print(f"삭제됨: 행 {row_num}")
+        # 연속된 행을 범위로 묶어 한 번의 요청으로 삭제
+        manager.delete_rows(rows_to_delete)
             
         print(f"[성공] {len(rows_to_delete)}개의 락 기록이 삭제되었습니다.")
 
@@ -0,0 +1,184 @@
+"""
+메트릭 수집 (Prometheus Metrics)
+================================
+/metrics 엔드포인트용 카운터/게이지/히스토그램 (Prometheus text exposition format)
+
+- 외부 의존성 없이 스레드 안전한 최소 구현
+- instrumentation.span 측정값은 shop_stage_duration_seconds 히스토그램으로 자동 집계
+- 워커 프로세스의 카운터 증가분은 counter_values()/add_counter_values() 로 엔진 레지스트리에 합산
+"""
+
+import threading
+from typing import Callable, Dict, List, Tuple
+
+from instrumentation import add_span_listener
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple, object] = {}
+
+    def _key(self, labels: dict) -> Tuple:
+        return tuple(labels.get(n, "") for n in self.label_names)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key: Tuple, value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    TYPE = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    TYPE = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def _render_sample(self, key: Tuple, state) -> List[str]:
+        lines = []
+        for bound, count in zip(self.buckets, state["counts"]):
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {count}")
+        lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {state['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together for a scrape."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        """스크레이프 직전에 호출되어 게이지 값을 갱신하는 콜백 등록"""
+        self._collectors.append(collector)
+
+    def counter_values(self) -> Dict[Tuple[str, Tuple], float]:
+        """카운터 값 스냅샷 {(메트릭 이름, 라벨 값): 값}"""
+        values = {}
+        for metric in self._metrics:
+            if isinstance(metric, Counter):
+                with metric._lock:
+                    values.update({(metric.name, key): value for key, value in metric._values.items()})
+        return values
+
+    def add_counter_values(self, deltas: Dict[Tuple[str, Tuple], float]):
+        """다른 프로세스에서 증가한 카운터 값 합산"""
+        counters = {m.name: m for m in self._metrics if isinstance(m, Counter)}
+        for (name, key), amount in deltas.items():
+            metric = counters.get(name)
+            if metric:
+                with metric._lock:
+                    metric._values[key] = metric._values.get(key, 0) + amount
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry & metrics
+registry = MetricsRegistry()
+
+DOCUMENTS_DOWNLOADED = registry.register(Counter(
+    "shop_documents_downloaded_total", "Documents downloaded from the OMS", ("doc_type",)))
+DOCUMENTS_UPLOADED = registry.register(Counter(
+    "shop_documents_uploaded_total", "Documents uploaded to the ERP", ("doc_type",)))
+DOCUMENTS_FAILED = registry.register(Counter(
+    "shop_documents_failed_total", "Documents that failed to download or upload", ("doc_type", "stage")))
+SHEETS_API_CALLS = registry.register(Counter(
+    "shop_sheets_api_calls_total", "Google Sheets API calls made by the lock manager", ("method",)))
+SHEETS_QUOTA_ERRORS = registry.register(Counter(
+    "shop_sheets_quota_errors_total", "Google Sheets API calls rejected with HTTP 429", ("method",)))
+SHEETS_THROTTLE_SECONDS = registry.register(Counter(
+    "shop_sheets_throttle_seconds_total", "Time spent waiting for the Google Sheets rate limiter",
+    ("reason",)))
+STAGE_SECONDS = registry.register(Histogram(
+    "shop_stage_duration_seconds", "Duration of instrumented stages (download, lock, parse, upload steps)",
+    ("stage", "outcome")))
+PENDING_DOCUMENTS = registry.register(Gauge(
+    "shop_pending_documents", "Downloaded documents waiting for upload", ("doc_type",)))
+EMPTY_CYCLES = registry.register(Gauge(
+    "shop_empty_download_cycles", "Consecutive download cycles without new documents"))
+QUEUE_JOBS = registry.register(Gauge(
+    "shop_work_queue_jobs", "Download/upload jobs in the retry queue", ("status",)))
+WORKER_RESTARTS = registry.register(Counter(
+    "shop_worker_restarts_total", "Worker process restarts by the supervisor", ("worker", "reason")))
+LOCK_MANAGER_CONNECTED = registry.register(Gauge(
+    "shop_lock_manager_connected", "1 if the distributed lock manager is connected"))
+
+
+def _observe_span(name: str, duration: float, outcome: str, fields: dict):
+    STAGE_SECONDS.observe(duration, stage=name, outcome=outcome)
+
+
+add_span_listener(_observe_span)
@@ -0,0 +1,129 @@
+"""
+Pending 작업 인덱스 (Pending Work Index)
+========================================
+다운로드 디렉토리와 히스토리를 매번 스캔하지 않고
+pending/history 건수를 메모리에서 증분 관리
+
+- 시작 시 1회만 디렉토리 스캔 + 히스토리 로드
+- 다운로더 저장 / 업로더 성공 / 아카이브 이동 시 증분 갱신
+- /api/stats 는 미리 계산된 스냅샷을 O(1)로 반환
+"""
+
+import datetime
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Import centralized config
+from config import config
+from document_archive import DOCUMENT_SUFFIXES
+
+DOC_TYPES = ("ledger", "estimate")
+
+
+class PendingIndex:
+    """In-memory index of downloaded documents and processed history keys."""
+
+    def __init__(self, history_loader: Callable[[], dict], downloads_dir: Optional[Path] = None,
+                 on_change: Optional[Callable[[], None]] = None):
+        self._history_loader = history_loader
+        self._on_change = on_change
+        self.downloads_dir = Path(downloads_dir or config.DOWNLOADS_DIR)
+        self._lock = threading.Lock()
+        self._built = False
+        self._files = {t: {} for t in DOC_TYPES}      # doc_type -> {key: Path}
+        self._history = {t: set() for t in DOC_TYPES}  # doc_type -> {key}
+        self._pending = {t: set() for t in DOC_TYPES}  # files - history
+        self._snapshot = None
+
+    def rebuild(self):
+        """디렉토리 스캔 + 히스토리 로드로 인덱스 전체 재구성"""
+        history = self._history_loader()
+        with self._lock:
+            for doc_type in DOC_TYPES:
+                doc_dir = self.downloads_dir / doc_type
+                files = {}
+                if doc_dir.exists():
+                    for path in doc_dir.iterdir():
+                        if path.suffix in DOCUMENT_SUFFIXES:
+                            files[path.stem] = path
+                self._files[doc_type] = files
+                self._history[doc_type] = set(history.get(doc_type, []))
+                self._pending[doc_type] = set(files) - self._history[doc_type]
+            self._built = True
+            self._refresh_snapshot()
+        self._notify()
+
+    def _ensure_built(self):
+        if not self._built:
+            self.rebuild()
+
+    def _notify(self):
+        if self._on_change:
+            self._on_change()
+
+    def _refresh_snapshot(self):
+        # 변경 시에만 재계산하므로 조회는 항상 O(1)
+        self._snapshot = {
+            "pending": {t: len(self._pending[t]) for t in DOC_TYPES},
+            "history_count": {t: len(self._history[t]) for t in DOC_TYPES}
+        }
+
+    def add_document(self, doc_type: str, key: str, path: Path):
+        """다운로더가 새 문서를 저장했을 때 호출"""
+        self._ensure_built()
+        with self._lock:
+            self._files[doc_type][key] = Path(path)
+            if key not in self._history[doc_type]:
+                self._pending[doc_type].add(key)
+            self._refresh_snapshot()
+        self._notify()
+
+    def add_history(self, doc_type: str, key: str):
+        """문서가 처리 완료(히스토리 기록)되었을 때 호출"""
+        self._ensure_built()
+        with self._lock:
+            self._history[doc_type].add(key)
+            self._pending[doc_type].discard(key)
+            self._refresh_snapshot()
+        self._notify()
+
+    def remove_document(self, doc_type: str, key: str):
+        """문서가 pending 디렉토리에서 제거(아카이브)되었을 때 호출"""
+        self._ensure_built()
+        with self._lock:
+            self._files[doc_type].pop(key, None)
+            self._pending[doc_type].discard(key)
+            self._refresh_snapshot()
+        self._notify()
+
+    def pending_files(self, doc_type: str) -> List[Path]:
+        """업로드 대기 중인 문서 경로 목록"""
+        self._ensure_built()
+        with self._lock:
+            return [self._files[doc_type][key] for key in sorted(self._pending[doc_type])]
+
+    def processed_files(self, doc_type: str) -> List[Path]:
+        """히스토리에 기록되었지만 아직 pending 디렉토리에 남아있는 문서 경로 목록"""
+        self._ensure_built()
+        with self._lock:
+            files = self._files[doc_type]
+            return [files[key] for key in files if key in self._history[doc_type]]
+
+    def downloaded_timestamps(self) -> List[datetime.datetime]:
+        """아직 다운로드 디렉토리에 있는(아카이브 전) 문서들의 다운로드 시각 (파일 mtime, 폴링 주기 학습용)"""
+        self._ensure_built()
+        with self._lock:
+            paths = [path for files in self._files.values() for path in files.values()]
+        timestamps = []
+        for path in paths:
+            try:
+                timestamps.append(datetime.datetime.fromtimestamp(path.stat().st_mtime))
+            except OSError:
+                continue
+        return timestamps
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """대시보드용 pending/history 건수 스냅샷"""
+        self._ensure_built()
+        return self._snapshot
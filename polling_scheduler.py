@@ -0,0 +1,100 @@
+"""
+적응형 다운로드 주기 (Adaptive Polling Scheduler)
+=================================================
+고정 DOWNLOAD_INTERVAL_SEC 대신 요일/시간대별 주문 유입률을 학습하여 다음 폴링 시점 결정
+
+- 학습 데이터: 아카이브 인덱스의 downloaded_at + 다운로드 디렉토리에 남은 문서의 mtime
+  + 실행 중 다운로드된 건수
+- 활성 시간대(영업시간 또는 학습된 유입률이 높은 시간대): 유입률에 비례해 짧은 주기로 폴링
+- 비활성 시간대(야간/주말): 연속 빈 사이클 수에 따라 지수적으로 대기 시간 증가,
+  단 다음 활성 시간대 시작 시점은 넘기지 않음
+"""
+
+import datetime
+import threading
+from typing import Iterable, Optional
+
+# Import centralized config
+from config import config
+
+HOURS_PER_WEEK = 7 * 24
+
+
+class PollingScheduler:
+    """Per weekday/hour arrival-rate model that picks the next download interval."""
+
+    # 이 값(건/시간) 이상이 관측된 시간대는 영업시간 밖이어도 활성으로 간주
+    ACTIVE_RATE = 0.5
+
+    def __init__(self, base_interval: Optional[int] = None, min_interval: Optional[int] = None,
+                 max_interval: Optional[int] = None):
+        self.base_interval = base_interval or config.DOWNLOAD_INTERVAL_SEC
+        self.min_interval = min_interval or config.POLL_MIN_INTERVAL_SEC
+        self.max_interval = max_interval or config.POLL_MAX_INTERVAL_SEC
+        self._lock = threading.Lock()
+        self._counts = [[0] * 24 for _ in range(7)]  # [weekday][hour] -> 관측된 다운로드 수
+        self._first_seen: Optional[datetime.datetime] = None
+
+    def seed(self, timestamps: Iterable[datetime.datetime]):
+        """과거 다운로드 시각으로 유입률 초기화 (시작 시 1회)"""
+        with self._lock:
+            for ts in timestamps:
+                self._add(ts, 1)
+
+    def record_arrivals(self, count: int, when: Optional[datetime.datetime] = None):
+        """다운로드 사이클에서 새로 받은 건수 반영"""
+        with self._lock:
+            self._add(when or datetime.datetime.now(), count)
+
+    def _add(self, ts: datetime.datetime, count: int):
+        if self._first_seen is None or ts < self._first_seen:
+            self._first_seen = ts
+        self._counts[ts.weekday()][ts.hour] += count
+
+    def arrival_rate(self, when: datetime.datetime) -> float:
+        """해당 요일/시간대의 주당 평균 유입 건수 (건/시간)"""
+        with self._lock:
+            if self._first_seen is None:
+                return 0.0
+            weeks = max(1.0, (when - self._first_seen).total_seconds() / (HOURS_PER_WEEK * 3600))
+            return self._counts[when.weekday()][when.hour] / weeks
+
+    @staticmethod
+    def is_business_hour(when: datetime.datetime) -> bool:
+        return (when.weekday() in config.BUSINESS_DAYS
+                and config.BUSINESS_HOUR_START <= when.hour < config.BUSINESS_HOUR_END)
+
+    def is_active(self, when: datetime.datetime) -> bool:
+        return self.is_business_hour(when) or self.arrival_rate(when) >= self.ACTIVE_RATE
+
+    def seconds_until_active(self, now: datetime.datetime) -> Optional[float]:
+        """다음 활성 시간대 시작까지 남은 시간 (일주일 내 없으면 None)"""
+        slot = now.replace(minute=0, second=0, microsecond=0)
+        for _ in range(HOURS_PER_WEEK):
+            slot += datetime.timedelta(hours=1)
+            if self.is_active(slot):
+                return (slot - now).total_seconds()
+        return None
+
+    def next_interval(self, empty_cycles: int = 0, now: Optional[datetime.datetime] = None) -> int:
+        """
+        다음 다운로드 사이클까지 대기할 시간(초)
+
+        Args:
+            empty_cycles: 연속으로 새 문서가 없었던 사이클 수
+        """
+        now = now or datetime.datetime.now()
+
+        if self.is_active(now):
+            # 유입이 많을수록 짧게 (시간당 1건이면 기본 주기의 1/2)
+            interval = self.base_interval / (1 + self.arrival_rate(now))
+            if empty_cycles >= 5:
+                interval *= 2  # 영업시간이라도 계속 비어 있으면 완화 (기존 동작 유지)
+            return int(max(self.min_interval, min(interval, self.max_interval)))
+
+        # 비활성 시간대: 빈 사이클마다 2배씩 늘리되 다음 활성 시간대 시작 전에는 깨어남
+        interval = min(self.max_interval, self.base_interval * 2 ** min(empty_cycles, 10))
+        until_active = self.seconds_until_active(now)
+        if until_active is not None:
+            interval = min(interval, until_active)
+        return int(max(self.min_interval, interval))
@@ -0,0 +1,104 @@
+"""
+요청 속도 제한 (Token Bucket Rate Limiter)
+==========================================
+Google Sheets API 분당 할당량을 넘지 않도록 호출 속도를 조절
+
+- 토큰 버킷: 분당 rate 개 토큰이 일정하게 채워지고 burst 개까지 모아 둘 수 있음
+- 429 응답 시 Retry-After(없으면 지수 백오프) 동안 버킷 전체를 멈춰 다른 스레드도 함께 대기
+- 대기 시간은 shop_sheets_throttle_seconds_total 메트릭으로 집계
+- sheets_limiter: 락 관리자(DistributedLockManager)와 manage_locks.py 가 공유하는 프로세스 전역 인스턴스
+  (할당량은 매장 PC 전체가 공유하므로 기본 속도는 SHEETS_QUOTA_PER_MIN / SHEETS_MACHINES)
+"""
+
+import time
+import random
+import threading
+from typing import Callable, Optional
+
+from config import config
+from logging_config import logger
+from metrics import SHEETS_THROTTLE_SECONDS
+
+
+def is_quota_error(error: Exception) -> bool:
+    """gspread APIError 등 response.status_code 가 429 인 예외인지 확인"""
+    return getattr(getattr(error, "response", None), "status_code", None) == 429
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """429 응답의 Retry-After 헤더 값 (초, 없거나 해석 불가하면 None)"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷"""
+
+    def __init__(self, rate_per_min: float, burst: int = 1):
+        self.interval = 60.0 / rate_per_min
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def acquire(self) -> float:
+        """
+        토큰 1개를 소비 (없으면 채워질 때까지 대기)
+
+        Returns:
+            대기한 시간 (초)
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.interval)
+                self._updated = now
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = max(self._paused_until - now, (1 - self._tokens) * self.interval)
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float):
+        """할당량 초과 응답 후 모든 호출자를 seconds 동안 멈추고 버킷을 비움"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+def call_with_quota(limiter: TokenBucket, method: str, fn: Callable, *args,
+                    max_retries: Optional[int] = None, **kwargs):
+    """
+    속도 제한을 적용해 fn 호출, 429 응답이면 Retry-After/백오프 후 재시도
+
+    Raises:
+        마지막 시도의 예외 (429 재시도 초과 또는 429 이외의 오류)
+    """
+    max_retries = config.MAX_RETRIES if max_retries is None else max_retries
+    attempt = 0
+    while True:
+        waited = limiter.acquire()
+        if waited:
+            SHEETS_THROTTLE_SECONDS.inc(waited, reason="pacing")
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if not is_quota_error(e) or attempt >= max_retries:
+                raise
+            attempt += 1
+            backoff = retry_after_seconds(e)
+            if backoff is None:
+                backoff = config.RETRY_DELAY_SEC * 2 ** (attempt - 1) + random.uniform(0, 1)
+            logger.warning(f"[RateLimit] Sheets quota exceeded on {method} - retry {attempt}/{max_retries} in {backoff:.1f}s")
+            SHEETS_THROTTLE_SECONDS.inc(backoff, reason="retry_after")
+            limiter.pause(backoff)
+
+
+# Global instance (per process) - SHEETS_REQUESTS_PER_MIN is this machine's share of the fleet quota
+sheets_limiter = TokenBucket(config.SHEETS_REQUESTS_PER_MIN, burst=config.SHEETS_BURST)
@@ -0,0 +1,72 @@
+"""
+상태 변경 알림 (Status Events)
+==============================
+대시보드 Server-Sent Events 푸시를 위한 변경 감지/알림
+
+- StatusDict: 값이 실제로 바뀔 때만 알림을 보내는 server_status 용 dict
+- StatusBroadcaster: 버전 카운터 + Condition 으로 대기 중인 스트림을 깨움
+  (변경이 없으면 스트림은 heartbeat 외에 아무 작업도 하지 않음)
+"""
+
+import threading
+from typing import Callable, Optional
+
+
+class StatusBroadcaster:
+    """Version counter that wakes up waiting event streams on change."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def notify(self):
+        """상태 변경 알림 (대기 중인 모든 스트림 깨움)"""
+        with self._cond:
+            self._version += 1
+            self._cond.notify_all()
+
+    def wait(self, last_version: int, timeout: float) -> int:
+        """last_version 이후 변경이 생기거나 timeout 이 지날 때까지 대기 후 현재 버전 반환"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._version != last_version, timeout=timeout)
+            return self._version
+
+
+class StatusDict(dict):
+    """dict that calls on_change whenever an item is set to a different value."""
+
+    def __init__(self, *args, on_change: Optional[Callable[[], None]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._on_change = on_change
+
+    def __setitem__(self, key, value):
+        changed = key not in self or self[key] != value
+        super().__setitem__(key, value)
+        if changed and self._on_change:
+            self._on_change()
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+
+def diff_payload(previous: dict, current: dict) -> dict:
+    """이전 전송분과 비교한 변경분 계산 (status 는 키 단위, 나머지는 섹션 단위)"""
+    delta = {}
+    for section, value in current.items():
+        old = previous.get(section)
+        if section == "status" and isinstance(old, dict):
+            changed = {k: v for k, v in value.items() if old.get(k) != v}
+            if changed:
+                delta[section] = changed
+        elif old != value:
+            delta[section] = value
+    return delta
+
+
+# Global broadcaster
+status_events = StatusBroadcaster()
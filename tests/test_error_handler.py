@@ -0,0 +1,191 @@
+"""ErrorHandler: 메시지 템플릿, 에러 폭주 집계/요약, critical_errors.jsonl 회전과 최근 에러 조회, 변경 알림 확인"""
+
+import json
+import logging
+import os
+import time
+import types
+
+import pytest
+
+import error_handler as module
+from error_handler import ErrorHandler, ErrorSeverity, _tail_lines, message_template
+from status_events import StatusBroadcaster
+
+WINDOW = 60
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(module, "time", types.SimpleNamespace(time=clock, sleep=time.sleep))
+    return clock
+
+
+@pytest.fixture
+def handler(tmp_path):
+    changes = []
+    handler = ErrorHandler(logger=logging.getLogger("tests.error_handler"), on_change=lambda: changes.append(1))
+    handler.error_log_path = tmp_path / "critical_errors.jsonl"
+    handler.storm_window = WINDOW
+    handler.max_bytes = 10_000
+    handler.backup_count = 2
+    handler._flusher_pid = os.getpid()  # summaries are flushed explicitly in the tests
+    handler.changes = changes
+    return handler
+
+
+def records(path):
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_message_template_replaces_variable_parts():
+    assert message_template("Row 42 of order 'A-1' failed at 0x7ffe") == "Row <n> of order '<*>' failed at <hex>"
+    assert message_template('Lock "O-9" held by 3f2a9c1d7e') == "Lock '<*>' held by <hex>"
+    assert message_template("Timeout after 2.5s, 12345678 bytes") == "Timeout after <n>s, <n> bytes"
+    assert len(message_template("x" * 1000)) == 300
+
+
+def test_repeats_are_counted_and_summarised_once_per_window(handler, clock):
+    handler.handle(ValueError("order 1 failed"), context={"order_id": 1}, severity=ErrorSeverity.HIGH)
+    assert [r["message"] for r in records(handler.error_log_path)] == ["order 1 failed"]
+    assert len(handler.changes) == 1
+
+    for order_id in range(2, 5):
+        clock.advance(1)
+        handler.handle(ValueError(f"order {order_id} failed"), context={"order_id": order_id},
+                       severity=ErrorSeverity.HIGH)
+    assert len(records(handler.error_log_path)) == 1
+    assert len(handler.changes) == 1
+    assert handler.error_aggregates()[0]["count"] == 4
+
+    # The storm is still going after a full window: one summary line for the repeats so far
+    clock.advance(WINDOW)
+    handler.handle(ValueError("order 5 failed"), context={"order_id": 5}, severity=ErrorSeverity.HIGH)
+    summary = records(handler.error_log_path)[-1]
+    assert summary["message"] == "order <n> failed"
+    assert (summary["repeated"], summary["count"]) == (4, 5)
+    assert summary["context"] == {"keys": ["order_id"]}
+    assert len(handler.changes) == 2
+
+
+def test_different_context_keys_are_separate_fingerprints(handler, clock):
+    handler.handle(ValueError("order 1 failed"), context={"order_id": 1})
+    handler.handle(ValueError("order 2 failed"), context={"row": 2})
+    assert [a["context_keys"] for a in handler.error_aggregates()] == [["row"], ["order_id"]]
+    assert len(handler.changes) == 2
+
+
+def test_flush_writes_summary_after_the_storm_ends(handler, clock):
+    for _ in range(3):
+        handler.handle(RuntimeError("quota exceeded"), severity=ErrorSeverity.CRITICAL)
+
+    handler.flush_summaries()
+    assert len(records(handler.error_log_path)) == 1
+    assert len(handler.changes) == 1
+
+    clock.advance(WINDOW + 1)
+    handler.flush_summaries()
+    summary = records(handler.error_log_path)[-1]
+    assert (summary["repeated"], summary["count"]) == (2, 3)
+    assert len(handler.changes) == 2
+
+    # Nothing left to report
+    clock.advance(WINDOW + 1)
+    handler.flush_summaries()
+    assert len(records(handler.error_log_path)) == 2
+
+
+def test_forced_flush_and_new_storm_after_window(handler, clock):
+    handler.handle(RuntimeError("quota exceeded"), severity=ErrorSeverity.HIGH)
+    handler.handle(RuntimeError("quota exceeded"), severity=ErrorSeverity.HIGH)
+    handler.flush_summaries(force=True)
+    assert records(handler.error_log_path)[-1]["repeated"] == 1
+
+    handler.handle(RuntimeError("quota exceeded"), severity=ErrorSeverity.HIGH)
+    clock.advance(WINDOW + 1)
+    # Same error after the window: final summary of the old storm, then a full record for the new one
+    handler.handle(RuntimeError("quota exceeded"), severity=ErrorSeverity.HIGH)
+    tail = records(handler.error_log_path)[-2:]
+    assert tail[0]["repeated"] == 1
+    assert "repeated" not in tail[1] and tail[1]["message"] == "quota exceeded"
+
+
+def test_aggregates_are_limited(handler, clock):
+    handler.max_aggregates = 2
+    for error_type in (KeyError, ValueError, TypeError):
+        handler.handle(error_type("boom"))
+    assert [a["type"] for a in handler.error_aggregates()] == ["TypeError", "ValueError"]
+
+
+def test_on_change_wakes_event_streams(handler, clock):
+    broadcaster = StatusBroadcaster()
+    handler.on_change = broadcaster.notify
+    version = broadcaster.version
+
+    handler.handle(ValueError("order 1 failed"))
+    assert broadcaster.wait(version, timeout=1) == version + 1
+    # Suppressed repeats do not push
+    handler.handle(ValueError("order 2 failed"))
+    assert broadcaster.version == version + 1
+
+
+def test_rotate_keeps_backup_count_files(handler):
+    handler.max_bytes = 300
+    for n in range(7):
+        handler._append_record({"n": n, "pad": "x" * 100})
+
+    path = handler.error_log_path
+    rotated = [path.with_name(f"{path.name}.{i}") for i in (1, 2, 3)]
+    assert [r["n"] for r in records(path)] == [6]
+    assert [r["n"] for r in records(rotated[0])] == [4, 5]
+    assert [r["n"] for r in records(rotated[1])] == [2, 3]
+    assert not rotated[2].exists()
+    assert all(p.stat().st_size <= handler.max_bytes for p in (path, rotated[0], rotated[1]))
+
+
+def test_rotate_without_backups_truncates(handler):
+    handler.max_bytes = 10
+    handler.backup_count = 0
+    handler.error_log_path.write_text('{"n": 0}\n', encoding="utf-8")
+
+    handler._rotate_if_needed(5)
+    assert not handler.error_log_path.exists()
+    assert list(handler.error_log_path.parent.iterdir()) == []
+
+
+def test_recent_errors_reads_across_rotation(handler):
+    handler.max_bytes = 300
+    for n in range(7):
+        handler._append_record({"n": n, "pad": "x" * 100})
+
+    assert [r["n"] for r in handler.recent_errors(3)] == [6, 5, 4]
+    assert [r["n"] for r in handler.recent_errors(1)] == [6]
+    # Only the current file and the previous rotation are read
+    assert [r["n"] for r in handler.recent_errors(10)] == [6, 5, 4]
+
+    handler._append_record({"n": 7, "pad": "x"})
+    assert [r["n"] for r in handler.recent_errors(3)] == [7, 6, 5]
+
+
+def test_tail_lines_reads_backwards_in_blocks(tmp_path):
+    path = tmp_path / "lines.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(20)) + "\n", encoding="utf-8")
+
+    assert _tail_lines(path, 3, block_size=16) == ["line 17", "line 18", "line 19"]
+    assert _tail_lines(path, 50, block_size=16) == [f"line {i}" for i in range(20)]
+    assert _tail_lines(path, 0) == []
+    assert _tail_lines(tmp_path / "missing.txt", 3) == []
@@ -0,0 +1,230 @@
+"""DistributedLockManager: 메모리 락 시트(benchmarks/fake_sheets.py)로 배치/행 이동/경합/아카이브 동작 확인"""
+
+import datetime
+import threading
+
+import pytest
+
+from benchmarks.fake_sheets import FakeSheetsSettings, FakeSpreadsheet, FakeWorksheet
+from lock_manager import DistributedLockManager, _RowMoved, _SheetsBatchClient
+from rate_limiter import sheets_limiter
+
+OLD = (datetime.datetime.now() - datetime.timedelta(days=30)).isoformat()
+NOW = datetime.datetime.now().isoformat()
+
+
+@pytest.fixture(autouse=True)
+def unthrottled(monkeypatch):
+    """메모리 시트에는 Sheets 할당량 속도 제한이 필요 없음"""
+    monkeypatch.setattr(sheets_limiter, "interval", 1e-6)
+
+
+class HookedWorksheet(FakeWorksheet):
+    """get_all_values / batch_get 호출 전에 콜백을 실행 (조회 사이에 다른 PC 가 쓰는 상황 재현)"""
+
+    def __init__(self, rows):
+        super().__init__(FakeSheetsSettings(latency_ms=0, jitter_ms=0), rows=rows)
+        self.before_read = []
+        self.before_batch_get = []
+
+    def get_all_values(self):
+        if self.before_read:
+            self.before_read.pop(0)(self)
+        return super().get_all_values()
+
+    def batch_get(self, ranges, **kwargs):
+        if self.before_batch_get:
+            self.before_batch_get.pop(0)(self)
+        return super().batch_get(ranges, **kwargs)
+
+
+def make_manager(rows, machine_id="pc-1"):
+    worksheet = HookedWorksheet(rows)
+    manager = DistributedLockManager()
+    manager.machine_id = machine_id
+    manager.lock_worksheet = worksheet
+    manager.spreadsheet = FakeSpreadsheet(worksheet.settings, worksheets=[worksheet])
+    return manager, worksheet
+
+
+def order_ids(worksheet):
+    return [row[0] for row in worksheet._rows[1:]]
+
+
+def test_archive_moves_old_finished_rows():
+    manager, worksheet = make_manager([
+        ["A", "pc-1", OLD, "completed", "pc-1", ""],
+        ["B", "pc-1", OLD, "processing", "pc-1", ""],
+        ["C", "pc-2", NOW, "completed", "pc-2", ""],
+        ["D", "pc-2", OLD, "failed", "pc-2", ""],
+    ])
+
+    assert manager.archive_old_locks(max_age_days=3) == 2
+    assert order_ids(worksheet) == ["B", "C"]
+    archive = manager.spreadsheet.worksheet(f"{manager.LOCK_SHEET_NAME}_archive_{OLD[:7].replace('-', '_')}")
+    assert [row[0] for row in archive._rows[1:]] == ["A", "D"]
+
+
+def test_archive_skips_rows_changed_before_delete():
+    manager, worksheet = make_manager([
+        ["A", "pc-1", OLD, "failed", "pc-1", ""],
+        ["B", "pc-1", OLD, "completed", "pc-1", ""],
+    ])
+
+    def reacquire_a(ws):
+        # Another machine takes the failed order again between the archive read and the delete
+        ws._rows[1][1:5] = ["pc-2", NOW, "processing", "pc-2"]
+
+    worksheet.before_read = [lambda ws: None, reacquire_a]
+    assert manager.archive_old_locks(max_age_days=3) == 1
+    assert order_ids(worksheet) == ["A"]
+    assert worksheet._rows[1][3] == "processing"
+
+
+def test_archive_removes_finished_election_rows():
+    prefix = DistributedLockManager.ARCHIVE_ELECTION_PREFIX
+    manager, worksheet = make_manager([
+        [f"{prefix}100", "pc-1", NOW, "completed", "pc-1", ""],
+        ["A", "pc-1", NOW, "completed", "pc-1", ""],
+        [f"{prefix}101", "pc-2", NOW, "processing", "pc-2", ""],
+    ])
+
+    assert manager.archive_old_locks(max_age_days=3) == 0
+    assert order_ids(worksheet) == ["A", f"{prefix}101"]
+
+
+def test_concurrent_reads_share_one_batch_get():
+    manager, worksheet = make_manager([[f"O-{i}", "pc-1", NOW, "completed", "pc-1", ""] for i in range(5)])
+    manager._client = _SheetsBatchClient(worksheet, window_sec=0.1)
+
+    futures = [manager._client.find_row(f"O-{i}") for i in range(5)] + [manager._client.read_row(3)]
+    assert [f.result() for f in futures[:5]] == [2, 3, 4, 5, 6]
+    assert futures[5].result()[0] == "O-1"
+    assert worksheet.call_stats()["calls"] == {"batch_get": 1}
+
+
+def test_guarded_update_refuses_a_moved_row():
+    manager, worksheet = make_manager([
+        ["A", "pc-1", NOW, "completed", "pc-1", ""],
+        ["B", "pc-1", OLD, "failed", "pc-1", ""],
+    ])
+
+    with pytest.raises(_RowMoved):
+        manager._sheets().update_cells(3, {4: "processing"}, "A").result()
+    assert worksheet._rows[2][3] == "failed"
+
+
+def test_acquire_looks_the_row_up_again_after_it_moved():
+    manager, worksheet = make_manager([
+        ["A", "pc-1", OLD, "completed", "pc-1", ""],
+        ["B", "pc-2", OLD, "failed", "pc-2", ""],
+    ])
+
+    def archive_a(ws):
+        # Another machine archives row 2 right before our write is verified
+        del ws._rows[1]
+
+    # 1: find, 2: read_row, 3: verify before the write
+    worksheet.before_batch_get = [lambda ws: None, lambda ws: None, archive_a]
+    assert manager.acquire_lock("B")
+    assert order_ids(worksheet) == ["B"]
+    assert worksheet._rows[1][1] == "pc-1" and worksheet._rows[1][3] == "processing"
+
+
+def test_read_error_does_not_append_a_row():
+    manager, worksheet = make_manager([["A", "pc-2", NOW, "processing", "pc-2", ""]])
+
+    def fail(ws):
+        raise ConnectionError("connection reset")
+
+    worksheet.before_batch_get = [fail]
+    assert not manager.acquire_lock("A")
+    assert order_ids(worksheet) == ["A"]
+
+
+def test_same_machine_race_has_one_winner():
+    manager, worksheet = make_manager([])
+    manager._client = _SheetsBatchClient(worksheet, window_sec=0.1)
+    barrier = threading.Barrier(2)
+    results = []
+
+    def acquire():
+        barrier.wait()
+        results.append(manager.acquire_lock("N-1"))
+
+    threads = [threading.Thread(target=acquire) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == [False, True]
+    assert order_ids(worksheet) == ["N-1", "N-1 (duplicate)"]
+    assert [row[3] for row in worksheet._rows[1:]] == ["processing", "duplicate"]
+
+
+def test_first_row_wins_across_machines(monkeypatch):
+    manager, worksheet = make_manager([])
+    other = DistributedLockManager()
+    other.machine_id = "pc-2"
+    other.lock_worksheet = worksheet
+    window = 0.1
+    manager._client = _SheetsBatchClient(worksheet, window_sec=window)
+    other._client = _SheetsBatchClient(worksheet, window_sec=window)
+
+    # Both lookups see no row, then both machines append
+    found = threading.Barrier(2)
+    original = DistributedLockManager._find_order_row
+
+    def find_then_wait(self, order_id):
+        row = original(self, order_id)
+        found.wait()
+        return row
+
+    monkeypatch.setattr(DistributedLockManager, "_find_order_row", find_then_wait)
+    results = {}
+    threads = [threading.Thread(target=lambda m=m: results.setdefault(m.machine_id, m.acquire_lock("N-2")))
+               for m in (manager, other)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results.values()) == [False, True]
+    winner = worksheet._rows[1][1]
+    assert results[winner] is True
+    assert [row[3] for row in worksheet._rows[1:]] == ["processing", "duplicate"]
+
+
+class RecordingSpreadsheet(FakeSpreadsheet):
+    def __init__(self, worksheet):
+        super().__init__(worksheet.settings, worksheets=[worksheet])
+        self.bodies = []
+
+    def batch_update(self, body: dict):
+        self.bodies.append(body)
+        return super().batch_update(body)
+
+
+def test_delete_rows_coalesces_adjacent_rows_bottom_up():
+    manager, worksheet = make_manager([[f"R{row}", "pc-1", OLD, "completed", "pc-1", ""] for row in range(2, 13)])
+    manager.spreadsheet = RecordingSpreadsheet(worksheet)
+
+    # Unsorted, with duplicates: ranges 3-5, 8, 10-11
+    assert manager.delete_rows([11, 4, 8, 3, 10, 5, 4]) == 6
+    assert order_ids(worksheet) == ["R2", "R6", "R7", "R9", "R12"]
+
+    (body,) = manager.spreadsheet.bodies
+    ranges = [(r["deleteDimension"]["range"]["startIndex"], r["deleteDimension"]["range"]["endIndex"])
+              for r in body["requests"]]
+    assert ranges == [(9, 11), (7, 8), (2, 5)]
+
+
+def test_delete_rows_single_and_empty():
+    manager, worksheet = make_manager([[f"R{row}", "pc-1", OLD, "completed", "pc-1", ""] for row in range(2, 5)])
+    manager.spreadsheet = RecordingSpreadsheet(worksheet)
+
+    assert manager.delete_rows([]) == 0
+    assert manager.spreadsheet.bodies == []
+    assert manager.delete_rows([4]) == 1
+    assert order_ids(worksheet) == ["R2", "R3"]
@@ -0,0 +1,90 @@
+"""PollingScheduler: 영업시간/학습된 유입률/빈 사이클 수에 따른 다음 폴링 주기와 시작 시 학습 데이터 확인"""
+
+import datetime
+import os
+
+import pytest
+
+from config import config
+from pending_index import PendingIndex
+from polling_scheduler import PollingScheduler
+
+MONDAY = datetime.datetime(2026, 10, 19)
+SATURDAY = MONDAY + datetime.timedelta(days=5)
+
+
+@pytest.fixture(autouse=True)
+def business_hours(monkeypatch):
+    monkeypatch.setattr(config, "BUSINESS_DAYS", [0, 1, 2, 3, 4])
+    monkeypatch.setattr(config, "BUSINESS_HOUR_START", 8)
+    monkeypatch.setattr(config, "BUSINESS_HOUR_END", 19)
+
+
+def make_scheduler():
+    return PollingScheduler(base_interval=600, min_interval=60, max_interval=7200)
+
+
+def test_business_hours_use_base_interval_and_relax_when_empty():
+    scheduler = make_scheduler()
+    now = MONDAY.replace(hour=10)
+
+    assert scheduler.next_interval(now=now) == 600
+    assert scheduler.next_interval(empty_cycles=4, now=now) == 600
+    assert scheduler.next_interval(empty_cycles=5, now=now) == 1200
+
+
+def test_arrival_rate_shortens_interval_down_to_min():
+    scheduler = make_scheduler()
+    now = MONDAY.replace(hour=10, minute=30)
+
+    scheduler.seed([MONDAY.replace(hour=10)] * 4)
+    assert scheduler.arrival_rate(now) == 4
+    assert scheduler.next_interval(now=now) == 120  # 600 / (1 + 4)
+
+    scheduler.record_arrivals(20, when=MONDAY.replace(hour=10, minute=5))
+    assert scheduler.next_interval(now=now) == 60
+
+
+def test_learned_slot_outside_business_hours_is_active():
+    scheduler = make_scheduler()
+    now = SATURDAY.replace(hour=10, minute=15)
+
+    assert not scheduler.is_active(now)
+    scheduler.seed([SATURDAY.replace(hour=10)])
+    assert scheduler.is_active(now)
+    assert scheduler.next_interval(empty_cycles=3, now=now) == 300  # 600 / (1 + 1)
+
+
+def test_inactive_backoff_doubles_up_to_max():
+    scheduler = make_scheduler()
+    now = SATURDAY.replace(hour=3)
+
+    assert scheduler.next_interval(empty_cycles=0, now=now) == 600
+    assert scheduler.next_interval(empty_cycles=3, now=now) == 4800
+    assert scheduler.next_interval(empty_cycles=10, now=now) == 7200
+
+
+def test_inactive_backoff_wakes_up_for_business_hours():
+    scheduler = make_scheduler()
+    now = MONDAY.replace(hour=7, minute=30)
+
+    assert scheduler.seconds_until_active(now) == 1800
+    assert scheduler.next_interval(empty_cycles=10, now=now) == 1800
+
+
+def test_pending_downloads_seed_the_scheduler(tmp_path):
+    downloaded_at = MONDAY.replace(hour=9)
+    for doc_type, key in (("ledger", "L-1"), ("ledger", "L-2"), ("estimate", "E-1")):
+        path = tmp_path / doc_type / f"{key}.html"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text("<html></html>", encoding="utf-8")
+        os.utime(path, (downloaded_at.timestamp(), downloaded_at.timestamp()))
+
+    # L-2 is uploaded but not archived yet, so it still counts as a download
+    index = PendingIndex(history_loader=lambda: {"ledger": ["L-2"]}, downloads_dir=tmp_path)
+    timestamps = index.downloaded_timestamps()
+    assert timestamps == [downloaded_at] * 3
+
+    scheduler = make_scheduler()
+    scheduler.seed(timestamps)
+    assert scheduler.arrival_rate(downloaded_at) == 3
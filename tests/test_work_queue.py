@@ -0,0 +1,57 @@
+"""WorkQueue: dead-letter 작업은 내용이 바뀌었을 때나 requeue() 로만 다시 대기 상태가 되는지 확인"""
+
+from work_queue import WorkQueue, JobError, STATUS_DEAD
+
+
+def make_queue(tmp_path):
+    return WorkQueue(db_path=tmp_path / "queue.db", max_retries=3, retry_delay=0.01)
+
+
+def fail_permanently(job):
+    raise JobError("No download button", retry=False)
+
+
+def make_dead(queue, payload):
+    queue.enqueue("download", "ledger", "A-1", payload)
+    queue.run_due("download", fail_permanently)
+    assert queue.counts()[STATUS_DEAD] == 1
+
+
+def test_enqueue_ignores_queued_duplicate(tmp_path):
+    queue = make_queue(tmp_path)
+    assert queue.enqueue("download", "ledger", "A-1", {"n": 1})
+    assert not queue.enqueue("download", "ledger", "A-1", {"n": 2})
+    assert queue.counts()["queued"] == 1
+
+
+def test_dead_job_stays_dead_when_it_reappears_unchanged(tmp_path):
+    queue = make_queue(tmp_path)
+    make_dead(queue, {"button_id": ""})
+
+    # Every later list scan sees the same broken row
+    assert not queue.enqueue("download", "ledger", "A-1", {"button_id": ""})
+    assert queue.counts() == {"queued": 0, "running": 0, "dead": 1}
+    assert queue.dead_letters()[0]["attempts"] == 1
+
+
+def test_dead_job_is_revived_when_its_payload_changes(tmp_path):
+    queue = make_queue(tmp_path)
+    make_dead(queue, {"button_id": ""})
+
+    # The download button shows up on a later cycle
+    assert queue.enqueue("download", "ledger", "A-1", {"button_id": "b1"})
+    assert queue.counts() == {"queued": 1, "running": 0, "dead": 0}
+
+    seen = []
+    assert queue.run_due("download", lambda job: seen.append(job)) == 1
+    assert seen[0]["payload"] == {"button_id": "b1"}
+    assert seen[0]["attempts"] == 1
+    assert queue.counts() == {"queued": 0, "running": 0, "dead": 0}
+
+
+def test_requeue_revives_dead_job(tmp_path):
+    queue = make_queue(tmp_path)
+    make_dead(queue, {"button_id": ""})
+
+    assert queue.requeue(queue.dead_letters()[0]["id"])
+    assert queue.counts() == {"queued": 1, "running": 0, "dead": 0}
@@ -1,16 +1,22 @@
-import os
 import time
+_import_start = time.perf_counter()
+
+import os
 import json
+import hashlib
 import threading
-import sys
 import datetime
+import socket
+import argparse
 import subprocess
-from flask import Flask, jsonify, request, render_template_string
+import urllib.request
+from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.edge.options import Options as EdgeOptions
-from selenium.webdriver.common.by import By
-import traceback
+_flask_start = time.perf_counter()
+from flask import Flask, Response, jsonify, request, render_template_string, stream_with_context
+_flask_sec = time.perf_counter() - _flask_start
 
 # Import foundation modules
 from config import config
@@ -19,28 +25,72 @@ from error_handler import error_handler, ErrorSeverity
 
 # V10: Import distributed lock manager
 from lock_manager import DistributedLockManager
+from document_archive import document_archive
+from pending_index import PendingIndex
+from polling_scheduler import PollingScheduler
+from work_queue import WorkQueue, JobError
+from engine_ipc import LocalEngine, EngineServer, EngineClient, EngineProcess, EngineUnavailable
+from workers import Supervisor
+from job_registry import JobRegistry, report_progress, set_progress_total
+from status_events import StatusDict, status_events, diff_payload
+from instrumentation import span
+import metrics
+
+# Startup phase durations (seconds), shown on /api/stats
+startup_timings = {
+    "import_flask": round(_flask_sec, 3),
+    "import_modules": round(time.perf_counter() - _import_start - _flask_sec, 3)
+}
+# Set once the background startup (lock connect, archive sweep) has finished
+startup_complete = threading.Event()
 
-# Import existing logic
-try:
+@contextmanager
+def startup_phase(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_timings[name] = round(time.perf_counter() - start, 3)
+        logger.info(f"[Startup] {name}: {startup_timings[name] * 1000:.0f}ms")
+
+def upload_modules():
+    """
+    Import the parser and ERP automation on first use (bs4/pyperclip/playwright are slow to import)
+
+    Returns:
+        (local_file_processor module, ErpUploadAutomation class)
+    """
     import local_file_processor
     from erp_upload_automation_v2 import ErpUploadAutomation
-except ImportError as e:
-    logger.critical(f"Error importing modules: {e}")
-    sys.exit(1)
+    return local_file_processor, ErpUploadAutomation
+
+def parse_document(html_content, file_path_hint, target_type):
+    """Parser stage: detail page HTML -> ERP rows"""
+    local_file_processor, _ = upload_modules()
+    return local_file_processor.process_html_content(html_content, file_path_hint=file_path_hint, target_type=target_type)
+
+def upload_to_erp(erp_data, target_type):
+    """Uploader stage: paste ERP rows into Ecount; returns True on success"""
+    _, ErpUploadAutomation = upload_modules()
+    automation = ErpUploadAutomation()
+    success = automation.run(direct_data=erp_data, auto_close=True, target_type=target_type)
+    automation.close(keep_browser_open=True)
+    return success
 
 # Server setup
 app = Flask(__name__)
 lock = threading.Lock()
-ledger_lock = threading.Lock()
-estimate_lock = threading.Lock()
+# Manual triggers run as tracked jobs (one active job per upload type / downloader)
+job_registry = JobRegistry()
 
 # V10: Initialize distributed lock manager
 distributed_lock = DistributedLockManager()
 
-# Status tracking
-server_status = {
+# Status tracking (every change wakes up the dashboard event streams)
+server_status = StatusDict({
     "downloader_active": False,
     "downloader_last_run": None,
+    "downloader_next_run": None,
     "downloader_status": "Idle",
     "ledger_uploader_status": "Idle",
     "estimate_uploader_status": "Idle",
@@ -49,8 +99,9 @@ server_status = {
     "empty_cycle_count": 0,
     "start_time": datetime.datetime.now().isoformat(),
     "lock_manager_connected": False,  # V10
-    "machine_id": ""  # V10
-}
+    "machine_id": "",  # V10
+    "lock_archive_last_run": None
+}, on_change=status_events.notify)
 
 # HTML Template for V10 UI
 HTML_TEMPLATE = """
@@ -82,20 +133,45 @@ HTML_TEMPLATE = """
         .footer { text-align: center; margin-top: 40px; color: #444; font-size: 0.8em; }
         .pulse { animation: pulse-animation 2s infinite; }
         @keyframes pulse-animation { 0% { opacity: 1; } 50% { opacity: 0.5; } 100% { opacity: 1; } }
+        .dead-row { display: flex; justify-content: space-between; gap: 10px; color: #f5576c; }
+        .btn-retry { background: #0d1117; color: #38ef7d; border: 1px solid #38ef7d; border-radius: 6px; cursor: pointer; }
         .v10-badge { background: linear-gradient(135deg, #11998e, #38ef7d); padding: 5px 12px; border-radius: 15px; font-size: 0.7em; color: white; font-weight: bold; }
     </style>
     <script>
+        // Latest stats; the event stream only sends the sections/keys that changed
+        const stats = { status: {}, pending: {}, history_count: {}, queue: {}, dead_letters: [],
+                        recent_errors: [], error_aggregates: [] };
+
+        function applyStats(delta) {
+            if (delta.status) Object.assign(stats.status, delta.status);
+            if (delta.pending) stats.pending = delta.pending;
+            if (delta.history_count) stats.history_count = delta.history_count;
+            if (delta.queue) stats.queue = delta.queue;
+            if (delta.dead_letters) stats.dead_letters = delta.dead_letters;
+            if (delta.startup) stats.startup = delta.startup;
+            if (delta.recent_errors) stats.recent_errors = delta.recent_errors;
+            if (delta.error_aggregates) stats.error_aggregates = delta.error_aggregates;
+            renderStats(stats);
+        }
+
         async function updateStats() {
             try {
                 const res = await fetch('/api/stats');
-                const data = await res.json();
+                applyStats(await res.json());
+            } catch (e) { console.error("Stats update failed", e); }
+        }
 
+        function renderStats(data) {
+            try {
                 // Update Lock Manager Status
                 const lockStatus = document.getElementById('lock-status');
                 const lockMachine = document.getElementById('lock-machine');
                 if (data.status.lock_manager_connected) {
                     lockStatus.innerText = '✅ Connected';
                     lockStatus.style.color = '#38ef7d';
+                } else if (data.startup && !data.startup.complete) {
+                    lockStatus.innerText = '⏳ Connecting...';
+                    lockStatus.style.color = '#f2c94c';
                 } else {
                     lockStatus.innerText = '❌ Disconnected';
                     lockStatus.style.color = '#f5576c';
@@ -105,6 +181,7 @@ HTML_TEMPLATE = """
                 // Update Downloader
                 document.getElementById('dl-status').innerText = data.status.downloader_status;
                 document.getElementById('dl-last').innerText = data.status.downloader_last_run || 'None';
+                document.getElementById('dl-next').innerText = data.status.downloader_next_run || '-';
 
                 // Update Ledger
                 document.getElementById('l-pending').innerText = data.pending.ledger;
@@ -143,7 +220,46 @@ HTML_TEMPLATE = """
                         eBtn.classList.remove('btn-orange');
                     }
                 }
-            } catch (e) { console.error("Stats update failed", e); }
+
+                // Update Retry Queue / Dead Letters
+                document.getElementById('q-queued').innerText = data.queue.queued || 0;
+                document.getElementById('q-running').innerText = data.queue.running || 0;
+                document.getElementById('dead-count').innerText = data.dead_letters.length;
+                renderDeadLetters(data.dead_letters);
+                renderRecentErrors(data.recent_errors);
+            } catch (e) { console.error("Stats render failed", e); }
+        }
+
+        function renderDeadLetters(jobs) {
+            const list = document.getElementById('dead-list');
+            list.replaceChildren();
+            if (!jobs.length) { list.innerText = 'No failed jobs'; return; }
+            jobs.forEach(job => {
+                const row = document.createElement('div');
+                row.className = 'dead-row';
+                const text = document.createElement('span');
+                text.innerText = `[${job.kind}/${job.doc_type}] ${job.key} (${job.attempts}x) ${job.last_error || ''}`;
+                const btn = document.createElement('button');
+                btn.className = 'btn-retry';
+                btn.innerText = 'Retry';
+                btn.onclick = () => triggerAction(`/api/dead_letters/${job.id}/retry`, btn);
+                row.append(text, btn);
+                list.appendChild(row);
+            });
+        }
+
+        function renderRecentErrors(errors) {
+            const list = document.getElementById('error-list');
+            document.getElementById('error-count').innerText = errors.length;
+            list.replaceChildren();
+            if (!errors.length) { list.innerText = 'No critical errors'; return; }
+            errors.forEach(err => {
+                const row = document.createElement('div');
+                row.className = 'dead-row';
+                const repeated = err.repeated ? ` (repeated ${err.repeated}x)` : '';
+                row.innerText = `${err.timestamp.replace('T', ' ').slice(0, 19)} [${err.severity}] ${err.type}: ${err.message}${repeated}`;
+                list.appendChild(row);
+            });
         }
 
         function triggerAction(endpoint, btn) {
@@ -152,7 +268,7 @@ HTML_TEMPLATE = """
                 .then(r => r.json())
                 .then(d => { 
                     if (d.status === 'success') {
-                        setTimeout(updateStats, 500);
+                        if (!window.EventSource) setTimeout(updateStats, 500);
                     } else {
                         alert("Error: " + d.message);
                         btn.disabled = false;
@@ -161,8 +277,18 @@ HTML_TEMPLATE = """
                 .catch(e => { alert(e); btn.disabled = false; });
         }
 
-        setInterval(updateStats, 3000);
-        window.onload = updateStats;
+        function subscribeStats() {
+            const source = new EventSource('/api/events');
+            source.addEventListener('stats', e => applyStats(JSON.parse(e.data)));
+            // Server at its stream limit - show a one-off snapshot until the reconnect gets a slot
+            source.addEventListener('busy', () => updateStats());
+            // EventSource reconnects by itself; the first message after a reconnect is a full payload
+        }
+
+        window.onload = () => {
+            if (window.EventSource) subscribeStats();
+            else { updateStats(); setInterval(updateStats, 3000); }
+        };
     </script>
 </head>
 <body>
@@ -188,6 +314,7 @@ HTML_TEMPLATE = """
             <div class="status-box">
                 <div><span class="label">Status:</span><span class="val" id="dl-status">Loading...</span></div>
                 <div><span class="label">Last Run:</span><span class="val" id="dl-last">-</span></div>
+                <div><span class="label">Next Run:</span><span class="val" id="dl-next">-</span></div>
             </div>
             <div style="display: flex; gap: 10px;">
                 <button class="btn btn-blue" onclick="triggerAction('/trigger_download', this)">📩 Manual Download</button>
@@ -213,6 +340,23 @@ HTML_TEMPLATE = """
             <button id="btn-e" class="btn btn-orange" onclick="triggerAction('/trigger_estimate', this)" disabled>⬆ Upload Estimate</button>
         </div>
 
+        <div class="card">
+            <h2>🔁 Retry Queue <span class="badge badge-warning" id="dead-count">0</span></h2>
+            <div class="status-box">
+                <div><span class="label">Queued:</span><span class="val" id="q-queued">0</span>
+                     <span class="label">Running:</span><span class="val" id="q-running">0</span></div>
+                <div><span class="label">Dead Letters:</span></div>
+                <div id="dead-list">No failed jobs</div>
+            </div>
+        </div>
+
+        <div class="card">
+            <h2>⚠️ Recent Errors <span class="badge badge-warning" id="error-count">0</span></h2>
+            <div class="status-box">
+                <div id="error-list">No critical errors</div>
+            </div>
+        </div>
+
         <div class="card">
             <h2>⚙️ Server Control</h2>
             <button class="btn btn-gray" onclick="triggerAction('/reset_status', this)">🔄 Reset Server Status</button>
@@ -248,7 +392,6 @@ class DoorBrowser:
         logger.info("[Browser] Make sure Edge is running with: start_edge_debug.ps1")
 
         # 포트가 열려있는지 간단히 체크
-        import socket
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         result = sock.connect_ex(('127.0.0.1', debug_port))
         sock.close()
@@ -262,6 +405,8 @@ class DoorBrowser:
         time.sleep(2)
 
         # EdgeDriver로 Edge에 연결 (Selenium 자동 관리)
+        from selenium import webdriver
+        from selenium.webdriver.edge.options import Options as EdgeOptions
         edge_options = EdgeOptions()
         edge_options.add_experimental_option("debuggerAddress", f"127.0.0.1:{debug_port}")
 
@@ -279,17 +424,57 @@ class DoorBrowser:
     def get_source(self):
         return self.driver.page_source
 
+    def session_headers(self):
+        """HTTP 요청용 브라우저 세션 헤더 (쿠키 + User-Agent)"""
+        cookies = "; ".join(f"{c['name']}={c['value']}" for c in self.driver.get_cookies())
+        user_agent = self.driver.execute_script("return navigator.userAgent")
+        return {"Cookie": cookies, "User-Agent": user_agent}
+
     def navigate(self, url):
         self.driver.get(url)
 
+class RemoteBrowser:
+    """DoorBrowser stand-in that runs every browser call in the downloader worker process"""
+    def __init__(self, supervisor):
+        self._supervisor = supervisor
+
+    def __getattr__(self, name):
+        return lambda *args: self._supervisor.call("downloader", "browser", name, *args)
+
 browser_manager = DoorBrowser()
 
-def load_history():
-    """Load history with ledger/estimate separation"""
+# Worker processes (see workers.py) - the factories run inside the worker process
+def downloader_worker_operations():
+    browser = DoorBrowser()
+    return {"browser": lambda method, *args: getattr(browser, method)(*args)}
+
+def parser_worker_operations():
+    return {"parse": parse_document}
+
+def uploader_worker_operations():
+    return {"upload": upload_to_erp}
+
+STAGE_OPERATIONS = {
+    "parser": {"parse": parse_document},
+    "uploader": {"upload": upload_to_erp},
+}
+
+# Set by start_engine() when worker processes are enabled
+supervisor = None
+
+def run_stage(worker, method, *args):
+    """Run a pipeline stage in its worker process (when enabled) or in-process"""
+    if supervisor:
+        return supervisor.call(worker, method, *args)
+    return STAGE_OPERATIONS[worker][method](*args)
+
+def load_history(path=None):
+    """Load upload history (or the given history file) with ledger/estimate separation"""
+    path = path or config.HISTORY_FILE
     default_history = {"ledger": [], "estimate": []}
-    if os.path.exists(config.HISTORY_FILE):
+    if os.path.exists(path):
         try:
-            with open(config.HISTORY_FILE, 'r', encoding='utf-8') as f:
+            with open(path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 # Handle legacy format (list)
                 if isinstance(data, list):
@@ -299,10 +484,106 @@ def load_history():
             return default_history
     return default_history
 
-def save_history(history_dict):
-    with open(config.HISTORY_FILE, 'w', encoding='utf-8') as f:
+def save_history(history_dict, path=None):
+    with open(path or config.HISTORY_FILE, 'w', encoding='utf-8') as f:
         json.dump(history_dict, f, ensure_ascii=False, indent=2)
 
+# Downloaded documents are tracked separately - only a successful upload
+# puts a document into the upload history (which is what archives it)
+def load_download_history():
+    return load_history(config.DOWNLOAD_HISTORY_FILE)
+
+def save_download_history(history_dict):
+    save_history(history_dict, config.DOWNLOAD_HISTORY_FILE)
+
+# Pending/history counts maintained incrementally (no directory globbing per request)
+pending_index = PendingIndex(history_loader=load_history, on_change=status_events.notify)
+polling_scheduler = PollingScheduler()
+work_queue = WorkQueue(on_change=status_events.notify)
+error_handler.on_change = status_events.notify
+
+def archive_processed_documents():
+    """Move documents already recorded in the upload history out of the pending directories"""
+    for doc_type in ("ledger", "estimate"):
+        for path in pending_index.processed_files(doc_type):
+            try:
+                document_archive.archive_file(doc_type, path)
+                pending_index.remove_document(doc_type, path.stem)
+            except Exception as e:
+                logger.warning(f"[Archive] Failed to archive {path.name}: {e}")
+
+def list_page_fingerprint(html_source):
+    """목록 페이지 변경 감지용 지문 - 파싱 없이 <tbody> 구간만 공백 정규화 후 해시"""
+    start = html_source.find("<tbody")
+    end = html_source.rfind("</tbody>")
+    body = html_source[start:end] if start != -1 and end > start else html_source
+    return hashlib.sha1(" ".join(body.split()).encode("utf-8")).hexdigest()
+
+
+def fetch_list_page(url, headers):
+    """목록 페이지 HTTP 조회 (브라우저 세션 쿠키 사용 - 스레드에서 동시 호출 가능)"""
+    req = urllib.request.Request(url, headers=headers)
+    with urllib.request.urlopen(req, timeout=30) as res:
+        charset = res.headers.get_content_charset() or "utf-8"
+        return res.read().decode(charset, errors="replace")
+
+
+def parse_list_candidates(html_source, doc_type, list_url):
+    """
+    목록 페이지에서 다운로드 대상 주문 추출
+
+    Returns:
+        [{"order_no", "doc_type", "list_url", "younglim_gubun", "button_type", "button_id", "error"}]
+        버튼/속성이 없는 행은 error 에 사유를 담아 반환 (락 확인 후 실패 처리)
+    """
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html_source, 'html.parser')
+
+    rows = soup.select("table tbody tr")
+    logger.info(f"[Downloader] Found {len(rows)} rows in table ({doc_type})")
+
+    # URL에서 younglim_gubun 파라미터 추출
+    younglim_gubun = parse_qs(urlparse(list_url).query).get('younglim_gubun', [''])[0]
+
+    candidates = []
+    for row in rows:
+        cols = row.find_all("td")
+        if len(cols) < 3:
+            continue
+
+        order_no = cols[0].get_text(strip=True)
+        if not order_no:
+            continue
+
+        candidate = {"order_no": order_no, "doc_type": doc_type, "list_url": list_url,
+                     "younglim_gubun": younglim_gubun, "button_type": None, "button_id": "", "error": None}
+        candidates.append(candidate)
+
+        # 버튼 찾기: trans_link (ledger) 또는 estimate_link (estimate) - 버튼은 마지막 컬럼에 있음
+        button_col = cols[-1]
+        button = button_col.find("button", class_="trans_link")
+        button_type, button_attr = "ledger", "chulhano"
+        if not button:
+            button = button_col.find("button", class_="estimate_link")
+            button_type, button_attr = "estimate", "ordno"
+
+        if not button:
+            logger.warning(f"[DEBUG] Button column HTML for {order_no}: {button_col}")
+            candidate["error"] = "No download button"
+            continue
+
+        # 버튼 속성에서 번호 가져오기 (chulhano for ledger, ordno for estimate)
+        button_id = button.get(button_attr, "")
+        if not button_id:
+            candidate["error"] = f"No {button_attr}"
+            continue
+
+        candidate["button_type"] = button_type
+        candidate["button_id"] = button_id
+
+    return candidates
+
+
 class AutoDownloader(threading.Thread):
     """Background thread to download files from both ledger and estimate pages"""
     def __init__(self):
@@ -310,24 +591,33 @@ class AutoDownloader(threading.Thread):
         self.running = True
         self.active_mode = False
         self.daemon = True
+        # list_url -> (fingerprint, recorded_at) of the last fully processed list page
+        self.page_fingerprints = {}
 
     def activate(self):
         self.active_mode = True
 
     def run(self):
         logger.info("[Downloader] Thread Initiated. Waiting for start command...")
+        # Locks are only usable once the background startup has tried to connect
+        startup_complete.wait()
         while self.running:
             if self.active_mode:
-                try:
-                    self.download_cycle()
-                except Exception as e:
-                    error_handler.handle(e, context={"thread": "Downloader"}, severity=ErrorSeverity.HIGH)
-
-                # Intelligent Wait based on empty cycles
-                wait_sec = config.DOWNLOAD_INTERVAL_SEC
-                if server_status["empty_cycle_count"] >= 5:
-                    wait_sec = min(wait_sec * 2, 7200) # Max 2 hours
-                    logger.info(f"[Downloader] Consecutive empty cycles detected ({server_status['empty_cycle_count']}). Extending wait to {wait_sec//60} min.")
+                # Same job key as the manual triggers, so only one cycle drives the WebDriver at a time;
+                # if a manual download is already running, wait for it instead of starting another
+                job, created = job_registry.submit("download", self.scheduled_cycle)
+                if not created:
+                    logger.info(f"[Downloader] Download job {job.id} already running - skipping scheduled cycle")
+                while not job.wait(timeout=5):
+                    if not self.running:
+                        break
+
+                # Adaptive wait based on learned arrival rate, business hours and empty cycles
+                wait_sec = polling_scheduler.next_interval(empty_cycles=server_status["empty_cycle_count"])
+                next_run = datetime.datetime.now() + datetime.timedelta(seconds=wait_sec)
+                server_status["downloader_next_run"] = next_run.strftime("%Y-%m-%d %H:%M:%S")
+                logger.info(f"[Downloader] Next cycle in {wait_sec // 60} min "
+                            f"(empty cycles: {server_status['empty_cycle_count']})")
 
                 # Wait loop with termination check
                 for _ in range(max(1, wait_sec // 5)):
@@ -336,471 +626,652 @@ class AutoDownloader(threading.Thread):
             else:
                 time.sleep(2)
 
+    def scheduled_cycle(self):
+        """Download job body for the scheduled cycle"""
+        try:
+            self.download_cycle()
+        except Exception as e:
+            error_handler.handle(e, context={"thread": "Downloader"}, severity=ErrorSeverity.HIGH)
+            raise
+
     def download_cycle(self, force_mode=False):
         server_status["downloader_status"] = "Running"
         server_status["downloader_last_run"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        try:
-            logger.info(f"[Downloader] Starting cycle (Force Mode: {force_mode})...")
-
-            # 1. Launch/Check Browser
-            browser_manager.launch()
-
-            logger.info(f"[Downloader] Navigating to {config.YOUNGRIM_URL} to ensure session...")
-            browser_manager.navigate(config.YOUNGRIM_URL)
-            time.sleep(3)
-
-            # 2. Download from Ledger Lists (multiple pages: 산업/임업)
-            logger.info("[Downloader] Processing Ledger Lists...")
-            l_new = 0
-            for idx, ledger_url in enumerate(config.YOUNGRIM_LEDGER_URLS, 1):
-                logger.info(f"[Downloader] Processing Ledger page {idx}/{len(config.YOUNGRIM_LEDGER_URLS)}")
-                l_new += self.download_from_page(ledger_url, config.DOWNLOADS_DIR / "ledger", "ledger", force_mode=force_mode)
-
-            # 3. Download from Estimate Lists (multiple pages: 산업/임업)
-            logger.info("[Downloader] Processing Estimate Lists...")
-            e_new = 0
-            for idx, estimate_url in enumerate(config.YOUNGRIM_ESTIMATE_URLS, 1):
-                logger.info(f"[Downloader] Processing Estimate page {idx}/{len(config.YOUNGRIM_ESTIMATE_URLS)}")
-                e_new += self.download_from_page(estimate_url, config.DOWNLOADS_DIR / "estimate", "estimate", force_mode=force_mode)
-
-            if l_new == 0 and e_new == 0:
-                server_status["empty_cycle_count"] += 1
-                logger.info("[Downloader] No new files downloaded this cycle.")
-            else:
-                server_status["empty_cycle_count"] = 0
-                logger.info(f"[Downloader] Downloaded {l_new} ledger + {e_new} estimate files.")
-        
-        except Exception as e:
-            logger.error(f"[Downloader] Cycle failed: {e}")
-            raise e
-        finally:
-            server_status["downloader_status"] = "Idle"
-            logger.info("[Downloader] Cycle complete. Waiting for next interval.")
+        with span("download_cycle", force_mode=force_mode) as timing:
+            try:
+                logger.info(f"[Downloader] Starting cycle (Force Mode: {force_mode})...")
 
-    def download_from_page(self, list_url, save_dir, doc_type, force_mode=False):
-        """
-        V10: Enhanced with distributed lock checking and Force Mode
+                # 1. Launch/Check Browser
+                browser_manager.launch()
 
-        Args:
-            list_url: URL of the list page
-            save_dir: Directory to save downloads
-            doc_type: 'ledger' or 'estimate'
-            force_mode: If True, bypass history and lock checks
-        """
-        logger.info(f"[Downloader] Fetching page: {list_url}")
-        browser_manager.navigate(list_url)
-        time.sleep(2)
-
-        html_source = browser_manager.get_source()
+                logger.info(f"[Downloader] Navigating to {config.YOUNGRIM_URL} to ensure session...")
+                browser_manager.navigate(config.YOUNGRIM_URL)
+                time.sleep(3)
 
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html_source, 'html.parser')
+                # 2. Scan all list pages (ledger/estimate x 산업/임업) concurrently
+                candidates, scanned_pages = self.scan_list_pages(force_mode=force_mode)
 
-        rows = soup.select("table tbody tr")
-        logger.info(f"[Downloader] Found {len(rows)} rows in table")
+                # 3. Queue candidates, then download detail pages sequentially (single browser session).
+                #    Failed orders stay in the durable queue and are retried with backoff,
+                #    so unchanged list pages do not need to be parsed again to pick them up.
+                for candidate in candidates:
+                    work_queue.enqueue("download", candidate["doc_type"], candidate["order_no"], candidate)
+                for list_url, fingerprint in scanned_pages:
+                    self.page_fingerprints[list_url] = (fingerprint, time.time())
 
-        history = load_history()
-        downloaded_count = 0
+                history = load_download_history()
+                new_counts = {"ledger": 0, "estimate": 0}
 
-        for row in rows:
-            cols = row.find_all("td")
-            if len(cols) < 3:
-                continue
+                def handle_download(job):
+                    try:
+                        outcome = self.download_document(job["payload"], history, force_mode=force_mode)
+                    except Exception as e:
+                        report_progress(job["key"], "failed", str(e))
+                        raise
+                    report_progress(job["key"], outcome)
+                    if outcome == "downloaded":
+                        new_counts[job["doc_type"]] += 1
+
+                set_progress_total(len(candidates))
+                work_queue.run_due("download", handle_download)
+
+                l_new, e_new = new_counts["ledger"], new_counts["estimate"]
+                timing["downloaded"] = l_new + e_new
+                polling_scheduler.record_arrivals(l_new + e_new)
+                if l_new == 0 and e_new == 0:
+                    server_status["empty_cycle_count"] += 1
+                    logger.info("[Downloader] No new files downloaded this cycle.")
+                else:
+                    server_status["empty_cycle_count"] = 0
+                    logger.info(f"[Downloader] Downloaded {l_new} ledger + {e_new} estimate files.")
+
+                # Background lock releases must reach the sheet before the cycle ends
+                if not distributed_lock.wait_for_releases(timeout=60):
+                    logger.warning("[Downloader] Some lock releases are still in flight")
+
+                # Archive uploaded documents left behind by an interrupted upload
+                # (documents downloaded this cycle are not in the upload history yet)
+                archive_processed_documents()
+        
+            except Exception as e:
+                logger.error(f"[Downloader] Cycle failed: {e}")
+                raise e
+            finally:
+                server_status["downloader_status"] = "Idle"
+                logger.info("[Downloader] Cycle complete. Waiting for next interval.")
 
-            order_no = cols[0].get_text(strip=True)
+    def scan_list_pages(self, force_mode=False):
+        """
+        Fetch all list pages concurrently and merge their rows into one work list
 
-            if not order_no or order_no == "":
+        Returns:
+            (candidates, scanned_pages)
+            candidates: deduplicated list of order dicts (ledger pages first, page order kept)
+            scanned_pages: [(list_url, fingerprint)] of pages that were parsed this cycle
+        """
+        pages = ([("ledger", url) for url in config.YOUNGRIM_LEDGER_URLS] +
+                 [("estimate", url) for url in config.YOUNGRIM_ESTIMATE_URLS])
+        sources = {}
+
+        with span("list_scan", pages=len(pages)) as timing:
+            # List pages are fetched over HTTP with the browser's session cookies
+            # (WebDriver itself is not thread-safe)
+            headers = browser_manager.session_headers()
+            with ThreadPoolExecutor(max_workers=len(pages)) as pool:
+                futures = {url: pool.submit(fetch_list_page, url, headers) for _, url in pages}
+                for url, future in futures.items():
+                    try:
+                        html_source = future.result()
+                    except Exception as e:
+                        logger.warning(f"[Downloader] HTTP fetch failed for {url}: {e}")
+                        continue
+                    if "<tbody" in html_source:
+                        sources[url] = html_source
+                    else:
+                        logger.warning(f"[Downloader] No list table in HTTP response for {url} (session expired?)")
+
+            # Fall back to the browser for pages the HTTP fetch could not read
+            fallbacks = [url for _, url in pages if url not in sources]
+            for url in fallbacks:
+                logger.info(f"[Downloader] Fetching page in browser: {url}")
+                browser_manager.navigate(url)
+                time.sleep(2)
+                sources[url] = browser_manager.get_source()
+            timing["browser_fallbacks"] = len(fallbacks)
+
+        candidates = []
+        scanned_pages = []
+        seen = set()
+        for doc_type, url in pages:
+            html_source = sources[url]
+
+            # Skip parsing when the list is identical to the last fully processed one
+            fingerprint = list_page_fingerprint(html_source)
+            previous = self.page_fingerprints.get(url)
+            if (not force_mode and previous and previous[0] == fingerprint
+                    and time.time() - previous[1] < config.LIST_FINGERPRINT_TTL_SEC):
+                logger.info(f"[Downloader] List page unchanged since last cycle - skipping parse: {url}")
                 continue
 
-            # V10: Check distributed lock BEFORE checking local history
-            # SKIP if lock exists and NOT in force mode
-            if not force_mode:
-                if not distributed_lock.acquire_lock(order_no, notes=f"Download attempt from {doc_type}"):
-                    logger.info(f"[V10] Order {order_no} is locked by another machine or already completed - skipping")
-                    continue
-
-                # Check local history (backward compatibility)
-                if order_no in history.get(doc_type, []):
-                    logger.info(f"[Downloader] {order_no} already in local history - skipping")
-                    # Release lock since we're skipping
-                    distributed_lock.release_lock(order_no, status=DistributedLockManager.STATUS_COMPLETED,
-                                                notes="Already in local history")
+            scanned_pages.append((url, fingerprint))
+            for candidate in parse_list_candidates(html_source, doc_type, url):
+                key = (doc_type, candidate["order_no"])
+                if key in seen:
                     continue
-            else:
-                logger.info(f"[Downloader] FORCE MODE: Bypassing checks for {order_no}")
+                seen.add(key)
+                candidates.append(candidate)
 
-            try:
-                # Find download button (버튼은 마지막 컬럼에 있음)
-                button_col = cols[-1] if len(cols) > 0 else None
-                if not button_col:
-                    logger.warning(f"[Downloader] No button column for {order_no}")
-                    distributed_lock.release_lock(order_no, status=DistributedLockManager.STATUS_FAILED,
-                                                notes="No button column")
-                    continue
+        logger.info(f"[Downloader] {len(candidates)} candidate orders from {len(scanned_pages)}/{len(pages)} list pages")
+        return candidates, scanned_pages
 
-                # 버튼 찾기: trans_link (ledger) 또는 estimate_link (estimate)
-                button = button_col.find("button", class_="trans_link")
-                button_type = "ledger"
-                button_attr = "chulhano"
-
-                if not button:
-                    # estimate_link 클래스 버튼 시도
-                    button = button_col.find("button", class_="estimate_link")
-                    button_type = "estimate"
-                    button_attr = "ordno"
-
-                if not button:
-                    # 디버깅: 버튼 컬럼의 HTML 구조 로그
-                    logger.warning(f"[Downloader] No button found for {order_no}")
-                    logger.warning(f"[DEBUG] Button column HTML: {button_col}")
-                    logger.warning(f"[DEBUG] All buttons in column: {button_col.find_all('button')}")
-                    distributed_lock.release_lock(order_no, status=DistributedLockManager.STATUS_FAILED,
-                                                notes="No download button")
-                    continue
+    def download_document(self, candidate, history, force_mode=False):
+        """
+        V10: Download one order's detail page with distributed lock checking and Force Mode
 
-                # 버튼 속성에서 번호 가져오기 (chulhano for ledger, ordno for estimate)
-                button_id = button.get(button_attr, "")
-                if not button_id:
-                    logger.warning(f"[Downloader] No {button_attr} attribute for {order_no}")
-                    distributed_lock.release_lock(order_no, status=DistributedLockManager.STATUS_FAILED,
-                                                notes=f"No {button_attr}")
-                    continue
+        Args:
+            candidate: order dict from parse_list_candidates()
+            history: loaded download history dict (updated in place)
+            force_mode: If True, bypass history and lock checks
 
-                logger.info(f"[Downloader] Downloading {button_type} for {order_no} ({button_attr}={button_id})")
+        Returns:
+            "downloaded" or "skipped"
 
-                # URL에서 younglim_gubun 파라미터 추출
-                from urllib.parse import urlparse, parse_qs
-                parsed = urlparse(list_url)
-                params = parse_qs(parsed.query)
-                younglim_gubun = params.get('younglim_gubun', [''])[0]
+        Raises:
+            JobError: detail download failed (retried by the work queue) or the row has
+                      no usable download button (retry=False - goes straight to dead-letter)
+        """
+        order_no = candidate["order_no"]
+        doc_type = candidate["doc_type"]
+        save_dir = config.DOWNLOADS_DIR / doc_type
+
+        # V10: Check distributed lock BEFORE checking local history
+        # SKIP if lock exists and NOT in force mode
+        if not force_mode:
+            if not distributed_lock.acquire_lock(order_no, notes=f"Download attempt from {doc_type}"):
+                logger.info(f"[V10] Order {order_no} is locked by another machine or already completed - skipping")
+                return "skipped"
+
+            # Check local download history (keys are {order_no}_{button_id}; bare order_no is legacy)
+            downloaded = history.get(doc_type, [])
+            if f"{order_no}_{candidate['button_id']}" in downloaded or order_no in downloaded:
+                logger.info(f"[Downloader] {order_no} already in local history - skipping")
+                # Release lock since we're skipping
+                distributed_lock.release_lock_async(order_no, status=DistributedLockManager.STATUS_COMPLETED,
+                                            notes="Already in local history")
+                return "skipped"
+        else:
+            logger.info(f"[Downloader] FORCE MODE: Bypassing checks for {order_no}")
+
+        if candidate.get("error"):
+            logger.warning(f"[Downloader] {candidate['error']} for {order_no}")
+            metrics.DOCUMENTS_FAILED.inc(doc_type=doc_type, stage="download")
+            distributed_lock.release_lock_async(order_no, status=DistributedLockManager.STATUS_FAILED,
+                                        notes=candidate["error"])
+            raise JobError(candidate["error"], retry=False)
+
+        button_type = candidate["button_type"]
+        button_id = candidate["button_id"]
 
-                # 직접 URL 네비게이션으로 상세 페이지 다운로드 (팝업 차단 문제 회피)
-                try:
-                    # 현재 URL 저장 (목록 페이지)
-                    original_url = browser_manager.driver.current_url
+        try:
+            logger.info(f"[Downloader] Downloading {button_type} for {order_no} (id={button_id})")
 
+            # 직접 URL 네비게이션으로 상세 페이지 다운로드 (팝업 차단 문제 회피)
+            try:
+                with span("detail_fetch", order_id=order_no, doc_type=doc_type):
                     # 상세 페이지 URL 구성
                     if button_type == "ledger":
-                        detail_url = f"http://door.yl.co.kr/oms/trans_doc.jsp?chulhano={button_id}&younglim_gubun={younglim_gubun}"
+                        detail_url = f"{config.YOUNGRIM_LEDGER_DOC_URL}?chulhano={button_id}&younglim_gubun={candidate['younglim_gubun']}"
                     else:  # estimate
-                        detail_url = f"http://door.yl.co.kr/oms/estimate_doc.jsp?ordno={button_id}&younglim_gubun={younglim_gubun}"
+                        detail_url = f"{config.YOUNGRIM_ESTIMATE_DOC_URL}?ordno={button_id}&younglim_gubun={candidate['younglim_gubun']}"
 
                     # 상세 페이지로 직접 이동
                     logger.info(f"[Downloader] Navigating to detail page: {detail_url}")
-                    browser_manager.driver.get(detail_url)
+                    browser_manager.navigate(detail_url)
                     time.sleep(3)
 
                     # 상세 페이지 HTML 가져오기
                     detail_html = browser_manager.get_source()
                     logger.info(f"[Downloader] Retrieved detail page HTML ({len(detail_html)} bytes)")
 
-                    # 목록 페이지로 복귀
-                    browser_manager.driver.get(original_url)
-                    time.sleep(2)
-                    logger.info(f"[Downloader] Returned to list page")
-
-                except Exception as nav_error:
-                    logger.error(f"[Downloader] Error navigating for {order_no}: {nav_error}")
-                    distributed_lock.release_lock(order_no, status=DistributedLockManager.STATUS_FAILED,
-                                                notes=f"Navigation error: {str(nav_error)[:100]}")
-                    # 목록 페이지로 복귀 시도
-                    try:
-                        browser_manager.driver.get(list_url)
-                        time.sleep(2)
-                    except:
-                        pass
-                    continue
-
-                # Save to file
-                # V10: Unique filename using order_no and button_id
-                filename = f"{order_no}_{button_id}.html"
-                filepath = save_dir / filename
-
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(detail_html)
-
-                logger.info(f"[Downloader] ✅ Saved {filepath}")
-
-                # Add to local history
-                # Use UNIQUE key for history in unique filename mode
-                history_key = f"{order_no}_{button_id}"
-                if doc_type not in history: history[doc_type] = []
-                history[doc_type].append(history_key)
-                save_history(history)
-
-                # V10: Update lock status to completed
-                # Use same order_no for lock (distributed lock uses order_no as ID)
-                distributed_lock.release_lock(order_no, status=DistributedLockManager.STATUS_COMPLETED,
-                                            notes=f"Download successful (ID: {button_id})")
+            except Exception as nav_error:
+                logger.error(f"[Downloader] Error navigating for {order_no}: {nav_error}")
+                metrics.DOCUMENTS_FAILED.inc(doc_type=doc_type, stage="download")
+                distributed_lock.release_lock_async(order_no, status=DistributedLockManager.STATUS_FAILED,
+                                            notes=f"Navigation error: {str(nav_error)[:100]}")
+                raise JobError(f"Navigation error: {nav_error}")
+
+            # Save to file
+            # V10: Unique filename using order_no and button_id
+            filename = f"{order_no}_{button_id}.html"
+            filepath = save_dir / filename
+
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(detail_html)
+
+            logger.info(f"[Downloader] ✅ Saved {filepath}")
+            metrics.DOCUMENTS_DOWNLOADED.inc(doc_type=doc_type)
+
+            # Add to local download history - the document stays pending until it is uploaded
+            # Use UNIQUE key for history in unique filename mode
+            history_key = f"{order_no}_{button_id}"
+            pending_index.add_document(doc_type, history_key, filepath)
+            if doc_type not in history: history[doc_type] = []
+            history[doc_type].append(history_key)
+            save_download_history(history)
+
+            # V10: Update lock status to completed
+            # Use same order_no for lock (distributed lock uses order_no as ID)
+            # Released in the background so the next detail fetch starts immediately
+            distributed_lock.release_lock_async(order_no, status=DistributedLockManager.STATUS_COMPLETED,
+                                        notes=f"Download successful (ID: {button_id})")
+            return "downloaded"
+
+        except JobError:
+            raise
+        except Exception as e:
+            logger.error(f"[Downloader] Error downloading {order_no}: {e}")
+            # V10: Mark as failed in distributed lock
+            metrics.DOCUMENTS_FAILED.inc(doc_type=doc_type, stage="download")
+            distributed_lock.release_lock_async(order_id=order_no, status=DistributedLockManager.STATUS_FAILED,
+                                        notes=f"Download error: {str(e)[:100]}")
+            raise JobError(f"Download error: {e}")
+
+class LockArchiver(threading.Thread):
+    """
+    Background thread that keeps the lock sheet small by archiving finished rows
+
+    Deleting rows shifts the row numbers every other machine is working with, so only one
+    machine archives per interval: the one that wins the lock row "__lock_archive_<period>".
+    """
+    def __init__(self, interval_sec=None):
+        super().__init__()
+        self.daemon = True
+        self.running = True
+        self.interval_sec = interval_sec or config.LOCK_ARCHIVE_INTERVAL_SEC
 
-                downloaded_count += 1
+    def run(self):
+        # Let the first download cycle go first - it needs the Sheets quota more
+        time.sleep(300)
+        while self.running:
+            if server_status["lock_manager_connected"]:
+                try:
+                    self.archive_if_elected()
+                except Exception as e:
+                    error_handler.handle(e, context={"thread": "LockArchiver"}, severity=ErrorSeverity.LOW)
+            time.sleep(self.interval_sec)
+
+    def archive_if_elected(self):
+        election_key = f"{DistributedLockManager.ARCHIVE_ELECTION_PREFIX}{int(time.time() // self.interval_sec)}"
+        if not distributed_lock.acquire_lock(election_key, notes="Lock archiver election"):
+            logger.info("[LockArchive] Another machine is archiving this interval - skipping")
+            return
+        try:
+            distributed_lock.archive_old_locks()
+            server_status["lock_archive_last_run"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        finally:
+            distributed_lock.release_lock(election_key, status=DistributedLockManager.STATUS_COMPLETED)
+
+def lock_key_for_document(stem):
+    """Downloaded files are named {order_no}_{button_id}; the distributed lock is keyed by order_no"""
+    return stem.rsplit("_", 1)[0]
+
+def upload_document(job, lock_snapshot=None):
+    """
+    Upload queue handler: parse one pending document and paste it into the ERP
+
+    Args:
+        job: work queue job (key = file stem / history key)
+        lock_snapshot: LockStatusSnapshot shared by the upload batch (one sheet read per batch)
+    """
+    doc_type = job["doc_type"]
+    order_id = job["key"]
+    html_file = Path(job["payload"]["path"])
+
+    if not html_file.exists():
+        logger.info(f"[Server] {html_file.name} is no longer pending - skipping")
+        return
+
+    # V10: Double-check distributed lock - the downloader releases the order as completed,
+    # so only another machine's completed lock means the order is handled elsewhere
+    lock_snapshot = lock_snapshot or distributed_lock.status_snapshot()
+    lock_status = lock_snapshot.get(lock_key_for_document(order_id))
+    if (lock_status and lock_status['status'] == DistributedLockManager.STATUS_COMPLETED
+            and lock_status['machine_id'] != distributed_lock.machine_id):
+        logger.info(f"[V10] {order_id} already completed by another machine ({lock_status['machine_id']}) - skipping")
+        # Nothing left to upload here: take the file out of pending so it is not queued again
+        document_archive.archive_file(doc_type, html_file)
+        pending_index.remove_document(doc_type, order_id)
+        return
+
+    logger.info(f"[Server] Processing {doc_type} file: {html_file.name}")
+
+    error = None
+    with span("upload_document", order_id=order_id, doc_type=doc_type) as upload_timing:
+        try:
+            # Parse and process
+            with open(html_file, 'r', encoding='utf-8') as f:
+                html_content = f.read()
+
+            with span("process_html_content", doc_type=doc_type) as parse_timing:
+                erp_data = run_stage("parser", "parse", html_content, html_file.name, doc_type)
+                parse_timing["rows"] = len(erp_data)
+
+            if erp_data:
+                # Upload to ERP
+                success = run_stage("uploader", "upload", erp_data, doc_type)
+
+                if success:
+                    # Add to history
+                    history = load_history()
+                    history.setdefault(doc_type, []).append(order_id)
+                    save_history(history)
+                    pending_index.add_history(doc_type, order_id)
+                    document_archive.archive_file(doc_type, html_file)
+                    pending_index.remove_document(doc_type, order_id)
+                    metrics.DOCUMENTS_UPLOADED.inc(doc_type=doc_type)
+                    logger.info(f"[Server] ✅ Successfully uploaded {order_id}")
+                else:
+                    upload_timing["outcome"] = "failed"
+                    metrics.DOCUMENTS_FAILED.inc(doc_type=doc_type, stage="upload")
+                    logger.error(f"[Server] ❌ Failed to upload {order_id}")
+                    error = JobError("ERP upload failed")
+            else:
+                upload_timing["outcome"] = "empty"
+                logger.warning(f"[Server] No ERP data extracted from {order_id}")
+                error = JobError("No ERP data extracted", retry=False)
 
-            except Exception as e:
-                logger.error(f"[Downloader] Error downloading {order_no}: {e}")
-                # V10: Mark as failed in distributed lock
-                distributed_lock.release_lock(order_id=order_no, status=DistributedLockManager.STATUS_FAILED,
-                                            notes=f"Download error: {str(e)[:100]}")
-                continue
+        except Exception as e:
+            upload_timing["outcome"] = "error"
+            logger.error(f"[Server] Error processing {order_id}: {e}")
+            metrics.DOCUMENTS_FAILED.inc(doc_type=doc_type, stage="upload")
+            error = JobError(f"{type(e).__name__}: {e}")
+
+    if error:
+        raise error
+
+def upload_pending(doc_type):
+    """Queue the pending documents of a type and work through the upload queue; returns jobs processed"""
+    pending_files = pending_index.pending_files(doc_type)
+    for html_file in pending_files:
+        work_queue.enqueue("upload", doc_type, html_file.stem, {"path": str(html_file)})
+    set_progress_total(len(pending_files))
+    lock_snapshot = distributed_lock.status_snapshot()
+
+    def handle_upload(job):
+        try:
+            upload_document(job, lock_snapshot)
+        except Exception as e:
+            report_progress(job["key"], "failed", str(e))
+            raise
+        report_progress(job["key"], "done")
 
-        return downloaded_count
+    return work_queue.run_due("upload", handle_upload, doc_type=doc_type)
 
 # Flask Routes
 @app.route('/')
 def index():
     return render_template_string(HTML_TEMPLATE)
 
-@app.route('/api/stats')
-def get_stats():
-    history = load_history()
-
-    ledger_files = list((config.DOWNLOADS_DIR / "ledger").glob("*.html")) + \
-                   list((config.DOWNLOADS_DIR / "ledger").glob("*.mhtml"))
-    estimate_files = list((config.DOWNLOADS_DIR / "estimate").glob("*.html")) + \
-                     list((config.DOWNLOADS_DIR / "estimate").glob("*.mhtml"))
-
-    ledger_ids = {f.stem for f in ledger_files}
-    estimate_ids = {f.stem for f in estimate_files}
-
-    ledger_history_set = set(history.get("ledger", []))
-    estimate_history_set = set(history.get("estimate", []))
-
-    # Calculate pending based on existence vs history
-    # stem is now {order_no}_{button_id}
-    ledger_pending = ledger_ids - ledger_history_set
-    estimate_pending = estimate_ids - estimate_history_set
-
-    # Also check if any older format files exist (without underscore)
-    # But for simplicity, we prioritize the new format
-
-    return jsonify({
-        "status": server_status,
-        "pending": {
-            "ledger": len(ledger_pending),
-            "estimate": len(estimate_pending)
-        },
-        "history_count": {
-            "ledger": len(ledger_history_set),
-            "estimate": len(estimate_history_set)
-        }
-    })
-
-@app.route('/trigger_ledger', methods=['POST'])
-def trigger_ledger_upload():
-    """Trigger ledger upload with lock awareness"""
-    if not ledger_lock.acquire(blocking=False):
-        return jsonify({"status": "error", "message": "Ledger upload already running"}), 409
-
+def build_stats_payload():
+    # Pending = downloaded files ({order_no}_{button_id}) not yet in history,
+    # served from the precomputed index snapshot
+    snapshot = pending_index.snapshot()
+
+    return {
+        "status": dict(server_status),
+        "pending": snapshot["pending"],
+        "history_count": snapshot["history_count"],
+        "queue": work_queue.counts(),
+        "startup": {"complete": startup_complete.is_set(), "timings": startup_timings},
+        "workers": supervisor.status() if supervisor else {},
+        "jobs": job_registry.active(),
+        "recent_errors": error_handler.recent_errors(limit=10),
+        "error_aggregates": error_handler.error_aggregates(),
+        "dead_letters": work_queue.dead_letters(limit=20)
+    }
+
+def collect_status_metrics():
+    """Refresh gauges from server_status and the pending index right before a scrape"""
+    for doc_type, count in pending_index.snapshot()["pending"].items():
+        metrics.PENDING_DOCUMENTS.set(count, doc_type=doc_type)
+    metrics.EMPTY_CYCLES.set(server_status["empty_cycle_count"])
+    metrics.LOCK_MANAGER_CONNECTED.set(1 if server_status["lock_manager_connected"] else 0)
+    for status, count in work_queue.counts().items():
+        metrics.QUEUE_JOBS.set(count, status=status)
+
+metrics.registry.add_collector(collect_status_metrics)
+
+# Engine operations - everything the web routes need from the automation engine.
+# Each returns a JSON-serialisable result so it can be called in-process (dev mode)
+# or from the web process over IPC (production mode).
+def op_wait_stats(version=None, timeout=None):
+    """Block until the stats change (or timeout); payload is None when nothing changed"""
+    current_version = status_events.wait(version, timeout=timeout or config.SSE_HEARTBEAT_SEC)
+    if current_version == version:
+        return {"version": current_version, "payload": None}
+    return {"version": current_version, "payload": build_stats_payload()}
+
+def run_upload_job(doc_type):
+    """Upload job body; returns the number of queue jobs processed"""
+    label = doc_type.capitalize()
+    server_status[f"{doc_type}_uploader_status"] = "Running"
     try:
-        server_status["ledger_uploader_status"] = "Running"
-
-        def run_upload():
-            try:
-                logger.info("[Server] Ledger upload triggered")
-
-                # Process files
-                ledger_dir = config.DOWNLOADS_DIR / "ledger"
-                html_files = list(ledger_dir.glob("*.html")) + list(ledger_dir.glob("*.mhtml"))
-
-                history = load_history()
-                history_set = set(history.get("ledger", []))
-
-                pending_files = [f for f in html_files if f.stem not in history_set]
-
-                if not pending_files:
-                    logger.info("[Server] No pending ledger files to process")
-                    server_status["ledger_uploader_status"] = "Idle"
-                    ledger_lock.release()
-                    return
-
-                # Process each file
-                for html_file in pending_files:
-                    order_id = html_file.stem
-
-                    # V10: Double-check distributed lock
-                    lock_status = distributed_lock.get_lock_status(order_id)
-                    if lock_status and lock_status['status'] == DistributedLockManager.STATUS_COMPLETED:
-                        logger.info(f"[V10] {order_id} already completed by another machine - skipping")
-                        continue
-
-                    logger.info(f"[Server] Processing ledger file: {html_file.name}")
-
-                    try:
-                        # Parse and process
-                        with open(html_file, 'r', encoding='utf-8') as f:
-                            html_content = f.read()
-
-                        erp_data = local_file_processor.process_html_content(html_content, file_path_hint=html_file.name, target_type='ledger')
-
-                        if erp_data:
-                            # Upload to ERP
-                            automation = ErpUploadAutomation()
-                            success = automation.run(direct_data=erp_data, auto_close=True, target_type='ledger')
-                            automation.close(keep_browser_open=True)
-
-                            if success:
-                                # Add to history
-                                history["ledger"].append(order_id)
-                                save_history(history)
-                                logger.info(f"[Server] ✅ Successfully uploaded {order_id}")
-                            else:
-                                logger.error(f"[Server] ❌ Failed to upload {order_id}")
-                        else:
-                            logger.warning(f"[Server] No ERP data extracted from {order_id}")
+        logger.info(f"[Server] {label} upload triggered")
+
+        processed = upload_pending(doc_type)
+        if processed == 0:
+            logger.info(f"[Server] No pending {doc_type} files to process")
+
+        logger.info(f"[Server] {label} upload complete")
+        return processed
+    finally:
+        server_status[f"{doc_type}_uploader_status"] = "Idle"
+
+def run_download_job(force_mode=False):
+    """Download job body (manual or Force mode cycle)"""
+    downloader.download_cycle(force_mode=force_mode)
+
+def op_trigger_upload(doc_type):
+    """Trigger ledger/estimate upload; at most one upload job per document type"""
+    label = doc_type.capitalize()
+    job, created = job_registry.submit("upload", run_upload_job, key=f"upload:{doc_type}", doc_type=doc_type)
+    if not created:
+        return {"status": "error", "message": f"{label} upload already running", "job_id": job.id}, 409
+    return {"status": "success", "message": f"{label} upload started", "job_id": job.id}, 200
+
+def op_trigger_download(force_mode=False):
+    """Manual download trigger (optionally Force mode); shares one slot with the other manual downloads"""
+    if server_status["downloader_status"] == "Running":
+        return {"status": "error", "message": "Downloader already running"}, 409
+
+    job, created = job_registry.submit("download", run_download_job, force_mode=force_mode)
+    if not created:
+        return {"status": "error", "message": "Downloader already running", "job_id": job.id}, 409
+    message = "Force sync started" if force_mode else "Manual download started"
+    return {"status": "success", "message": message, "job_id": job.id}, 200
+
+def op_job(job_id):
+    """State, per-order progress, timings and error of a submitted job"""
+    job = job_registry.get(job_id)
+    if not job:
+        return {"status": "error", "message": f"Job {job_id} not found"}, 404
+    return job.to_dict(), 200
+
+def op_retry_dead_letter(job_id):
+    """Move a dead-lettered job back to the queue; it runs with the next download cycle / upload"""
+    if not work_queue.requeue(job_id):
+        return {"status": "error", "message": f"Job {job_id} is not in the dead-letter list"}, 404
+    return {"status": "success", "message": f"Job {job_id} requeued"}, 200
+
+def op_reset_status():
+    server_status["last_error"] = None
+    server_status["empty_cycle_count"] = 0
+    server_status["downloader_status"] = "Idle"
+    server_status["ledger_uploader_status"] = "Idle"
+    server_status["estimate_uploader_status"] = "Idle"
+    return {"status": "success"}, 200
+
+ENGINE_OPERATIONS = {
+    "stats": build_stats_payload,
+    "wait_stats": op_wait_stats,
+    "metrics": metrics.registry.render,
+    "trigger_upload": op_trigger_upload,
+    "trigger_download": op_trigger_download,
+    "job": op_job,
+    "retry_dead_letter": op_retry_dead_letter,
+    "reset_status": op_reset_status,
+}
 
-                    except Exception as e:
-                        logger.error(f"[Server] Error processing {order_id}: {e}")
-                        continue
+# Replaced by an EngineClient in the web process of production mode
+engine = LocalEngine(ENGINE_OPERATIONS)
 
-                server_status["ledger_uploader_status"] = "Idle"
-                logger.info("[Server] Ledger upload complete")
+@app.errorhandler(EngineUnavailable)
+def engine_unavailable(e):
+    return jsonify({"status": "error", "message": str(e)}), 503
 
-            except Exception as e:
-                logger.error(f"[Server] Ledger upload error: {e}")
-                server_status["ledger_uploader_status"] = "Idle"
-            finally:
-                ledger_lock.release()
+@app.route('/api/stats')
+def get_stats():
+    return jsonify(engine.call("stats"))
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus text exposition of counters, gauges and stage latency histograms"""
+    return Response(engine.call("metrics"), mimetype="text/plain; version=0.0.4")
+
+# Open event streams (each one occupies a web server thread)
+sse_slots = threading.BoundedSemaphore(config.SSE_MAX_STREAMS)
+
+@app.route('/api/events')
+def stats_events():
+    """
+    Server-Sent Events stream of stats deltas (full payload first, heartbeat while idle)
+
+    At most SSE_MAX_STREAMS streams are open at once and each ends after SSE_STREAM_MAX_SEC;
+    the browser reconnects using the retry hint, so no dashboard can hold a thread forever.
+    """
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if not sse_slots.acquire(blocking=False):
+        busy = "retry: 10000\nevent: busy\ndata: {}\n\n"
+        return Response(busy, mimetype="text/event-stream", headers=headers)
+
+    def stream():
+        sent = {}
+        version = None
+        deadline = time.monotonic() + config.SSE_STREAM_MAX_SEC
+        yield "retry: 1000\n\n"
+        while time.monotonic() < deadline:
+            try:
+                update = engine.call("wait_stats", version=version, timeout=config.SSE_HEARTBEAT_SEC)
+            except EngineUnavailable:
+                # Engine restarting - keep the stream open and try again after a heartbeat
+                yield ": engine unavailable\n\n"
+                time.sleep(config.SSE_HEARTBEAT_SEC)
+                continue
+            if update["payload"] is None:
+                yield ": heartbeat\n\n"
+                continue
+            version = update["version"]
 
-        thread = threading.Thread(target=run_upload, daemon=True)
-        thread.start()
+            payload = update["payload"]
+            delta = diff_payload(sent, payload)
+            sent = payload
+            if delta:
+                yield f"event: stats\ndata: {json.dumps(delta, ensure_ascii=False)}\n\n"
 
-        return jsonify({"status": "success", "message": "Ledger upload started"})
+    response = Response(stream_with_context(stream()), mimetype="text/event-stream", headers=headers)
+    response.call_on_close(sse_slots.release)
+    return response
 
-    except Exception as e:
-        ledger_lock.release()
-        return jsonify({"status": "error", "message": str(e)}), 500
+@app.route('/trigger_ledger', methods=['POST'])
+def trigger_ledger_upload():
+    """Trigger ledger upload with lock awareness"""
+    payload, code = engine.call("trigger_upload", doc_type="ledger")
+    return jsonify(payload), code
 
 @app.route('/trigger_estimate', methods=['POST'])
 def trigger_estimate_upload():
     """Trigger estimate upload with lock awareness"""
-    if not estimate_lock.acquire(blocking=False):
-        return jsonify({"status": "error", "message": "Estimate upload already running"}), 409
-
-    try:
-        server_status["estimate_uploader_status"] = "Running"
-
-        def run_upload():
-            try:
-                logger.info("[Server] Estimate upload triggered")
-
-                # Process files
-                estimate_dir = config.DOWNLOADS_DIR / "estimate"
-                html_files = list(estimate_dir.glob("*.html")) + list(estimate_dir.glob("*.mhtml"))
-
-                history = load_history()
-                history_set = set(history.get("estimate", []))
-
-                pending_files = [f for f in html_files if f.stem not in history_set]
-
-                if not pending_files:
-                    logger.info("[Server] No pending estimate files to process")
-                    server_status["estimate_uploader_status"] = "Idle"
-                    estimate_lock.release()
-                    return
-
-                # Process each file
-                for html_file in pending_files:
-                    order_id = html_file.stem
-
-                    # V10: Double-check distributed lock
-                    lock_status = distributed_lock.get_lock_status(order_id)
-                    if lock_status and lock_status['status'] == DistributedLockManager.STATUS_COMPLETED:
-                        logger.info(f"[V10] {order_id} already completed by another machine - skipping")
-                        continue
-
-                    logger.info(f"[Server] Processing estimate file: {html_file.name}")
-
-                    try:
-                        # Parse and process
-                        with open(html_file, 'r', encoding='utf-8') as f:
-                            html_content = f.read()
-
-                        erp_data = local_file_processor.process_html_content(html_content, file_path_hint=html_file.name, target_type='estimate')
-
-                        if erp_data:
-                            # Upload to ERP
-                            automation = ErpUploadAutomation()
-                            success = automation.run(direct_data=erp_data, auto_close=True, target_type='estimate')
-                            automation.close(keep_browser_open=True)
-
-                            if success:
-                                # Add to history
-                                history["estimate"].append(order_id)
-                                save_history(history)
-                                logger.info(f"[Server] ✅ Successfully uploaded {order_id}")
-                            else:
-                                logger.error(f"[Server] ❌ Failed to upload {order_id}")
-                        else:
-                            logger.warning(f"[Server] No ERP data extracted from {order_id}")
-
-                    except Exception as e:
-                        logger.error(f"[Server] Error processing {order_id}: {e}")
-                        continue
-
-                server_status["estimate_uploader_status"] = "Idle"
-                logger.info("[Server] Estimate upload complete")
-
-            except Exception as e:
-                logger.error(f"[Server] Estimate upload error: {e}")
-                server_status["estimate_uploader_status"] = "Idle"
-            finally:
-                estimate_lock.release()
-
-        thread = threading.Thread(target=run_upload, daemon=True)
-        thread.start()
-
-        return jsonify({"status": "success", "message": "Estimate upload started"})
-
-    except Exception as e:
-        estimate_lock.release()
-        return jsonify({"status": "error", "message": str(e)}), 500
+    payload, code = engine.call("trigger_upload", doc_type="estimate")
+    return jsonify(payload), code
 
 @app.route('/trigger_download', methods=['POST'])
 def trigger_download():
     """Manual download trigger"""
-    if server_status["downloader_status"] == "Running":
-        return jsonify({"status": "error", "message": "Downloader already running"}), 409
-    
-    def run_manual():
-        try:
-            downloader.download_cycle(force_mode=False)
-        except Exception as e:
-            logger.error(f"Manual download error: {e}")
-            server_status["downloader_status"] = "Idle"
-            
-    thread = threading.Thread(target=run_manual, daemon=True)
-    thread.start()
-    return jsonify({"status": "success", "message": "Manual download started"})
+    payload, code = engine.call("trigger_download", force_mode=False)
+    return jsonify(payload), code
 
 @app.route('/trigger_download_force', methods=['POST'])
 def trigger_download_force():
     """Manual download trigger (Force mode)"""
-    if server_status["downloader_status"] == "Running":
-        return jsonify({"status": "error", "message": "Downloader already running"}), 409
-    
-    def run_force():
-        try:
-            downloader.download_cycle(force_mode=True)
-        except Exception as e:
-            logger.error(f"Force download error: {e}")
-            server_status["downloader_status"] = "Idle"
-            
-    thread = threading.Thread(target=run_force, daemon=True)
-    thread.start()
-    return jsonify({"status": "success", "message": "Force sync started"})
+    payload, code = engine.call("trigger_download", force_mode=True)
+    return jsonify(payload), code
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    """Job state for the id returned by a trigger endpoint"""
+    payload, code = engine.call("job", job_id=job_id)
+    return jsonify(payload), code
+
+@app.route('/api/dead_letters/<int:job_id>/retry', methods=['POST'])
+def retry_dead_letter(job_id):
+    """Move a dead-lettered job back to the queue; it runs with the next download cycle / upload"""
+    payload, code = engine.call("retry_dead_letter", job_id=job_id)
+    return jsonify(payload), code
 
 @app.route('/reset_status', methods=['POST'])
 def reset_status():
-    server_status["last_error"] = None
-    server_status["empty_cycle_count"] = 0
-    server_status["downloader_status"] = "Idle"
-    server_status["ledger_uploader_status"] = "Idle"
-    server_status["estimate_uploader_status"] = "Idle"
-    return jsonify({"status": "success"})
+    payload, code = engine.call("reset_status")
+    return jsonify(payload), code
 
 # Main Execution
+def connect_lock_manager():
+    """V10: Connect the distributed lock manager and reflect the result in server_status"""
+    logger.info("[V10] Connecting to distributed lock manager...")
+    server_status["machine_id"] = distributed_lock.machine_id
+    if distributed_lock.connect():
+        server_status["lock_manager_connected"] = True
+        logger.info(f"[V10] ✅ Distributed lock manager connected (Machine: {distributed_lock.machine_id})")
+        LockArchiver().start()
+        logger.info(f"[Server] Lock archiver started (rows older than {config.LOCK_ARCHIVE_AFTER_DAYS} days, "
+                    f"every {config.LOCK_ARCHIVE_INTERVAL_SEC // 3600}h)")
+    else:
+        logger.warning("[V10] ⚠️ Failed to connect to distributed lock manager - running in standalone mode")
+        server_status["lock_manager_connected"] = False
+
+def background_startup():
+    """Slow startup work that runs while the dashboard is already being served"""
+    try:
+        with startup_phase("lock_connect"):
+            connect_lock_manager()
+        # Move already processed documents into the compressed archive
+        with startup_phase("archive_sweep"):
+            archive_processed_documents()
+        # Archived documents plus the ones still waiting in the downloads dir
+        # (pending or not yet archived), so the learned rate matches every download
+        with startup_phase("polling_seed"):
+            polling_scheduler.seed(document_archive.downloaded_timestamps()
+                                   + pending_index.downloaded_timestamps())
+        # Warm the upload modules so the first upload does not pay for the imports
+        # (worker processes import them themselves)
+        if not supervisor:
+            with startup_phase("import_upload_modules"):
+                upload_modules()
+    except Exception as e:
+        error_handler.handle(e, context={"thread": "Startup"}, severity=ErrorSeverity.HIGH)
+    finally:
+        startup_complete.set()
+        status_events.notify()  # dashboards leave the "Connecting..." state
+        logger.info(f"[Startup] Background startup finished: {startup_timings}")
+
+def port_in_use(port):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        return sock.connect_ex(('127.0.0.1', port)) == 0
+
 def cleanup_port(port):
-    """지정된 포트를 사용하는 프로세스를 종료합니다."""
+    """지정된 포트를 사용하는 프로세스를 종료합니다. (Windows 전용, 포트가 비어 있으면 바로 반환)"""
+    if os.name != "nt" or not port_in_use(port):
+        return
     try:
         cmd = f"netstat -ano | findstr :{port}"
         output = subprocess.check_output(cmd, shell=True).decode()
@@ -813,32 +1284,94 @@ def cleanup_port(port):
     except:
         pass
 
-if __name__ == "__main__":
-    logger.info("=" * 60)
-    logger.info("V10 Auto Server Starting - Distributed Lock Edition")
-    logger.info("=" * 60)
+def start_workers():
+    """Run the browser, parser and uploader stages in supervised worker processes"""
+    global supervisor, browser_manager
+    supervisor = Supervisor({
+        "downloader": downloader_worker_operations,
+        "parser": parser_worker_operations,
+        "uploader": uploader_worker_operations,
+    })
+    with startup_phase("worker_processes"):
+        supervisor.start()
+    browser_manager = RemoteBrowser(supervisor)
 
-    # Ensure port is clean
-    cleanup_port(config.FLASK_PORT)
+def start_engine(use_workers=False):
+    """Start the automation engine: pending index, queue recovery, downloader and background startup"""
+    global downloader
 
-    # V10: Initialize distributed lock manager
-    logger.info("[V10] Connecting to distributed lock manager...")
-    if distributed_lock.connect():
-        server_status["lock_manager_connected"] = True
-        server_status["machine_id"] = distributed_lock.machine_id
-        logger.info(f"[V10] ✅ Distributed lock manager connected (Machine: {distributed_lock.machine_id})")
-    else:
-        logger.warning("[V10] ⚠️ Failed to connect to distributed lock manager - running in standalone mode")
-        server_status["lock_manager_connected"] = False
+    if use_workers:
+        start_workers()
+
+    # Only the work needed to render the dashboard runs before Flask starts listening
+    with startup_phase("pending_index"):
+        pending_index.rebuild()
+    with startup_phase("work_queue"):
+        work_queue.recover_interrupted()
 
-    # Start Auto Downloader
+    # Start Auto Downloader (its first cycle waits for the background startup)
     downloader = AutoDownloader()
     downloader.start()
     downloader.activate()
     logger.info("[Server] Auto Downloader activated")
 
-    # Start Flask Server
-    logger.info(f"[Server] Starting Flask on port {config.FLASK_PORT}")
+    threading.Thread(target=background_startup, name="startup", daemon=True).start()
+
+def run_engine_process(address, authkey, use_workers=False):
+    """Production mode: entry point of the automation engine process"""
+    logger.info(f"[Engine] Automation engine process started (PID {os.getpid()})")
+    start_engine(use_workers)
+    EngineServer(ENGINE_OPERATIONS, address, authkey).serve_forever()
+
+def run_production_server(use_workers=False):
+    """Serve the dashboard with waitress; the automation engine runs in its own process"""
+    global engine
+    from waitress import serve
+
+    address = ("127.0.0.1", config.ENGINE_IPC_PORT)
+    authkey = os.urandom(32)
+    with startup_phase("engine_ipc_port_cleanup"):
+        cleanup_port(config.ENGINE_IPC_PORT)
+
+    # Restarted with backoff if it dies; the client reconnects on the next call
+    engine_process = EngineProcess(run_engine_process, (address, authkey, use_workers),
+                                   max_delay=config.ENGINE_RESTART_MAX_DELAY_SEC)
+    engine_process.start()
+    engine = EngineClient(address, authkey)
+    logger.info(f"[Server] Automation engine running in process {engine_process.pid}")
+
+    logger.info(f"[Server] Starting waitress on port {config.FLASK_PORT} ({config.WEB_THREADS} threads, "
+                f"up to {config.SSE_MAX_STREAMS} event streams)")
     logger.info(f"[Server] Dashboard: http://localhost:{config.FLASK_PORT}")
+    try:
+        serve(app, host='0.0.0.0', port=config.FLASK_PORT, threads=config.WEB_THREADS)
+    finally:
+        engine_process.stop(timeout=10)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='V10 Auto Server')
+    parser.add_argument('--mode', choices=['dev', 'production'], default=config.SERVER_MODE,
+                        help='dev: Flask dev server with the engine in-process, '
+                             'production: waitress + engine in a separate process')
+    parser.add_argument('--workers', action='store_true', default=config.WORKER_PROCESSES,
+                        help='Run the browser, parser and uploader stages in supervised worker processes')
+    args = parser.parse_args()
+
+    logger.info("=" * 60)
+    logger.info(f"V10 Auto Server Starting - Distributed Lock Edition ({args.mode} mode)")
+    logger.info("=" * 60)
+
+    # Ensure port is clean
+    with startup_phase("port_cleanup"):
+        cleanup_port(config.FLASK_PORT)
+
+    if args.mode == "production":
+        run_production_server(args.workers)
+    else:
+        start_engine(args.workers)
+
+        # Start Flask Server
+        logger.info(f"[Server] Starting Flask on port {config.FLASK_PORT}")
+        logger.info(f"[Server] Dashboard: http://localhost:{config.FLASK_PORT}")
 
-    app.run(host='0.0.0.0', port=config.FLASK_PORT, debug=config.FLASK_DEBUG, use_reloader=False)
+        app.run(host='0.0.0.0', port=config.FLASK_PORT, debug=config.FLASK_DEBUG, use_reloader=False)
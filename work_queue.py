@@ -0,0 +1,237 @@
+"""
+작업 큐 (Durable Work Queue)
+============================
+다운로드/업로드 작업을 SQLite 에 영속 저장하고 실패 시 재시도/dead-letter 처리
+
+- (kind, doc_type, key) 단위로 중복 없이 적재 (이미 대기/실행 중이면 무시,
+  dead 상태는 payload 가 바뀐 경우에만 - 예: 목록에 다운로드 버튼이 새로 생김 - 시도 횟수를 초기화해 다시 대기 상태로 복구)
+- 실패 시 RETRY_DELAY_SEC * 2^(시도-1) 후 재시도, MAX_RETRIES 회 실패하면 dead-letter
+- 서버 재시작 시 실행 중이던 작업은 recover_interrupted() 로 다시 대기 상태로 복구
+- dead-letter 목록은 대시보드에 표시되며 requeue() 로 수동 재시도
+"""
+
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Import centralized config
+from config import config
+from logging_config import logger
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DEAD = "dead"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    doc_type TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_run_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (kind, doc_type, key)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_due ON jobs (kind, status, next_run_at);
+"""
+
+
+class JobError(Exception):
+    """작업 실패 - retry=False 면 재시도 없이 바로 dead-letter"""
+
+    def __init__(self, message: str, retry: bool = True):
+        super().__init__(message)
+        self.retry = retry
+
+
+class WorkQueue:
+    """SQLite-backed job queue with exponential backoff and a dead-letter list."""
+
+    def __init__(self, db_path: Optional[Path] = None, on_change: Optional[Callable[[], None]] = None,
+                 max_retries: Optional[int] = None, retry_delay: Optional[float] = None):
+        self.db_path = Path(db_path or config.WORK_QUEUE_DB)
+        self.max_retries = max_retries or config.MAX_RETRIES
+        self.retry_delay = retry_delay or config.RETRY_DELAY_SEC
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        self._conn = None  # opened lazily
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _notify(self):
+        if self._on_change:
+            self._on_change()
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        return job
+
+    def enqueue(self, kind: str, doc_type: str, key: str, payload: Optional[dict] = None) -> bool:
+        """
+        작업 적재 - 새로 적재되거나 dead-letter 에서 되살아나면 True
+
+        같은 작업이 대기/실행 중이면 무시. dead 상태는 payload 가 달라졌을 때만 새 payload 와 시도 횟수 0 으로
+        다시 대기 상태로 전환 (같은 내용으로 계속 실패하는 작업은 requeue() 로만 재시도)
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._db().execute(
+                "INSERT INTO jobs (kind, doc_type, key, payload, status, next_run_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (kind, doc_type, key) DO UPDATE SET "
+                "payload = excluded.payload, status = excluded.status, attempts = 0, "
+                "next_run_at = excluded.next_run_at, updated_at = excluded.updated_at "
+                "WHERE jobs.status = ? AND jobs.payload != excluded.payload",
+                (kind, doc_type, key, json.dumps(payload or {}, ensure_ascii=False), STATUS_QUEUED, now, now, now,
+                 STATUS_DEAD))
+            added = cursor.rowcount > 0
+        if added:
+            self._notify()
+        return added
+
+    def claim(self, kind: str, doc_type: Optional[str] = None) -> Optional[Dict]:
+        """실행 시점이 된 작업 1건을 running 으로 바꾸고 반환 (없으면 None)"""
+        now = time.time()
+        query = "SELECT * FROM jobs WHERE kind = ? AND status = ? AND next_run_at <= ?"
+        params = [kind, STATUS_QUEUED, now]
+        if doc_type:
+            query += " AND doc_type = ?"
+            params.append(doc_type)
+        query += " ORDER BY next_run_at, id LIMIT 1"
+
+        with self._lock:
+            db = self._db()
+            row = db.execute(query, params).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                       (STATUS_RUNNING, now, row["id"]))
+            job = self._to_job(row)
+            job["attempts"] += 1
+            job["status"] = STATUS_RUNNING
+        self._notify()
+        return job
+
+    def next_due_in(self, kind: str, doc_type: Optional[str] = None) -> Optional[float]:
+        """대기 중인 작업 중 가장 빠른 실행 시점까지 남은 초 (대기 작업이 없으면 None)"""
+        query = "SELECT MIN(next_run_at) FROM jobs WHERE kind = ? AND status = ?"
+        params = [kind, STATUS_QUEUED]
+        if doc_type:
+            query += " AND doc_type = ?"
+            params.append(doc_type)
+        with self._lock:
+            due = self._db().execute(query, params).fetchone()[0]
+        return None if due is None else max(0.0, due - time.time())
+
+    def run_due(self, kind: str, handler: Callable[[Dict], None], doc_type: Optional[str] = None,
+                max_wait: float = 60) -> int:
+        """
+        실행 시점이 된 작업을 모두 처리하고 처리 건수 반환
+
+        handler 가 정상 반환하면 완료, 예외를 던지면 실패(JobError.retry 에 따라 재시도/dead-letter) 처리.
+        max_wait 초 안에 재시도 시점이 오는 작업은 기다렸다가 이어서 처리
+        """
+        processed = 0
+        while True:
+            job = self.claim(kind, doc_type)
+            if job is None:
+                due_in = self.next_due_in(kind, doc_type)
+                if due_in is None or due_in > max_wait:
+                    return processed
+                time.sleep(due_in)
+                continue
+
+            processed += 1
+            try:
+                handler(job)
+            except JobError as e:
+                self.fail(job, str(e), retry=e.retry)
+            except Exception as e:
+                self.fail(job, f"{type(e).__name__}: {e}")
+            else:
+                self.complete(job)
+
+    def complete(self, job: Dict):
+        """작업 완료 - 큐에서 제거"""
+        with self._lock:
+            self._db().execute("DELETE FROM jobs WHERE id = ?", (job["id"],))
+        self._notify()
+
+    def fail(self, job: Dict, error: str, retry: bool = True):
+        """
+        작업 실패 처리
+
+        retry=True 이고 시도 횟수가 MAX_RETRIES 미만이면 지수 백오프 후 재시도, 아니면 dead-letter
+        """
+        now = time.time()
+        attempts = job["attempts"]
+        with self._lock:
+            if retry and attempts < self.max_retries:
+                delay = self.retry_delay * 2 ** (attempts - 1)
+                self._db().execute(
+                    "UPDATE jobs SET status = ?, next_run_at = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                    (STATUS_QUEUED, now + delay, error[:500], now, job["id"]))
+                logger.warning(f"[Queue] {job['kind']} {job['key']} failed (attempt {attempts}/{self.max_retries}), "
+                               f"retrying in {delay:.0f}s: {error[:100]}")
+            else:
+                self._db().execute(
+                    "UPDATE jobs SET status = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                    (STATUS_DEAD, error[:500], now, job["id"]))
+                logger.error(f"[Queue] {job['kind']} {job['key']} moved to dead-letter after {attempts} attempt(s): {error[:100]}")
+        self._notify()
+
+    def requeue(self, job_id: int) -> bool:
+        """dead-letter 작업을 즉시 재시도하도록 되돌림 (시도 횟수 초기화)"""
+        now = time.time()
+        with self._lock:
+            cursor = self._db().execute(
+                "UPDATE jobs SET status = ?, attempts = 0, next_run_at = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (STATUS_QUEUED, now, now, job_id, STATUS_DEAD))
+            changed = cursor.rowcount > 0
+        if changed:
+            self._notify()
+        return changed
+
+    def recover_interrupted(self) -> int:
+        """비정상 종료로 running 상태에 남은 작업을 대기 상태로 복구"""
+        with self._lock:
+            cursor = self._db().execute("UPDATE jobs SET status = ?, next_run_at = ? WHERE status = ?",
+                                        (STATUS_QUEUED, time.time(), STATUS_RUNNING))
+            recovered = cursor.rowcount
+        if recovered:
+            logger.info(f"[Queue] Recovered {recovered} interrupted job(s)")
+            self._notify()
+        return recovered
+
+    def dead_letters(self, limit: int = 50) -> List[Dict]:
+        """dead-letter 목록 (최근 실패 순)"""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT id, kind, doc_type, key, attempts, last_error, updated_at FROM jobs "
+                "WHERE status = ? ORDER BY updated_at DESC LIMIT ?", (STATUS_DEAD, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """상태별 작업 수 (queued/running/dead)"""
+        with self._lock:
+            rows = self._db().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {STATUS_QUEUED: 0, STATUS_RUNNING: 0, STATUS_DEAD: 0}
+        counts.update({status: count for status, count in rows})
+        return counts
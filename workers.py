@@ -0,0 +1,212 @@
+"""
+워커 프로세스 관리 (Worker Supervisor)
+======================================
+다운로더(Edge/Selenium), 파서(BeautifulSoup), 업로더(Playwright)를 별도 프로세스로 실행
+
+- 워커마다 작업/결과 multiprocessing.Queue 1쌍 (재시작 시 새로 생성 - 강제 종료로 큐가 손상되지 않도록)
+- 워커는 단일 스레드로 작업을 하나씩 처리, 호출자는 워커별 Lock 으로 직렬화
+- 상태 점검:
+  · 작업이 WORKER_TASK_TIMEOUT_SEC 를 넘기면 멈춘 것으로 보고 종료 후 재시작 (Playwright 멈춤 등)
+  · 작업 대기 중 프로세스가 죽으면 즉시 재시작
+  · 유휴 워커는 WORKER_HEALTH_INTERVAL_SEC 마다 ping 으로 응답 확인 (작업 중이면 건너뜀)
+- 작업 시간 제한은 워커를 잡은 뒤부터 계산, 앞 작업을 기다리는 시간은 WORKER_LOCK_TIMEOUT_SEC 로 따로 제한
+- 실패한 호출은 WorkerError 로 전달되어 작업 큐(work_queue)의 재시도 대상이 됨
+- 작업 중 워커에서 측정한 span 과 카운터 증가분은 결과와 함께 돌려받아 엔진의 로그/메트릭(/metrics)에 기록
+- 범위: 워커는 엔진이 한 스레드에서 순서대로 호출하는 단계 실행기 (단계 사이 큐로 파싱과 업로드를 겹쳐 실행하지는 않음),
+  다운로더 워커는 브라우저 메서드를 그대로 대신 호출하는 프록시 (RemoteBrowser)
+"""
+
+import os
+import time
+import queue
+import threading
+import multiprocessing
+from typing import Callable, Dict, Optional
+
+from config import config
+from logging_config import logger
+from instrumentation import add_span_listener, record_span
+from metrics import WORKER_RESTARTS, registry
+
+
+class WorkerError(Exception):
+    """워커 작업 실패 (예외, 시간 초과, 프로세스 종료)"""
+
+
+def worker_main(name: str, operations_factory: Callable[[], Dict[str, Callable]], tasks, results):
+    """워커 프로세스 진입점 - operations_factory() 가 만든 작업을 큐로 받아 실행"""
+    operations = operations_factory()
+    operations.setdefault("ping", lambda: os.getpid())
+    # Spans measured during a task go back with its result (the engine owns /metrics)
+    spans = []
+    add_span_listener(lambda span_name, duration, outcome, fields:
+                      spans.append((span_name, duration, outcome, dict(fields))))
+    logger.info(f"[Worker:{name}] Ready (PID {os.getpid()})")
+    while True:
+        method, args, kwargs = tasks.get()
+        if method is None:
+            return
+        spans.clear()
+        counters = registry.counter_values()
+        try:
+            reply = ("ok", operations[method](*args, **kwargs))
+        except Exception as e:
+            logger.error(f"[Worker:{name}] {method} failed: {e}")
+            reply = ("error", f"{type(e).__name__}: {e}")
+        deltas = {key: value - counters.get(key, 0) for key, value in registry.counter_values().items()
+                  if value != counters.get(key, 0)}
+        results.put(reply + ({"spans": list(spans), "counters": deltas},))
+
+
+class _Worker:
+    """One supervised worker process and its queues."""
+
+    def __init__(self, name: str, operations_factory: Callable, timeout: float, lock_timeout: float):
+        self.name = name
+        self.operations_factory = operations_factory
+        self.timeout = timeout
+        self.lock_timeout = lock_timeout
+        self.lock = threading.Lock()  # one outstanding call per worker
+        self.process = None
+        self.tasks = None
+        self.results = None
+        self.restarts = 0
+        self.busy_since = None
+        self.last_error = None
+
+    def start(self):
+        self.tasks = multiprocessing.Queue()
+        self.results = multiprocessing.Queue()
+        self.process = multiprocessing.Process(
+            target=worker_main, args=(self.name, self.operations_factory, self.tasks, self.results),
+            name=f"worker-{self.name}", daemon=True)
+        self.process.start()
+
+    def stop(self, timeout: float = 5.0):
+        if not self.process:
+            return
+        if self.process.is_alive():
+            try:
+                self.tasks.put((None, (), {}))
+            except Exception:
+                pass
+            self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+
+    def restart(self, reason: str):
+        logger.warning(f"[Supervisor] Restarting {self.name} worker (PID {self.process.pid if self.process else '-'}): {reason}")
+        self.last_error = reason
+        self.restarts += 1
+        WORKER_RESTARTS.inc(worker=self.name, reason=reason.split(":")[0])
+        if self.process and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(5)
+        self.start()
+
+    def call(self, method: str, args: tuple, kwargs: dict, timeout: Optional[float],
+             lock_timeout: Optional[float] = None):
+        wait = self.lock_timeout if lock_timeout is None else lock_timeout
+        if not self.lock.acquire(timeout=wait):
+            raise WorkerError(f"{self.name} worker still busy after waiting {wait:.0f}s for {method}")
+        try:
+            return self._call_locked(method, args, kwargs, timeout)
+        finally:
+            self.lock.release()
+
+    def _call_locked(self, method: str, args: tuple, kwargs: dict, timeout: Optional[float]):
+        # The caller holds self.lock; the deadline starts now, not while queued behind another task
+        deadline = time.monotonic() + (timeout or self.timeout)
+        if not self.process.is_alive():
+            self.restart(f"exited (code {self.process.exitcode})")
+        self.busy_since = time.time()
+        try:
+            self.tasks.put((method, args, kwargs))
+            while True:
+                try:
+                    status, result, telemetry = self.results.get(timeout=1)
+                    break
+                except queue.Empty:
+                    pass
+                if not self.process.is_alive():
+                    code = self.process.exitcode
+                    self.restart(f"crashed: exit code {code} during {method}")
+                    raise WorkerError(f"{self.name} worker crashed during {method} (exit code {code})")
+                if time.monotonic() > deadline:
+                    self.restart(f"timeout: {method} exceeded {timeout or self.timeout:.0f}s")
+                    raise WorkerError(f"{self.name} worker did not finish {method} in time")
+        finally:
+            self.busy_since = None
+
+        for span_name, duration, outcome, fields in telemetry["spans"]:
+            record_span(span_name, duration, outcome, dict(fields, worker=self.name))
+        registry.add_counter_values(telemetry["counters"])
+        if status == "error":
+            raise WorkerError(result)
+        return result
+
+    def status(self) -> dict:
+        busy_since = self.busy_since
+        return {
+            "pid": self.process.pid if self.process else None,
+            "alive": bool(self.process and self.process.is_alive()),
+            "busy_sec": round(time.time() - busy_since, 1) if busy_since else 0,
+            "restarts": self.restarts,
+            "last_error": self.last_error
+        }
+
+
+class Supervisor:
+    """Starts the worker processes, forwards calls to them and restarts them when unhealthy."""
+
+    def __init__(self, workers: Dict[str, Callable[[], Dict[str, Callable]]],
+                 task_timeout: float = None, health_interval: float = None, lock_timeout: float = None):
+        self.task_timeout = task_timeout or config.WORKER_TASK_TIMEOUT_SEC
+        self.health_interval = health_interval or config.WORKER_HEALTH_INTERVAL_SEC
+        self.lock_timeout = lock_timeout if lock_timeout is not None else config.WORKER_LOCK_TIMEOUT_SEC
+        self.workers = {name: _Worker(name, factory, self.task_timeout, self.lock_timeout)
+                        for name, factory in workers.items()}
+        self.running = False
+
+    def start(self):
+        for worker in self.workers.values():
+            worker.start()
+        self.running = True
+        threading.Thread(target=self._health_loop, name="supervisor", daemon=True).start()
+        logger.info(f"[Supervisor] Started workers: "
+                    f"{', '.join(f'{n} (PID {w.process.pid})' for n, w in self.workers.items())}")
+
+    def stop(self):
+        self.running = False
+        for worker in self.workers.values():
+            worker.stop()
+
+    def call(self, worker: str, method: str, *args, timeout: float = None, **kwargs):
+        """
+        워커에서 작업 실행 후 결과 반환 (워커별로 한 번에 하나씩)
+
+        Raises:
+            WorkerError: 작업 예외, 시간 초과(워커 재시작), 프로세스 종료(워커 재시작),
+                         앞 작업이 WORKER_LOCK_TIMEOUT_SEC 안에 끝나지 않음
+        """
+        return self.workers[worker].call(method, args, kwargs, timeout)
+
+    def _health_loop(self):
+        while self.running:
+            time.sleep(self.health_interval)
+            for worker in self.workers.values():
+                # 작업 중인 워커는 call() 이 시간 초과/종료를 직접 감시 - ping 은 잡은 Lock 안에서 바로 실행
+                if not worker.lock.acquire(blocking=False):
+                    continue
+                try:
+                    if not worker.process.is_alive():
+                        worker.restart(f"exited (code {worker.process.exitcode})")
+                    worker._call_locked("ping", (), {}, timeout=30)
+                except WorkerError as e:
+                    logger.warning(f"[Supervisor] {worker.name} worker failed health check: {e}")
+                finally:
+                    worker.lock.release()
+
+    def status(self) -> Dict[str, dict]:
+        return {name: worker.status() for name, worker in self.workers.items()}